@@ -281,11 +281,11 @@ def _run_adb_text(cmd: list[str], timeout: float) -> str:
     try:
         result = run_cmd_silently_sync(cmd, timeout=timeout)
     except Exception as exc:
-        logger.debug("Failed to run display command %s: %s", cmd, exc)
+        logger.debug("Failed to run display command {}: {}", cmd, exc)
         return ""
 
     if result.returncode != 0:
-        logger.debug("Display command failed %s: %s", cmd, result.stderr)
+        logger.debug("Display command failed {}: {}", cmd, result.stderr)
         return ""
 
     return result.stdout or ""
@@ -295,11 +295,11 @@ async def _run_adb_text_async(cmd: list[str], timeout: float) -> str:
     try:
         result = await run_cmd_silently(cmd, timeout=timeout)
     except Exception as exc:
-        logger.debug("Failed to run async display command %s: %s", cmd, exc)
+        logger.debug("Failed to run async display command {}: {}", cmd, exc)
         return ""
 
     if result.returncode != 0:
-        logger.debug("Async display command failed %s: %s", cmd, result.stderr)
+        logger.debug("Async display command failed {}: {}", cmd, result.stderr)
         return ""
 
     return result.stdout or ""
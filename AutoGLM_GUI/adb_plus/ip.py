@@ -110,19 +110,19 @@ async def get_wifi_ip_async(
                 try:
                     iface = parts[parts.index("dev") + 1]
                 except (IndexError, ValueError) as exc:
-                    logger.debug("Failed to extract async route iface: %s", exc)
+                    logger.debug("Failed to extract async route iface: {}", exc)
             if "src" in parts:
                 try:
                     ip = parts[parts.index("src") + 1]
                 except (IndexError, ValueError) as exc:
-                    logger.debug("Failed to extract async route ip: %s", exc)
+                    logger.debug("Failed to extract async route ip: {}", exc)
             if not ip or ip == "0.0.0.0":
                 continue
             if iface and (iface.startswith("ccmni") or iface.startswith("rmnet")):
                 continue
             return ip
     except Exception as exc:
-        logger.debug("Failed to get async IP from route: %s", exc)
+        logger.debug("Failed to get async IP from route: {}", exc)
 
     try:
         addr_result = await run_cmd_silently(
@@ -133,5 +133,5 @@ async def get_wifi_ip_async(
         )
         return _extract_ip((addr_result.stdout or "") + (addr_result.stderr or ""))
     except Exception as exc:
-        logger.debug("Failed to get async IP from wlan0: %s", exc)
+        logger.debug("Failed to get async IP from wlan0: {}", exc)
         return None
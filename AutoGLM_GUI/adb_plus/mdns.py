@@ -189,6 +189,6 @@ def discover_mdns_devices(adb_path: str = "adb") -> list[MdnsDevice]:
         return devices
 
     except Exception as exc:
-        logger.debug("Failed to discover mDNS devices: %s", exc)
+        logger.debug("Failed to discover mDNS devices: {}", exc)
         # Return empty list on any error (timeout, command not found, etc.)
         return []
@@ -8,6 +8,8 @@ Features:
 
 import asyncio
 import base64
+import functools
+import struct
 import subprocess
 from dataclasses import dataclass
 from io import BytesIO
@@ -27,9 +29,10 @@ from AutoGLM_GUI.trace import TraceSpan, trace_span
 
 
 PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_IHDR_SIZE = struct.Struct(">II")
 
 
-@dataclass
+@dataclass(slots=True)
 class Screenshot:
     """Represents a captured screenshot."""
 
@@ -165,7 +168,7 @@ def _try_capture(
     except DeviceNotAvailableError:
         raise  # Re-raise to caller
     except Exception as exc:
-        logger.debug("Screenshot capture failed for %s: %s", device_id, exc)
+        logger.debug("Screenshot capture failed for {}: {}", device_id, exc)
         return None
 
 
@@ -301,7 +304,7 @@ async def _try_capture_async(
     except DeviceNotAvailableError:
         raise
     except Exception as exc:
-        logger.debug("Async screenshot capture failed for %s: %s", device_id, exc)
+        logger.debug("Async screenshot capture failed for {}: {}", device_id, exc)
         return None
 
 
@@ -313,35 +316,35 @@ def _is_valid_png(data: bytes) -> bool:
     )
 
 
+def _png_size(data: bytes) -> tuple[int, int] | None:
+    """Read width/height from the PNG IHDR chunk without decoding the image."""
+    ihdr = data[len(PNG_SIGNATURE) : len(PNG_SIGNATURE) + 16]
+    if len(ihdr) < 16 or ihdr[4:8] != b"IHDR":
+        return None
+    width, height = _IHDR_SIZE.unpack_from(ihdr, 8)
+    return width, height
+
+
 def _decode_screenshot(data: bytes | None, device_id: str | None) -> Screenshot | None:
     if not data or not _is_valid_png(data):
         return None
 
-    try:
-        img = Image.open(BytesIO(data))
-        width, height = img.size
-        base64_data = base64.b64encode(data).decode("utf-8")
-        return Screenshot(base64_data=base64_data, width=width, height=height)
-    except Exception as exc:
-        logger.debug("Failed to decode screenshot PNG for %s: %s", device_id, exc)
+    size = _png_size(data)
+    if size is None:
+        logger.debug("Failed to decode screenshot PNG for {}: missing IHDR", device_id)
         return None
 
+    width, height = size
+    base64_data = base64.b64encode(data).decode("ascii")
+    return Screenshot(base64_data=base64_data, width=width, height=height)
+
 
 async def _decode_screenshot_async(
     data: bytes | None,
     device_id: str | None,
 ) -> Screenshot | None:
-    if not data or not _is_valid_png(data):
-        return None
-
-    try:
-        image = await asyncio.to_thread(Image.open, BytesIO(data))
-        width, height = image.size
-        base64_data = base64.b64encode(data).decode("utf-8")
-        return Screenshot(base64_data=base64_data, width=width, height=height)
-    except Exception as exc:
-        logger.debug("Failed to decode async screenshot PNG for %s: %s", device_id, exc)
-        return None
+    # 只读取 PNG 头部，无需 PIL 解码，也就不必切换到线程池
+    return _decode_screenshot(data, device_id)
 
 
 def _set_display_trace_attrs(
@@ -369,13 +372,21 @@ def _set_display_trace_attrs(
     )
 
 
-def _fallback_screenshot() -> Screenshot:
-    """Return a black fallback image."""
-    width, height = 1080, 2400
+@functools.cache
+def _black_png_base64(width: int, height: int) -> str:
+    """Encode a black PNG once; the fallback is returned on every failed capture."""
     img = Image.new("RGB", (width, height), color="black")
     buffered = BytesIO()
     img.save(buffered, format="PNG")
-    base64_data = base64.b64encode(buffered.getvalue()).decode("utf-8")
+    return base64.b64encode(buffered.getvalue()).decode("utf-8")
+
+
+def _fallback_screenshot() -> Screenshot:
+    """Return a black fallback image."""
+    width, height = 1080, 2400
     return Screenshot(
-        base64_data=base64_data, width=width, height=height, is_sensitive=False
+        base64_data=_black_png_base64(width, height),
+        width=width,
+        height=height,
+        is_sensitive=False,
     )
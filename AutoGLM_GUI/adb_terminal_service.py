@@ -200,7 +200,7 @@ class TerminalSession:
         except Exception as exc:
             self.status = "error"
             self.exit_code = -1
-            logger.exception("Failed to start terminal session %s", self.session_id)
+            logger.exception("Failed to start terminal session {}", self.session_id)
             await self._publish({"type": "error", "message": str(exc)})
             await self._publish({"type": "status", "status": self.status})
             raise
@@ -528,7 +528,7 @@ class TerminalSessionManager:
             raise
 
         logger.info(
-            "Created terminal session %s with cwd=%s command=%s",
+            "Created terminal session {} with cwd={} command={}",
             session.session_id,
             session.cwd,
             session.command,
@@ -544,7 +544,7 @@ class TerminalSessionManager:
             return False
 
         await session.close()
-        logger.info("Closed terminal session %s", session_id)
+        logger.info("Closed terminal session {}", session_id)
         return True
 
     def get_session(self, session_id: str) -> TerminalSession | None:
@@ -1,5 +1,6 @@
 """Base classes for async agents."""
 
-from .async_agent_base import AsyncAgentBase
+from .async_agent_base import AsyncAgentBase, iter_cooperatively
+from .cached_parser import CachedActionParser
 
-__all__ = ["AsyncAgentBase"]
+__all__ = ["AsyncAgentBase", "CachedActionParser", "iter_cooperatively"]
@@ -7,22 +7,31 @@
 """
 
 import asyncio
-import copy
-import json
+import contextlib
 import time
 from abc import ABC, abstractmethod
 from collections.abc import AsyncGenerator
-from typing import Any
-from collections.abc import AsyncIterator, Callable
+from typing import Any, TypeVar
+from collections.abc import AsyncIterable, AsyncIterator, Callable
 
 from openai import AsyncOpenAI
 
 from AutoGLM_GUI.actions import AsyncActionHandler
+from AutoGLM_GUI import json_utils
 from AutoGLM_GUI.config import AgentConfig, ModelConfig
-from AutoGLM_GUI.device_protocol import AsyncDeviceProtocol, DeviceProtocol
+from AutoGLM_GUI.device_protocol import (
+    AsyncDeviceProtocol,
+    DeviceProtocol,
+    Screenshot,
+)
 from AutoGLM_GUI.devices.async_adapter import AsyncDeviceAdapter
+from AutoGLM_GUI.i18n import get_messages
 from AutoGLM_GUI.logger import logger
 from AutoGLM_GUI.model import MessageBuilder
+from AutoGLM_GUI.model.client_pool import (
+    create_async_openai,
+    get_shared_async_openai,
+)
 from AutoGLM_GUI.trace import summarize_text, trace_span
 
 
@@ -30,6 +39,25 @@ WATCHDOG_MAX_RUNTIME_SECONDS = 60 * 60
 WATCHDOG_REPEATED_ACTION_LIMIT = 12
 WATCHDOG_NO_PROGRESS_LIMIT = 20
 
+# Chunks of an already-buffered response are read without suspending, so a
+# burst would otherwise run the whole parse loop without letting other
+# coroutines (other devices, websocket pushes) run.
+STREAM_YIELD_EVERY = 32
+
+T = TypeVar("T")
+
+
+async def iter_cooperatively(
+    chunks: AsyncIterable[T], every: int = STREAM_YIELD_EVERY
+) -> AsyncIterator[T]:
+    """Iterate ``chunks``, handing control back to the event loop periodically."""
+    count = 0
+    async for chunk in chunks:
+        yield chunk
+        count += 1
+        if count % every == 0:
+            await asyncio.sleep(0)
+
 
 class AsyncAgentBase(ABC):
     """异步 Agent 基类。
@@ -52,11 +80,8 @@ class AsyncAgentBase(ABC):
         self.model_config = model_config
         self.agent_config = agent_config
 
-        self.openai_client = AsyncOpenAI(
-            base_url=model_config.base_url,
-            api_key=model_config.api_key,
-            timeout=120,
-        )
+        # Resolved lazily from the shared per-loop pool; see openai_client.
+        self._openai_client: AsyncOpenAI | None = None
 
         self.device = AsyncDeviceAdapter(device)
         self.action_handler = AsyncActionHandler(
@@ -66,6 +91,12 @@ class AsyncAgentBase(ABC):
         )
 
         self._cancel_event = asyncio.Event()
+        # Task suspended on a model stream read; see _interruptible_stream().
+        self._llm_task: asyncio.Task[Any] | None = None
+        self._llm_read_interrupted = False
+        # Whether stream consumers want thinking chunks as they arrive; run()
+        # only needs the final result, so agents may split thinking once instead.
+        self._live_thinking = True
 
         # System prompt: 优先用配置的，否则用子类默认的
         system_prompt = self.agent_config.system_prompt
@@ -75,12 +106,17 @@ class AsyncAgentBase(ABC):
         self._initial_system_message = MessageBuilder.create_system_message(
             system_prompt
         )
+        # 日志文案按语言解析一次；lang 在 agent 生命周期内不变
+        self._msgs = get_messages(self.agent_config.lang)
 
         # State
         self._context: list[dict[str, Any]] = [self._initial_system_message]
         self._user_image_attachments: list[dict[str, str]] = []
         self._step_count = 0
         self._is_running = False
+        self._prefetched_device_state: asyncio.Task[tuple[Screenshot, str]] | None = (
+            None
+        )
 
     # ==================== 子类必须实现 ====================
 
@@ -100,6 +136,18 @@ class AsyncAgentBase(ABC):
         """构建首条用户消息并添加到 self._context。"""
         ...
 
+    async def _prepare_initial_context_async(
+        self,
+        task: str,
+        screenshot_base64: str,
+        current_app: str,
+        reference_images: list[dict[str, str]] | None = None,
+    ) -> None:
+        """stream() 使用的入口；子类可覆盖以将阻塞的图像处理移出事件循环。"""
+        self._prepare_initial_context(
+            task, screenshot_base64, current_app, reference_images
+        )
+
     @abstractmethod
     async def _execute_step(self) -> AsyncGenerator[dict[str, Any], None]:
         """执行单步：获取截图 → 调用 LLM → 执行动作。
@@ -128,7 +176,7 @@ class AsyncAgentBase(ABC):
             self._step_count = 0
         else:
             logger.info(
-                "Continuing agent stream from step %d with user input: %s",
+                "Continuing agent stream from step {} with user input: {}",
                 self._step_count,
                 summarize_text(continue_with) or "",
             )
@@ -157,8 +205,10 @@ class AsyncAgentBase(ABC):
                                 "device_id": self.device.device_id,
                             },
                         ):
-                            screenshot = await self.device.get_screenshot()
-                            current_app = await self.device.get_current_app()
+                            screenshot, current_app = await asyncio.gather(
+                                self.device.get_screenshot(),
+                                self.device.get_current_app(),
+                            )
                     except Exception as e:
                         logger.error(f"Failed to get device info: {e}")
                         stream_span.set_attributes(
@@ -182,7 +232,7 @@ class AsyncAgentBase(ABC):
                         "agent.prepare_initial_context",
                         attrs={"agent_type": self.__class__.__name__},
                     ):
-                        self._prepare_initial_context(
+                        await self._prepare_initial_context_async(
                             task,
                             screenshot.base64_data,
                             current_app,
@@ -210,134 +260,139 @@ class AsyncAgentBase(ABC):
                             "device_id": self.device.device_id,
                         },
                     ) as step_span:
-                        async for event in self._execute_step():
-                            if event["type"] == "step":
-                                step_span.set_attributes(
-                                    {
-                                        "success": event["data"].get("success"),
-                                        "finished": event["data"].get("finished"),
-                                        "action_name": (
-                                            event["data"].get("action") or {}
-                                        ).get("action"),
-                                    }
-                                )
-                            if event["type"] == "step":
-                                action_signature = json.dumps(
-                                    event["data"].get("action"),
-                                    ensure_ascii=False,
-                                    sort_keys=True,
-                                )
-                                if action_signature and action_signature != "null":
-                                    if action_signature == last_action_signature:
-                                        repeated_action_count += 1
+                        async with contextlib.aclosing(
+                            self._execute_step()
+                        ) as step_events:
+                            async for event in step_events:
+                                if event["type"] == "step":
+                                    step_span.set_attributes(
+                                        {
+                                            "success": event["data"].get("success"),
+                                            "finished": event["data"].get("finished"),
+                                            "action_name": (
+                                                event["data"].get("action") or {}
+                                            ).get("action"),
+                                        }
+                                    )
+                                if event["type"] == "step":
+                                    action_signature = json_utils.dumps(
+                                        event["data"].get("action"),
+                                        sort_keys=True,
+                                    )
+                                    if action_signature and action_signature != "null":
+                                        if action_signature == last_action_signature:
+                                            repeated_action_count += 1
+                                        else:
+                                            last_action_signature = action_signature
+                                            repeated_action_count = 1
+                                        no_progress_count = 0
                                     else:
-                                        last_action_signature = action_signature
-                                        repeated_action_count = 1
-                                    no_progress_count = 0
-                                else:
-                                    no_progress_count += 1
-
-                            yield event
+                                        no_progress_count += 1
+
+                                yield event
+
+                                if event["type"] == "step":
+                                    step_data = event["data"]
+                                    action = step_data.get("action") or {}
+                                    if (
+                                        step_data.get("waiting_for_input")
+                                        or action.get("action") in INTERACTION_ACTIONS
+                                    ):
+                                        yield {
+                                            "type": "takeover",
+                                            "data": {
+                                                "message": step_data.get("message", ""),
+                                                "steps": self._step_count,
+                                                "success": True,
+                                                "stop_reason": "takeover",
+                                            },
+                                        }
+                                        return
+
+                                if event["type"] == "step" and event["data"].get(
+                                    "finished"
+                                ):
+                                    success = event["data"].get("success", True)
+                                    stream_span.set_attributes(
+                                        {
+                                            "success": success,
+                                            "steps": self._step_count,
+                                        }
+                                    )
+                                    yield {
+                                        "type": "done",
+                                        "data": {
+                                            "message": event["data"].get(
+                                                "message", "Task completed"
+                                            ),
+                                            "steps": self._step_count,
+                                            "success": success,
+                                        },
+                                    }
+                                    return
 
-                            if event["type"] == "step":
-                                step_data = event["data"]
-                                action = step_data.get("action") or {}
                                 if (
-                                    step_data.get("waiting_for_input")
-                                    or action.get("action") in INTERACTION_ACTIONS
+                                    repeated_action_count
+                                    >= WATCHDOG_REPEATED_ACTION_LIMIT
                                 ):
+                                    stream_span.set_attributes(
+                                        {
+                                            "success": False,
+                                            "steps": self._step_count,
+                                            "error_kind": "watchdog_repeated_actions",
+                                        }
+                                    )
                                     yield {
-                                        "type": "takeover",
+                                        "type": "done",
                                         "data": {
-                                            "message": step_data.get("message", ""),
+                                            "message": "Watchdog stopped task after repeated actions",
                                             "steps": self._step_count,
-                                            "success": True,
-                                            "stop_reason": "takeover",
+                                            "success": False,
+                                            "stop_reason": "watchdog_repeated_actions",
                                         },
                                     }
                                     return
 
-                            if event["type"] == "step" and event["data"].get(
-                                "finished"
-                            ):
-                                success = event["data"].get("success", True)
-                                stream_span.set_attributes(
-                                    {
-                                        "success": success,
-                                        "steps": self._step_count,
-                                    }
-                                )
-                                yield {
-                                    "type": "done",
-                                    "data": {
-                                        "message": event["data"].get(
-                                            "message", "Task completed"
-                                        ),
-                                        "steps": self._step_count,
-                                        "success": success,
-                                    },
-                                }
-                                return
-
-                            if repeated_action_count >= WATCHDOG_REPEATED_ACTION_LIMIT:
-                                stream_span.set_attributes(
-                                    {
-                                        "success": False,
-                                        "steps": self._step_count,
-                                        "error_kind": "watchdog_repeated_actions",
-                                    }
-                                )
-                                yield {
-                                    "type": "done",
-                                    "data": {
-                                        "message": "Watchdog stopped task after repeated actions",
-                                        "steps": self._step_count,
-                                        "success": False,
-                                        "stop_reason": "watchdog_repeated_actions",
-                                    },
-                                }
-                                return
-
-                            if no_progress_count >= WATCHDOG_NO_PROGRESS_LIMIT:
-                                stream_span.set_attributes(
-                                    {
-                                        "success": False,
-                                        "steps": self._step_count,
-                                        "error_kind": "watchdog_no_progress",
+                                if no_progress_count >= WATCHDOG_NO_PROGRESS_LIMIT:
+                                    stream_span.set_attributes(
+                                        {
+                                            "success": False,
+                                            "steps": self._step_count,
+                                            "error_kind": "watchdog_no_progress",
+                                        }
+                                    )
+                                    yield {
+                                        "type": "done",
+                                        "data": {
+                                            "message": "Watchdog stopped task because no progress was detected",
+                                            "steps": self._step_count,
+                                            "success": False,
+                                            "stop_reason": "watchdog_no_progress",
+                                        },
                                     }
-                                )
-                                yield {
-                                    "type": "done",
-                                    "data": {
-                                        "message": "Watchdog stopped task because no progress was detected",
-                                        "steps": self._step_count,
-                                        "success": False,
-                                        "stop_reason": "watchdog_no_progress",
-                                    },
-                                }
-                                return
-
-                            if (
-                                time.monotonic() - started_at
-                                >= WATCHDOG_MAX_RUNTIME_SECONDS
-                            ):
-                                stream_span.set_attributes(
-                                    {
-                                        "success": False,
-                                        "steps": self._step_count,
-                                        "error_kind": "watchdog_timeout",
+                                    return
+
+                                if (
+                                    time.monotonic() - started_at
+                                    >= WATCHDOG_MAX_RUNTIME_SECONDS
+                                ):
+                                    stream_span.set_attributes(
+                                        {
+                                            "success": False,
+                                            "steps": self._step_count,
+                                            "error_kind": "watchdog_timeout",
+                                        }
+                                    )
+                                    yield {
+                                        "type": "done",
+                                        "data": {
+                                            "message": "Watchdog stopped task after maximum runtime was reached",
+                                            "steps": self._step_count,
+                                            "success": False,
+                                            "stop_reason": "watchdog_timeout",
+                                        },
                                     }
-                                )
-                                yield {
-                                    "type": "done",
-                                    "data": {
-                                        "message": "Watchdog stopped task after maximum runtime was reached",
-                                        "steps": self._step_count,
-                                        "success": False,
-                                        "stop_reason": "watchdog_timeout",
-                                    },
-                                }
-                                return
+                                    return
 
                 stream_span.set_attributes(
                     {
@@ -374,9 +429,129 @@ class AsyncAgentBase(ABC):
                 raise
 
             finally:
+                prefetch = self._prefetched_device_state
+                self._discard_prefetched_device_state()
+                if prefetch is not None and not prefetch.done():
+                    # Let the cancellation land so no capture outlives the task.
+                    await asyncio.wait([prefetch])
                 self._user_image_attachments = []
                 self._is_running = False
 
+    async def _capture_device_state(
+        self, *, step: int | None = None, purpose: str | None = None
+    ) -> tuple[Screenshot, str]:
+        """Fetch the screenshot and the foreground app concurrently.
+
+        Both are independent device round-trips, so the step only waits for
+        the slower of the two.
+        """
+        attrs: dict[str, Any] = {
+            "step": self._step_count if step is None else step,
+            "agent_type": self.__class__.__name__,
+        }
+        if purpose is not None:
+            attrs["purpose"] = purpose
+
+        async def capture_screenshot() -> Screenshot:
+            with trace_span("step.capture_screenshot", attrs=attrs):
+                return await self.device.get_screenshot()
+
+        async def get_current_app() -> str:
+            with trace_span("step.get_current_app", attrs=attrs):
+                return await self.device.get_current_app()
+
+        return await asyncio.gather(capture_screenshot(), get_current_app())
+
+    def _prefetch_device_state(self) -> None:
+        """Start capturing the next step's device state in the background.
+
+        Called once an action has been executed, so the capture overlaps with
+        the step bookkeeping and the consumer handling the yielded event.
+        """
+        self._discard_prefetched_device_state()
+        self._prefetched_device_state = asyncio.create_task(
+            self._capture_device_state(step=self._step_count + 1, purpose="prefetch")
+        )
+
+    async def _next_device_state(self) -> tuple[Screenshot, str]:
+        """Return the prefetched device state, or capture it now."""
+        task = self._prefetched_device_state
+        if (
+            task is not None
+            and not task.cancelled()
+            and task.get_loop() is asyncio.get_running_loop()
+        ):
+            self._prefetched_device_state = None
+            return await task
+        # Cancelled, or left behind by a loop that has since finished.
+        self._discard_prefetched_device_state()
+        return await self._capture_device_state()
+
+    def _discard_prefetched_device_state(self) -> None:
+        """Drop a pending prefetch, e.g. when the task ends or is cancelled."""
+        task = self._prefetched_device_state
+        self._prefetched_device_state = None
+        if task is None:
+            return
+        if task.done():
+            if not task.cancelled():
+                task.exception()  # mark as retrieved
+            return
+        loop = task.get_loop()
+        if not loop.is_closed():
+            # reset() may be called from another thread.
+            loop.call_soon_threadsafe(task.cancel)
+
+    def _history_window(self) -> list[dict[str, Any]]:
+        """Project the context sent to the model, bounded by ``max_history``.
+
+        The system prompt and the task turn are always kept; of the remaining
+        messages only the last ``max_history`` are sent, starting at a user
+        turn so the model never sees an orphaned assistant reply.
+        """
+        max_history = self.agent_config.max_history
+        context = self._context
+        if max_history is None or len(context) <= max_history + 2:
+            return context
+        start = len(context) - max_history
+        while start < len(context) - 1 and context[start].get("role") != "user":
+            start += 1
+        return [*context[:2], *context[start:]]
+
+    async def _interruptible_stream(self, chunks: AsyncIterable[T]) -> AsyncIterator[T]:
+        """Iterate a model stream so that cancel() can abort a pending read.
+
+        Rather than polling the cancel event on every streamed chunk, cancel()
+        cancels the reading task, but only while it is suspended on the stream
+        itself. Whoever consumes the agent's events is never cancelled while
+        it is busy with its own awaits between chunks.
+        """
+        task = asyncio.current_task()
+        iterator = aiter(chunks)
+        while True:
+            if self._cancel_event.is_set():
+                raise asyncio.CancelledError()
+            self._llm_task = task
+            try:
+                chunk = await anext(iterator)
+            except StopAsyncIteration:
+                return
+            finally:
+                self._llm_task = None
+                if self._llm_read_interrupted and task is not None:
+                    # The interrupt was ours; don't leave the task marked as
+                    # being cancelled once the CancelledError is handled.
+                    self._llm_read_interrupted = False
+                    task.uncancel()
+            yield chunk
+
+    def _interrupt_llm_call(self, task: asyncio.Task[Any]) -> None:
+        # Runs on the task's loop, so the task is suspended right now; it is
+        # only cancelled if that suspension is the stream read.
+        if self._llm_task is task:
+            self._llm_read_interrupted = True
+            task.cancel()
+
     def set_user_image_attachments(self, attachments: list[dict[str, str]]) -> None:
         """Set user-supplied reference images for the next streamed task."""
         self._user_image_attachments = attachments.copy()
@@ -385,24 +560,57 @@ class AsyncAgentBase(ABC):
         """取消当前执行。"""
         self._cancel_event.set()
         self._is_running = False
+        self._discard_prefetched_device_state()
+        task = self._llm_task
+        if task is not None and not task.done():
+            loop = task.get_loop()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._interrupt_llm_call, task)
         logger.info(f"{self.__class__.__name__} cancelled by user")
 
     def reset(self) -> None:
         """重置状态。"""
-        self._context = [copy.deepcopy(self._initial_system_message)]
+        # The system message has string content, which in-place image stripping
+        # never touches, so it can be shared instead of deep-copied.
+        self._context = [self._initial_system_message]
         self._user_image_attachments = []
         self._step_count = 0
         self._is_running = False
         self._cancel_event.clear()
+        self._discard_prefetched_device_state()
 
     async def run(self, task: str) -> str:
         """运行完整任务（兼容接口）。"""
         final_message = ""
-        async for event in self.stream(task):
-            if event["type"] == "done":
-                final_message = event["data"].get("message", "")
+        self._live_thinking = False
+        try:
+            async for event in self.stream(task):
+                if event["type"] == "done":
+                    final_message = event["data"].get("message", "")
+        finally:
+            self._live_thinking = True
         return final_message
 
+    @property
+    def openai_client(self) -> AsyncOpenAI:
+        """OpenAI client shared with other agents on the same endpoint."""
+        if self._openai_client is not None:
+            return self._openai_client
+        try:
+            return get_shared_async_openai(
+                self.model_config.base_url, self.model_config.api_key
+            )
+        except RuntimeError:
+            # No running loop: fall back to a client owned by this agent.
+            self._openai_client = create_async_openai(
+                self.model_config.base_url, self.model_config.api_key
+            )
+            return self._openai_client
+
+    @openai_client.setter
+    def openai_client(self, client: AsyncOpenAI) -> None:
+        self._openai_client = client
+
     @property
     def step_count(self) -> int:
         return self._step_count
@@ -0,0 +1,27 @@
+"""Memoized action parsing shared by the text-protocol agents (GLM, Qwen)."""
+
+import copy
+import functools
+from collections.abc import Callable
+from typing import Any
+
+
+class CachedActionParser:
+    """Memoize a pure ``parse(action_text) -> dict`` function.
+
+    Repeated actions (consecutive waits or back presses) skip re-parsing.
+    Every call returns a deep copy, so callers may mutate nested values such
+    as coordinate lists without touching the cached entry. Inputs that raise
+    are not cached.
+    """
+
+    def __init__(
+        self, parse: Callable[[str], dict[str, Any]], maxsize: int = 128
+    ) -> None:
+        self._parse = functools.lru_cache(maxsize=maxsize)(parse)
+
+    def __call__(self, action_str: str) -> dict[str, Any]:
+        return copy.deepcopy(self._parse(action_str))
+
+    def cache_info(self) -> functools._CacheInfo:
+        return self._parse.cache_info()
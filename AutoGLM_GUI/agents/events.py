@@ -1,5 +1,5 @@
 from enum import StrEnum
-from typing import Any, TypedDict
+from typing import Any, NotRequired, TypedDict
 
 
 class AgentEventType(StrEnum):
@@ -17,3 +17,42 @@ class AgentEvent(TypedDict):
 
     type: str  # 使用字符串以兼容现有 SSE 类型
     data: dict[str, Any]
+
+
+class StepEventData(TypedDict):
+    """step 事件数据（各 Agent 共用的固定结构）."""
+
+    step: int
+    thinking: str
+    action: dict[str, Any] | None
+    success: bool
+    finished: bool
+    message: str | None
+    screenshot: str | None
+    error_details: NotRequired[dict[str, Any]]
+
+
+def step_event(
+    step: int,
+    *,
+    thinking: str = "",
+    action: dict[str, Any] | None = None,
+    success: bool,
+    finished: bool,
+    message: str | None,
+    screenshot: str | None = None,
+    error_details: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """构造 step 事件，数据字典一次性按固定键顺序创建."""
+    data: StepEventData = {
+        "step": step,
+        "thinking": thinking,
+        "action": action,
+        "success": success,
+        "finished": finished,
+        "message": message,
+        "screenshot": screenshot,
+    }
+    if error_details is not None:
+        data["error_details"] = error_details
+    return {"type": AgentEventType.STEP.value, "data": data}
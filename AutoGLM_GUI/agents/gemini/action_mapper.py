@@ -1,5 +1,6 @@
 """Tool-call to action mapping for Gemini Agent."""
 
+from collections.abc import Callable
 from typing import Any
 
 
@@ -59,58 +60,56 @@ def tool_call_to_action(tool_name: str, arguments: dict[str, Any]) -> dict[str,
         raise InvalidToolCallError(tool_name, arguments, str(e)) from e
 
 
-def _build_action(tool_name: str, args: dict[str, Any]) -> dict[str, Any]:
-    """Build action dict with validated arguments."""
-    if tool_name == "tap":
-        return {
-            "_metadata": "do",
-            "action": "Tap",
-            "element": [_require_int(args, "x"), _require_int(args, "y")],
-        }
-
-    if tool_name == "double_tap":
-        return {
-            "_metadata": "do",
-            "action": "Double Tap",
-            "element": [_require_int(args, "x"), _require_int(args, "y")],
-        }
-
-    if tool_name == "long_press":
-        return {
-            "_metadata": "do",
-            "action": "Long Press",
-            "element": [_require_int(args, "x"), _require_int(args, "y")],
-        }
+def _point(args: dict[str, Any], x_key: str, y_key: str) -> list[int]:
+    return [_require_int(args, x_key), _require_int(args, y_key)]
+
+
+# Built once at import: tool name -> builder of the ActionHandler action dict.
+_ACTION_BUILDERS: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+    "tap": lambda args: {
+        "_metadata": "do",
+        "action": "Tap",
+        "element": _point(args, "x", "y"),
+    },
+    "double_tap": lambda args: {
+        "_metadata": "do",
+        "action": "Double Tap",
+        "element": _point(args, "x", "y"),
+    },
+    "long_press": lambda args: {
+        "_metadata": "do",
+        "action": "Long Press",
+        "element": _point(args, "x", "y"),
+    },
+    "swipe": lambda args: {
+        "_metadata": "do",
+        "action": "Swipe",
+        "start": _point(args, "start_x", "start_y"),
+        "end": _point(args, "end_x", "end_y"),
+    },
+    "type_text": lambda args: {
+        "_metadata": "do",
+        "action": "Type",
+        "text": _require_str(args, "text"),
+    },
+    "launch_app": lambda args: {
+        "_metadata": "do",
+        "action": "Launch",
+        "app": _require_str(args, "app_name"),
+    },
+    "back": lambda args: {"_metadata": "do", "action": "Back"},
+    "home": lambda args: {"_metadata": "do", "action": "Home"},
+    "wait": lambda args: {
+        "_metadata": "do",
+        "action": "Wait",
+        "duration": args.get("duration", "1 seconds"),
+    },
+}
 
-    if tool_name == "swipe":
-        return {
-            "_metadata": "do",
-            "action": "Swipe",
-            "start": [_require_int(args, "start_x"), _require_int(args, "start_y")],
-            "end": [_require_int(args, "end_x"), _require_int(args, "end_y")],
-        }
 
-    if tool_name == "type_text":
-        return {"_metadata": "do", "action": "Type", "text": _require_str(args, "text")}
-
-    if tool_name == "launch_app":
-        return {
-            "_metadata": "do",
-            "action": "Launch",
-            "app": _require_str(args, "app_name"),
-        }
-
-    if tool_name == "back":
-        return {"_metadata": "do", "action": "Back"}
-
-    if tool_name == "home":
-        return {"_metadata": "do", "action": "Home"}
-
-    if tool_name == "wait":
-        return {
-            "_metadata": "do",
-            "action": "Wait",
-            "duration": args.get("duration", "1 seconds"),
-        }
-
-    raise InvalidToolCallError(tool_name, args, f"Unknown tool: {tool_name}")
+def _build_action(tool_name: str, args: dict[str, Any]) -> dict[str, Any]:
+    """Build action dict with validated arguments."""
+    builder = _ACTION_BUILDERS.get(tool_name)
+    if builder is None:
+        raise InvalidToolCallError(tool_name, args, f"Unknown tool: {tool_name}")
+    return builder(args)
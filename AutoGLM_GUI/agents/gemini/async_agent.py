@@ -5,13 +5,16 @@
 """
 
 import asyncio
-import json
-import traceback
+import contextlib
 from collections.abc import AsyncGenerator
 from typing import Any
 
+from openai import BadRequestError
+
+from AutoGLM_GUI import json_utils
 from AutoGLM_GUI.actions import ActionResult
-from AutoGLM_GUI.agents.base import AsyncAgentBase
+from AutoGLM_GUI.agents.base import AsyncAgentBase, iter_cooperatively
+from AutoGLM_GUI.agents.events import step_event
 from AutoGLM_GUI.logger import logger
 from AutoGLM_GUI.model import MessageBuilder
 from AutoGLM_GUI.model.error_details import (
@@ -22,8 +25,35 @@ from AutoGLM_GUI.model.error_details import (
 from AutoGLM_GUI.trace import summarize_text, trace_span
 
 from .action_mapper import InvalidToolCallError, tool_call_to_action
+from .image_compression import compress_screenshot
 from .prompts import get_system_prompt
-from .tools import DEVICE_TOOLS
+from .response_cache import ResponseCache
+from .tools import DEVICE_TOOLS, DEVICE_TOOLS_JSON
+
+# (thinking, reasoning_content, tool_name, tool_args)
+ToolCallResult = tuple[str, str | None, str, dict[str, Any]]
+
+# Anthropic-style endpoints only cache up to explicit breakpoints. Marking the
+# last tool caches the whole (static) tool block together with the system
+# prompt; OpenAI/Gemini/GLM endpoints cache prefixes automatically.
+_CACHE_CONTROL_DEVICE_TOOLS = [
+    *DEVICE_TOOLS[:-1],
+    {**DEVICE_TOOLS[-1], "cache_control": {"type": "ephemeral"}},
+]
+
+
+def _uses_cache_control(model_name: str, base_url: str) -> bool:
+    """Whether the endpoint needs explicit ``cache_control`` breakpoints."""
+    return model_name.lower().startswith("claude") or "anthropic" in base_url.lower()
+
+
+def _tool_call_id(step: int) -> str:
+    """Tool call id for a step.
+
+    Derived from the step number only, so replays of a task produce
+    byte-identical tool-call turns for prompt and response caches.
+    """
+    return f"call_{step}"
 
 
 class AsyncGeminiAgent(AsyncAgentBase):
@@ -34,6 +64,15 @@ class AsyncGeminiAgent(AsyncAgentBase):
     def __init__(self, *args: Any, **kwargs: Any):
         super().__init__(*args, **kwargs)
         self._consecutive_invalid_tool_calls = 0
+        # Cleared once the endpoint rejects ``stream_options``.
+        self._stream_usage_supported = True
+        # Only deterministic sampling makes a cached tool call a valid answer.
+        self._response_cache: ResponseCache | None = (
+            ResponseCache()
+            if self.agent_config.enable_response_cache
+            and self.model_config.temperature == 0
+            else None
+        )
 
     def reset(self) -> None:
         super().reset()
@@ -48,6 +87,28 @@ class AsyncGeminiAgent(AsyncAgentBase):
         screenshot_base64: str,
         current_app: str,
         reference_images: list[dict[str, str]] | None = None,
+    ) -> None:
+        self._append_initial_context(
+            task, compress_screenshot(screenshot_base64), current_app, reference_images
+        )
+
+    async def _prepare_initial_context_async(
+        self,
+        task: str,
+        screenshot_base64: str,
+        current_app: str,
+        reference_images: list[dict[str, str]] | None = None,
+    ) -> None:
+        # 解码、缩放和 JPEG 编码较耗时，与后续步骤一样放到线程中执行
+        image = await asyncio.to_thread(compress_screenshot, screenshot_base64)
+        self._append_initial_context(task, image, current_app, reference_images)
+
+    def _append_initial_context(
+        self,
+        task: str,
+        image: dict[str, str],
+        current_app: str,
+        reference_images: list[dict[str, str]] | None,
     ) -> None:
         reference_images = reference_images or []
         reference_notice = MessageBuilder.build_user_reference_images_notice(
@@ -57,13 +118,15 @@ class AsyncGeminiAgent(AsyncAgentBase):
             f"\n\nUser reference images: {reference_notice}" if reference_notice else ""
         )
         self._consecutive_invalid_tool_calls = 0
+        # The task is its own text-only turn so that system prompt + task form
+        # a byte-stable prefix; screenshots always arrive as trailing turns.
+        self._context.append(
+            MessageBuilder.create_user_message(f"{task}{reference_section}")
+        )
         self._context.append(
             MessageBuilder.create_user_message_with_images(
-                text=f"{task}{reference_section}\n\nCurrent app: {current_app}",
-                images=[
-                    {"mime_type": "image/png", "data": screenshot_base64},
-                    *reference_images,
-                ],
+                text=f"Current app: {current_app}",
+                images=[image, *reference_images],
             )
         )
 
@@ -75,48 +138,31 @@ class AsyncGeminiAgent(AsyncAgentBase):
         # 1. 获取截图（非首步）
         if self._step_count > 1:
             try:
-                with trace_span(
-                    "step.capture_screenshot",
-                    attrs={
-                        "step": self._step_count,
-                        "agent_type": self.__class__.__name__,
-                    },
-                ):
-                    screenshot = await self.device.get_screenshot()
-                with trace_span(
-                    "step.get_current_app",
-                    attrs={
-                        "step": self._step_count,
-                        "agent_type": self.__class__.__name__,
-                    },
-                ):
-                    current_app = await self.device.get_current_app()
+                screenshot, current_app = await self._next_device_state()
             except Exception as e:
                 logger.error(f"Failed to get device info: {e}")
                 yield {"type": "error", "data": {"message": f"Device error: {e}"}}
-                yield {
-                    "type": "step",
-                    "data": {
-                        "step": self._step_count,
-                        "thinking": "",
-                        "action": None,
-                        "success": False,
-                        "finished": True,
-                        "message": f"Device error: {e}",
-                    },
-                }
+                yield step_event(
+                    self._step_count,
+                    success=False,
+                    finished=True,
+                    message=f"Device error: {e}",
+                )
                 return
 
             with trace_span(
                 "step.build_message",
                 attrs={"step": self._step_count, "agent_type": self.__class__.__name__},
             ):
+                image = await asyncio.to_thread(
+                    compress_screenshot, screenshot.base64_data
+                )
                 self._context.append(
-                    MessageBuilder.create_user_message(
-                        text=f"Current app: {current_app}",
-                        image_base64=screenshot.base64_data,
+                    MessageBuilder.create_user_message_with_images(
+                        text=f"Current app: {current_app}", images=[image]
                     )
                 )
+                self._release_stale_images()
 
         # 2. 调用 LLM with tools
         try:
@@ -130,12 +176,23 @@ class AsyncGeminiAgent(AsyncAgentBase):
                 },
             ) as span:
                 try:
-                    (
-                        thinking,
-                        reasoning_content,
-                        tool_name,
-                        tool_args,
-                    ) = await self._call_llm_with_tools()
+                    tool_call = None
+                    streamed_thinking = False
+                    async with contextlib.aclosing(
+                        self._stream_llm_with_tools()
+                    ) as llm_events:
+                        async for llm_event in llm_events:
+                            if isinstance(llm_event, str):
+                                streamed_thinking = True
+                                yield {
+                                    "type": "thinking",
+                                    "data": {"chunk": llm_event},
+                                }
+                            else:
+                                tool_call = llm_event
+                    if tool_call is None:
+                        raise RuntimeError("Model stream ended without a result")
+                    thinking, reasoning_content, tool_name, tool_args = tool_call
                     span.set_attributes(
                         {
                             "thinking_chars": len(thinking),
@@ -146,7 +203,7 @@ class AsyncGeminiAgent(AsyncAgentBase):
                     error_details = await serialize_model_error_async(
                         exc,
                         model_config=self.model_config,
-                        call_site="AutoGLM_GUI.agents.gemini.async_agent.AsyncGeminiAgent._call_llm_with_tools",
+                        call_site="AutoGLM_GUI.agents.gemini.async_agent.AsyncGeminiAgent._stream_llm_with_tools",
                     )
                     span.set_attributes(trace_error_attrs(error_details))
                     raise
@@ -155,32 +212,27 @@ class AsyncGeminiAgent(AsyncAgentBase):
         except Exception as e:
             logger.error(f"LLM error: {e}")
             if self.agent_config.verbose:
-                logger.debug(traceback.format_exc())
+                logger.opt(exception=True).debug("LLM error traceback")
             error_details = await serialize_model_error_async(
                 e,
                 model_config=self.model_config,
-                call_site="AutoGLM_GUI.agents.gemini.async_agent.AsyncGeminiAgent._call_llm_with_tools",
+                call_site="AutoGLM_GUI.agents.gemini.async_agent.AsyncGeminiAgent._stream_llm_with_tools",
             )
             message = model_error_message(e)
             yield {
                 "type": "error",
                 "data": {"message": message, "error_details": error_details},
             }
-            yield {
-                "type": "step",
-                "data": {
-                    "step": self._step_count,
-                    "thinking": "",
-                    "action": None,
-                    "success": False,
-                    "finished": True,
-                    "message": message,
-                    "error_details": error_details,
-                },
-            }
+            yield step_event(
+                self._step_count,
+                success=False,
+                finished=True,
+                message=message,
+                error_details=error_details,
+            )
             return
 
-        if thinking:
+        if thinking and not streamed_thinking:
             yield {"type": "thinking", "data": {"chunk": thinking}}
 
         # 3. 转换 tool call → action
@@ -196,7 +248,7 @@ class AsyncGeminiAgent(AsyncAgentBase):
                     "tool_name": tool_name,
                     "tool_arg_keys": sorted(tool_args.keys()),
                     "tool_args_preview": summarize_text(
-                        json.dumps(tool_args, ensure_ascii=False, default=str),
+                        json_utils.dumps(tool_args, default=str),
                         limit=512,
                     ),
                 },
@@ -231,8 +283,10 @@ class AsyncGeminiAgent(AsyncAgentBase):
                     )
 
         if self.agent_config.verbose:
-            logger.debug(f"🎯 Tool call: {tool_name}({tool_args})")
-            logger.debug(f"   Action: {json.dumps(action, ensure_ascii=False)}")
+            logger.debug("🎯 Tool call: {}({})", tool_name, tool_args)
+            logger.opt(lazy=True).debug(
+                "   Action: {}", lambda: json_utils.dumps(action)
+            )
 
         if action.get("_metadata") == "tool_error":
             limit_reached = (
@@ -250,7 +304,6 @@ class AsyncGeminiAgent(AsyncAgentBase):
                 "step.update_context",
                 attrs={"step": self._step_count, "agent_type": self.__class__.__name__},
             ):
-                self._remove_latest_message_images()
                 self._append_tool_exchange(
                     thinking=thinking,
                     reasoning_content=reasoning_content,
@@ -267,18 +320,15 @@ class AsyncGeminiAgent(AsyncAgentBase):
                     f"{error_message}"
                 )
 
-            yield {
-                "type": "step",
-                "data": {
-                    "step": self._step_count,
-                    "thinking": thinking,
-                    "action": action,
-                    "success": False,
-                    "finished": limit_reached,
-                    "message": message,
-                    "screenshot": screenshot.base64_data if screenshot else None,
-                },
-            }
+            yield step_event(
+                self._step_count,
+                thinking=thinking,
+                action=action,
+                success=False,
+                finished=limit_reached,
+                message=message,
+                screenshot=screenshot.base64_data if screenshot else None,
+            )
             return
 
         # 4. 执行 action
@@ -315,7 +365,6 @@ class AsyncGeminiAgent(AsyncAgentBase):
             "step.update_context",
             attrs={"step": self._step_count, "agent_type": self.__class__.__name__},
         ):
-            self._remove_latest_message_images()
             self._append_tool_exchange(
                 thinking=thinking,
                 reasoning_content=reasoning_content,
@@ -329,67 +378,235 @@ class AsyncGeminiAgent(AsyncAgentBase):
 
         # 6. 检查完成
         finished = action.get("_metadata") == "finish" or result.should_finish
+        if not finished:
+            self._prefetch_device_state()
+
+        yield step_event(
+            self._step_count,
+            thinking=thinking,
+            action=action,
+            success=result.success,
+            finished=finished,
+            message=result.message or action.get("message"),
+            screenshot=screenshot.base64_data if screenshot else None,
+        )
 
-        yield {
-            "type": "step",
-            "data": {
-                "step": self._step_count,
-                "thinking": thinking,
-                "action": action,
-                "success": result.success,
-                "finished": finished,
-                "message": result.message or action.get("message"),
-                "screenshot": screenshot.base64_data if screenshot else None,
-            },
-        }
-
-    async def _call_llm_with_tools(
-        self,
-    ) -> tuple[str, str | None, str, dict[str, Any]]:
+    async def _call_llm_with_tools(self) -> ToolCallResult:
         """调用 LLM，返回 (thinking, reasoning_content, tool_name, tool_args)。"""
+        result = None
+        async with contextlib.aclosing(self._stream_llm_with_tools()) as events:
+            async for event in events:
+                if not isinstance(event, str):
+                    result = event
+        if result is None:
+            raise RuntimeError("Model stream ended without a result")
+        return result
+
+    async def _stream_llm_with_tools(
+        self,
+    ) -> AsyncGenerator[str | ToolCallResult, None]:
+        """流式调用 LLM：先 yield thinking 片段，最后 yield 解析后的 tool call。
+
+        cancel() interrupts the stream read directly, so a cancelled task stops
+        paying for the rest of a slow model's response.
+        """
         if self._cancel_event.is_set():
             raise asyncio.CancelledError()
 
-        response = await self.openai_client.chat.completions.create(
-            messages=self._context,  # type: ignore[arg-type]
-            model=self.model_config.model_name,
-            max_tokens=self.model_config.max_tokens,
-            temperature=self.model_config.temperature,
-            tools=DEVICE_TOOLS,  # type: ignore[arg-type]
-            tool_choice="required",
-        )
-
-        choice = response.choices[0]
-        message = choice.message
+        messages = self._build_request_messages()
+        cache_key = None
+        if self._response_cache is not None:
+            cache_key = ResponseCache.make_key(
+                self.model_config.model_name, messages, DEVICE_TOOLS_JSON
+            )
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(
+                    f"Response cache hit on step {self._step_count} "
+                    f"({self._response_cache.hits} hits, "
+                    f"{self._response_cache.misses} misses)"
+                )
+                yield cached
+                return
 
-        thinking, reasoning_content = self._extract_thinking(message)
+        tools = DEVICE_TOOLS
+        if _uses_cache_control(
+            self.model_config.model_name, self.model_config.base_url
+        ):
+            messages = self._mark_cache_breakpoints(messages)
+            tools = _CACHE_CONTROL_DEVICE_TOOLS
+
+        request: dict[str, Any] = {
+            "messages": messages,
+            "model": self.model_config.model_name,
+            "max_tokens": self.model_config.max_tokens,
+            "temperature": self.model_config.temperature,
+            "tools": tools,
+            "tool_choice": "required",
+            "stream": True,
+        }
+        if self._stream_usage_supported:
+            # 流式响应默认不返回 usage，需显式请求，否则无法记录 prompt cache 命中
+            try:
+                stream = await self.openai_client.chat.completions.create(
+                    **request, stream_options={"include_usage": True}
+                )
+            except BadRequestError as exc:
+                if "stream_options" not in str(exc):
+                    raise
+                logger.info(
+                    "Endpoint rejected stream_options, streaming without usage: {}",
+                    self.model_config.base_url,
+                )
+                self._stream_usage_supported = False
+                stream = await self.openai_client.chat.completions.create(**request)
+        else:
+            stream = await self.openai_client.chat.completions.create(**request)
+
+        # Only the extracted text is kept; chunk objects are dropped as we go.
+        content_parts: list[str] = []
+        reasoning_parts: list[str] = []
+        tool_name: str | None = None
+        argument_parts: list[str] = []
+        usage = None
+        try:
+            async for chunk in iter_cooperatively(self._interruptible_stream(stream)):
+                usage = getattr(chunk, "usage", None) or usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+
+                reasoning = self._message_text_field(
+                    delta, "reasoning_content"
+                ) or self._message_text_field(delta, "reasoning")
+                if reasoning:
+                    reasoning_parts.append(reasoning)
+
+                content = self._message_text_field(delta, "content")
+                if content:
+                    content_parts.append(content)
+                    yield content
+
+                for tool_call in getattr(delta, "tool_calls", None) or []:
+                    # Only the first tool call is executed, as before streaming.
+                    function = tool_call.function
+                    if (tool_call.index or 0) != 0 or function is None:
+                        continue
+                    if function.name:
+                        tool_name = function.name
+                    if function.arguments:
+                        argument_parts.append(function.arguments)
+        finally:
+            await stream.close()
+
+        self._log_cache_usage(usage)
+        result = self._parse_tool_call(
+            content="".join(content_parts),
+            reasoning_content="".join(reasoning_parts),
+            tool_name=tool_name,
+            arguments="".join(argument_parts),
+        )
+        if cache_key is not None and self._response_cache is not None:
+            self._response_cache.put(cache_key, result)
+        yield result
 
-        if message.tool_calls and len(message.tool_calls) > 0:
-            tool_call = message.tool_calls[0]
-            tool_name = tool_call.function.name  # type: ignore[union-attr]
+    @staticmethod
+    def _parse_tool_call(
+        *,
+        content: str,
+        reasoning_content: str,
+        tool_name: str | None,
+        arguments: str,
+    ) -> ToolCallResult:
+        thinking = content or reasoning_content
+
+        if tool_name:
             try:
-                parsed_args = json.loads(tool_call.function.arguments)  # type: ignore[union-attr]
+                parsed_args = json_utils.loads(arguments or "{}")
                 tool_args = parsed_args if isinstance(parsed_args, dict) else {}
-            except json.JSONDecodeError as e:
+            except json_utils.JSONDecodeError as e:
                 logger.warning(
                     f"Failed to parse tool arguments for {tool_name}: {e}. "
-                    f"Raw: {tool_call.function.arguments!r}"  # type: ignore[union-attr]
+                    f"Raw: {arguments!r}"
                 )
                 tool_args = {}
-            return thinking, reasoning_content, tool_name, tool_args
+            return thinking, reasoning_content or None, tool_name, tool_args
 
         logger.warning("Model did not return a tool call, treating as finish")
         return (
             thinking,
-            reasoning_content,
+            reasoning_content or None,
             "finish",
             {"message": thinking or "No action returned"},
         )
 
-    def _remove_latest_message_images(self) -> None:
-        if len(self._context) > 1:
-            self._context[-1] = MessageBuilder.remove_images_from_message(
-                self._context[-1]
+    def _image_window_indices(self) -> set[int]:
+        """Indices of the screenshot turns whose images are sent to the model.
+
+        The window grows by one screenshot per step and collapses back to the
+        latest screenshot once it would exceed ``agent_config.image_window``.
+        Between collapses the request only ever gains trailing turns, so the
+        prefix stays byte-identical and provider prompt caches keep hitting.
+        """
+        image_indices = [
+            index
+            for index, message in enumerate(self._context)
+            if message.get("role") == "user"
+            and isinstance(message.get("content"), list)
+        ]
+        if not image_indices:
+            return set()
+        window = max(1, self.agent_config.image_window)
+        keep = (len(image_indices) - 1) % window + 1
+        return set(image_indices[-keep:])
+
+    def _build_request_messages(self) -> list[dict[str, Any]]:
+        """Project the context into the messages sent to the model.
+
+        Images outside the screenshot window are dropped from the request;
+        text parts of those turns are kept.
+        """
+        keep = self._image_window_indices()
+        return [
+            message
+            if index in keep
+            else MessageBuilder.remove_images_from_message(message)
+            for index, message in enumerate(self._context)
+        ]
+
+    def _release_stale_images(self) -> None:
+        """Strip images that can no longer re-enter the window from history.
+
+        Such images are never sent again, so dropping them keeps memory at
+        O(image_window) screenshots without changing any future request.
+        """
+        keep = self._image_window_indices()
+        for index, message in enumerate(self._context):
+            if index not in keep:
+                MessageBuilder.strip_images_in_place(message)
+
+    @staticmethod
+    def _mark_cache_breakpoints(
+        messages: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Add cache breakpoints on the system prompt and the task turn."""
+        marked = list(messages)
+        for index, message in enumerate(marked[:2]):
+            if message.get("role") in ("system", "user"):
+                marked[index] = MessageBuilder.with_cache_control(message)
+        return marked
+
+    def _log_cache_usage(self, usage: Any) -> None:
+        if usage is None:
+            return
+        cached_tokens = getattr(usage, "cache_read_input_tokens", None)
+        if cached_tokens is None:
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached_tokens = getattr(details, "cached_tokens", None)
+        if cached_tokens is not None:
+            logger.debug(
+                f"Step {self._step_count} prompt cache: {cached_tokens} cached of "
+                f"{getattr(usage, 'prompt_tokens', None)} prompt tokens"
             )
 
     def _append_tool_exchange(
@@ -401,7 +618,7 @@ class AsyncGeminiAgent(AsyncAgentBase):
         tool_args: dict[str, Any],
         tool_result: dict[str, Any],
     ) -> None:
-        tool_call_id = f"call_{self._step_count}"
+        tool_call_id = _tool_call_id(self._step_count)
         assistant_message = {
             "role": "assistant",
             "content": thinking or "",
@@ -411,7 +628,7 @@ class AsyncGeminiAgent(AsyncAgentBase):
                     "type": "function",
                     "function": {
                         "name": tool_name,
-                        "arguments": json.dumps(tool_args, ensure_ascii=False),
+                        "arguments": json_utils.dumps(tool_args, sort_keys=True),
                     },
                 }
             ],
@@ -423,7 +640,7 @@ class AsyncGeminiAgent(AsyncAgentBase):
             {
                 "role": "tool",
                 "tool_call_id": tool_call_id,
-                "content": json.dumps(tool_result, ensure_ascii=False),
+                "content": json_utils.dumps(tool_result),
             }
         )
 
@@ -434,14 +651,6 @@ class AsyncGeminiAgent(AsyncAgentBase):
             "Return arguments that match the declared tool schema."
         )
 
-    @classmethod
-    def _extract_thinking(cls, message: Any) -> tuple[str, str | None]:
-        content = cls._message_text_field(message, "content")
-        reasoning_content = cls._message_text_field(
-            message, "reasoning_content"
-        ) or cls._message_text_field(message, "reasoning")
-        return content or reasoning_content, reasoning_content or None
-
     @staticmethod
     def _message_text_field(message: Any, field_name: str) -> str:
         if isinstance(message, dict):
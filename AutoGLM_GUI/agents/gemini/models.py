@@ -5,6 +5,7 @@ Task: "打开微信" with mock Android home screen screenshot.
 Date: 2026-02-22
 """
 
+from collections import defaultdict
 from dataclasses import dataclass
 
 
@@ -21,7 +22,7 @@ class ModelBenchmark:
 
 
 # Benchmark results (2026-02-22, single-step, vision + function calling)
-BENCHMARKS: list[ModelBenchmark] = [
+BENCHMARKS: tuple[ModelBenchmark, ...] = (
     # --- OpenAI ---
     ModelBenchmark("gpt-4.1", "openai", 2510, "tap", True, "稳定快速"),
     ModelBenchmark("gpt-4.1-mini", "openai", 2521, "tap", True, "性价比高"),
@@ -70,7 +71,7 @@ BENCHMARKS: list[ModelBenchmark] = [
         True,
         "代理转发极慢",
     ),
-]
+)
 
 
 # Recommended models (compatible + fast + good decisions)
@@ -95,17 +96,33 @@ INCOMPATIBLE_MODELS = [
 ]
 
 
+def _group_by_provider(
+    benchmarks: tuple[ModelBenchmark, ...],
+) -> dict[str, tuple[ModelBenchmark, ...]]:
+    grouped: defaultdict[str, list[ModelBenchmark]] = defaultdict(list)
+    for benchmark in benchmarks:
+        grouped[benchmark.provider].append(benchmark)
+    return {provider: tuple(group) for provider, group in grouped.items()}
+
+
+# Derived views, computed once since BENCHMARKS is immutable
+_COMPATIBLE: tuple[ModelBenchmark, ...] = tuple(b for b in BENCHMARKS if b.compatible)
+_BY_SPEED: tuple[ModelBenchmark, ...] = tuple(
+    sorted(_COMPATIBLE, key=lambda b: b.latency_ms)
+)
+_BY_PROVIDER: dict[str, tuple[ModelBenchmark, ...]] = _group_by_provider(BENCHMARKS)
+
+
 def get_compatible_benchmarks() -> list[ModelBenchmark]:
     """Return only models that support vision + function calling."""
-    return [b for b in BENCHMARKS if b.compatible]
+    return list(_COMPATIBLE)
 
 
 def get_benchmarks_by_provider(provider: str) -> list[ModelBenchmark]:
     """Return benchmarks filtered by provider."""
-    return [b for b in BENCHMARKS if b.provider == provider]
+    return list(_BY_PROVIDER.get(provider, ()))
 
 
 def get_fastest_models(top_n: int = 5) -> list[ModelBenchmark]:
     """Return top N fastest compatible models."""
-    compatible = get_compatible_benchmarks()
-    return sorted(compatible, key=lambda b: b.latency_ms)[:top_n]
+    return list(_BY_SPEED[:top_n])
@@ -3,6 +3,7 @@
 Date is injected dynamically to avoid stale values in long-running processes.
 """
 
+import functools
 from datetime import datetime
 
 _SYSTEM_PROMPT_TEMPLATE = """\
@@ -77,11 +78,24 @@ _SYSTEM_PROMPT_TEMPLATE_ZH = """\
 """
 
 
+# Split once around the date placeholder so the static parts are byte-stable
+# and building a prompt is a plain concatenation.
+_TEMPLATE_PARTS = {
+    "en": tuple(_SYSTEM_PROMPT_TEMPLATE.split("{date}", 1)),
+    "cn": tuple(_SYSTEM_PROMPT_TEMPLATE_ZH.split("{date}", 1)),
+}
+
+
+@functools.lru_cache(maxsize=4)
+def _render_system_prompt(lang: str, formatted_date: str) -> str:
+    prefix, suffix = _TEMPLATE_PARTS["cn" if lang == "cn" else "en"]
+    return prefix + formatted_date + suffix
+
+
 def get_system_prompt(lang: str = "en") -> str:
     """Get system prompt with current date dynamically injected."""
     formatted_date = datetime.today().strftime("%Y-%m-%d, %A")
-    template = _SYSTEM_PROMPT_TEMPLATE_ZH if lang == "cn" else _SYSTEM_PROMPT_TEMPLATE
-    return template.format(date=formatted_date)
+    return _render_system_prompt(lang, formatted_date)
 
 
 # Backward-compatible module-level constants (snapshot at import time)
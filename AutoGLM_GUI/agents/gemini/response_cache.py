@@ -0,0 +1,83 @@
+"""Opt-in response cache for Gemini Agent.
+
+Replays and repeated debugging runs send the model the same task on the same
+screens. With deterministic sampling (temperature 0) the returned tool call is
+the same, so it can be served from memory instead of paying for another model
+round-trip.
+
+Screenshots are keyed by a digest of their base64 payload. Hashing the bytes is
+cheap enough to run on the event loop every step, unlike decoding each image;
+the cache is opt-in and usually misses, so the key must cost little.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any
+
+from AutoGLM_GUI import json_utils
+
+# (thinking, reasoning_content, tool_name, tool_args)
+CachedToolCall = tuple[str, str | None, str, dict[str, Any]]
+
+
+def _image_digest(data_url: str) -> str:
+    return hashlib.blake2b(data_url.encode(), digest_size=16).hexdigest()
+
+
+def _fingerprint_message(message: dict[str, Any]) -> dict[str, Any]:
+    content = message.get("content")
+    if not isinstance(content, list):
+        return message
+
+    parts: list[Any] = []
+    for part in content:
+        if isinstance(part, dict) and part.get("type") == "image_url":
+            url = part.get("image_url", {}).get("url", "")
+            parts.append({"type": "image_digest", "hash": _image_digest(url)})
+        else:
+            parts.append(part)
+    return {**message, "content": parts}
+
+
+class ResponseCache:
+    """Bounded LRU cache of model tool calls keyed by request fingerprint."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CachedToolCall] = OrderedDict()
+
+    @staticmethod
+    def make_key(
+        model_name: str,
+        messages: list[dict[str, Any]],
+        tools_json: str,
+    ) -> str:
+        """Fingerprint a request: model, tool schemas and message content."""
+        payload = json_utils.dumps_bytes(
+            [model_name, tools_json, [_fingerprint_message(m) for m in messages]],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> CachedToolCall | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        thinking, reasoning_content, tool_name, tool_args = entry
+        return thinking, reasoning_content, tool_name, dict(tool_args)
+
+    def put(self, key: str, value: CachedToolCall) -> None:
+        thinking, reasoning_content, tool_name, tool_args = value
+        self._entries[key] = (thinking, reasoning_content, tool_name, dict(tool_args))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -4,30 +4,37 @@ Maps device operations to OpenAI-compatible tool schemas.
 Coordinates use 0-1000 relative scale (same as GLM agent).
 """
 
+from typing import Any
+
+from AutoGLM_GUI import json_utils
+
+
+def _coordinate(description: str) -> dict[str, Any]:
+    return {
+        "type": "integer",
+        "description": description,
+        "minimum": 0,
+        "maximum": 1000,
+    }
+
+
+# Shared by tap / double_tap / long_press; treat as read-only.
+_POINT_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "x": _coordinate("X coordinate (0-1000)"),
+        "y": _coordinate("Y coordinate (0-1000)"),
+    },
+    "required": ["x", "y"],
+}
+
 DEVICE_TOOLS = [
     {
         "type": "function",
         "function": {
             "name": "tap",
             "description": "Tap at a point on the screen. Coordinates are relative (0-1000 scale).",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "x": {
-                        "type": "integer",
-                        "description": "X coordinate (0-1000)",
-                        "minimum": 0,
-                        "maximum": 1000,
-                    },
-                    "y": {
-                        "type": "integer",
-                        "description": "Y coordinate (0-1000)",
-                        "minimum": 0,
-                        "maximum": 1000,
-                    },
-                },
-                "required": ["x", "y"],
-            },
+            "parameters": _POINT_PARAMETERS,
         },
     },
     {
@@ -35,24 +42,7 @@ DEVICE_TOOLS = [
         "function": {
             "name": "double_tap",
             "description": "Double tap at a point on the screen.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "x": {
-                        "type": "integer",
-                        "description": "X coordinate (0-1000)",
-                        "minimum": 0,
-                        "maximum": 1000,
-                    },
-                    "y": {
-                        "type": "integer",
-                        "description": "Y coordinate (0-1000)",
-                        "minimum": 0,
-                        "maximum": 1000,
-                    },
-                },
-                "required": ["x", "y"],
-            },
+            "parameters": _POINT_PARAMETERS,
         },
     },
     {
@@ -60,24 +50,7 @@ DEVICE_TOOLS = [
         "function": {
             "name": "long_press",
             "description": "Long press at a point on the screen.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "x": {
-                        "type": "integer",
-                        "description": "X coordinate (0-1000)",
-                        "minimum": 0,
-                        "maximum": 1000,
-                    },
-                    "y": {
-                        "type": "integer",
-                        "description": "Y coordinate (0-1000)",
-                        "minimum": 0,
-                        "maximum": 1000,
-                    },
-                },
-                "required": ["x", "y"],
-            },
+            "parameters": _POINT_PARAMETERS,
         },
     },
     {
@@ -88,30 +61,10 @@ DEVICE_TOOLS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "start_x": {
-                        "type": "integer",
-                        "description": "Start X (0-1000)",
-                        "minimum": 0,
-                        "maximum": 1000,
-                    },
-                    "start_y": {
-                        "type": "integer",
-                        "description": "Start Y (0-1000)",
-                        "minimum": 0,
-                        "maximum": 1000,
-                    },
-                    "end_x": {
-                        "type": "integer",
-                        "description": "End X (0-1000)",
-                        "minimum": 0,
-                        "maximum": 1000,
-                    },
-                    "end_y": {
-                        "type": "integer",
-                        "description": "End Y (0-1000)",
-                        "minimum": 0,
-                        "maximum": 1000,
-                    },
+                    "start_x": _coordinate("Start X (0-1000)"),
+                    "start_y": _coordinate("Start Y (0-1000)"),
+                    "end_x": _coordinate("End X (0-1000)"),
+                    "end_y": _coordinate("End Y (0-1000)"),
                 },
                 "required": ["start_x", "start_y", "end_x", "end_y"],
             },
@@ -190,3 +143,7 @@ DEVICE_TOOLS = [
         },
     },
 ]
+
+# Canonical serialization of DEVICE_TOOLS, computed once for request
+# fingerprinting (see ResponseCache.make_key).
+DEVICE_TOOLS_JSON = json_utils.dumps(DEVICE_TOOLS, sort_keys=True)
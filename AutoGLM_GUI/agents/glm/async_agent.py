@@ -1,14 +1,18 @@
 """AsyncGLMAgent - 异步 GLM Agent，使用流式文本解析。"""
 
 import asyncio
-import json
-import traceback
+import re
 from collections.abc import AsyncGenerator
 from typing import Any
 from collections.abc import Callable
 
-from AutoGLM_GUI.agents.base import AsyncAgentBase
+from AutoGLM_GUI.agents.base import (
+    AsyncAgentBase,
+    CachedActionParser,
+    iter_cooperatively,
+)
 from AutoGLM_GUI.agents.protocols import AsyncAgent
+from AutoGLM_GUI import json_utils
 from AutoGLM_GUI.config import AgentConfig, ModelConfig
 from AutoGLM_GUI.device_protocol import DeviceProtocol
 from AutoGLM_GUI.logger import logger
@@ -18,12 +22,45 @@ from AutoGLM_GUI.model.error_details import (
     serialize_model_error_async,
     trace_error_attrs,
 )
-from AutoGLM_GUI.prompt_config import get_messages, get_system_prompt
+from AutoGLM_GUI.prompt_config import get_system_prompt
 from AutoGLM_GUI.trace import trace_span
 
 from .parser import GLMParser
 
 
+# Markers that end the thinking phase of a streamed response.
+_ACTION_MARKERS = ("finish(message=", "do(action=")
+# Proper prefixes of the markers: a buffer ending in one may be a marker split
+# across chunks, so it is held back instead of being emitted as thinking.
+_MARKER_PREFIXES = frozenset(
+    marker[:i] for marker in _ACTION_MARKERS for i in range(1, len(marker))
+)
+_MAX_MARKER_PREFIX_LEN = max(len(marker) for marker in _ACTION_MARKERS) - 1
+# Any place an action can start in a complete response, found in one scan.
+_ACTION_START_RE = re.compile(r"finish\(message=|do\(action=|<answer>")
+
+
+def _ends_with_marker_prefix(buffer: str) -> bool:
+    """Whether the tail of ``buffer`` could be the start of an action marker."""
+    for length in range(min(len(buffer), _MAX_MARKER_PREFIX_LEN), 0, -1):
+        if buffer[-length:] in _MARKER_PREFIXES:
+            return True
+    return False
+
+
+def _leading_thinking(content: str) -> str:
+    """Thinking text of a complete response, as the streaming split yields it.
+
+    The text ends at whichever action marker starts first.
+    """
+    positions = [
+        position
+        for position in (content.find(marker) for marker in _ACTION_MARKERS)
+        if position != -1
+    ]
+    return content[: min(positions)] if positions else content
+
+
 def _count_image_parts(messages: list[dict[str, Any]]) -> int:
     count = 0
     for message in messages:
@@ -49,6 +86,7 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
         takeover_callback: Callable[[str], None] | None = None,
     ):
         self.parser = GLMParser()
+        self._parse_action = CachedActionParser(self.parser.parse)
         super().__init__(
             model_config=model_config,
             agent_config=agent_config,
@@ -84,16 +122,7 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
 
         # 1. 获取当前屏幕状态
         try:
-            with trace_span(
-                "step.capture_screenshot",
-                attrs={"step": self._step_count, "agent_type": self.__class__.__name__},
-            ):
-                screenshot = await self.device.get_screenshot()
-            with trace_span(
-                "step.get_current_app",
-                attrs={"step": self._step_count, "agent_type": self.__class__.__name__},
-            ):
-                current_app = await self.device.get_current_app()
+            screenshot, current_app = await self._next_device_state()
         except Exception as e:
             logger.error(f"Failed to get device info: {e}")
             yield {"type": "error", "data": {"message": f"Device error: {e}"}}
@@ -116,10 +145,8 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
             attrs={"step": self._step_count, "agent_type": self.__class__.__name__},
         ):
             # 清除历史消息中残留的截图，保证本次请求只包含当前屏幕这一张图。
-            self._context = [
-                MessageBuilder.remove_images_from_message(message)
-                for message in self._context
-            ]
+            for message in self._context:
+                MessageBuilder.strip_images_in_place(message)
 
             screen_info = MessageBuilder.build_screen_info(current_app)
             if self._step_count == 1 and self._pending_task is not None:
@@ -155,18 +182,20 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
         image_count = _count_image_parts(self._context)
         if image_count < 1:
             logger.warning(
-                "GLM request should carry at least one screenshot, got %d (step %d)",
+                "GLM request should carry at least one screenshot, got {} (step {})",
                 image_count,
                 self._step_count,
             )
 
         try:
             if self.agent_config.verbose:
-                msgs = get_messages(self.agent_config.lang)
+                msgs = self._msgs
                 logger.debug(f"💭 {msgs['thinking']}:")
 
-            thinking_parts = []
-            raw_content = ""
+            thinking_parts: list[str] = []
+            raw_parts: list[str] = []
+
+            request_messages = self._history_window()
 
             with trace_span(
                 "step.llm",
@@ -174,14 +203,11 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
                     "step": self._step_count,
                     "agent_type": self.__class__.__name__,
                     "model_name": self.model_config.model_name,
-                    "message_count": len(self._context),
+                    "message_count": len(request_messages),
                 },
             ) as span:
                 try:
-                    async for chunk_data in self._stream_openai(self._context):
-                        if self._cancel_event.is_set():
-                            raise asyncio.CancelledError()
-
+                    async for chunk_data in self._stream_openai(request_messages):
                         if chunk_data["type"] == "thinking":
                             thinking_parts.append(chunk_data["content"])
                             yield {
@@ -192,7 +218,7 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
                                 logger.debug(chunk_data["content"])
 
                         elif chunk_data["type"] == "raw":
-                            raw_content += chunk_data["content"]
+                            raw_parts.append(chunk_data["content"])
                 except Exception as exc:
                     if isinstance(exc, asyncio.CancelledError):
                         raise
@@ -205,6 +231,7 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
                     raise
 
             thinking = "".join(thinking_parts)
+            raw_content = "".join(raw_parts)
 
         except asyncio.CancelledError:
             logger.info(f"Step {self._step_count} cancelled during LLM call")
@@ -213,7 +240,7 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
         except Exception as e:
             logger.error(f"LLM error: {e}")
             if self.agent_config.verbose:
-                logger.debug(traceback.format_exc())
+                logger.opt(exception=True).debug("LLM error traceback")
             error_details = await serialize_model_error_async(
                 e,
                 model_config=self.model_config,
@@ -245,16 +272,18 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
         ):
             _, action_str = self._parse_raw_response(raw_content)
             try:
-                action = self.parser.parse(action_str)
+                action = self._parse_action(action_str)
             except ValueError as e:
                 if self.agent_config.verbose:
                     logger.warning(f"Failed to parse action: {e}, treating as finish")
                 action = {"_metadata": "finish", "message": action_str}
 
         if self.agent_config.verbose:
-            msgs = get_messages(self.agent_config.lang)
+            msgs = self._msgs
             logger.debug(f"🎯 {msgs['action']}:")
-            logger.debug(json.dumps(action, ensure_ascii=False, indent=2))
+            logger.opt(lazy=True).debug(
+                "{}", lambda: json_utils.dumps(action, indent=True)
+            )
 
         # 5. 执行 action
         try:
@@ -275,7 +304,7 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
         except Exception as e:
             logger.error(f"Action execution error: {e}")
             if self.agent_config.verbose:
-                logger.debug(traceback.format_exc())
+                logger.opt(exception=True).debug("Action execution error traceback")
             from AutoGLM_GUI.actions import ActionResult
 
             result = ActionResult(success=False, should_finish=True, message=str(e))
@@ -285,9 +314,7 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
             "step.update_context",
             attrs={"step": self._step_count, "agent_type": self.__class__.__name__},
         ):
-            self._context[-1] = MessageBuilder.remove_images_from_message(
-                self._context[-1]
-            )
+            MessageBuilder.strip_images_in_place(self._context[-1])
             self._context.append(
                 MessageBuilder.create_assistant_message(
                     f"<think>{thinking}</think><answer>{action_str}</answer>"
@@ -316,8 +343,10 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
 
         # 7. 检查完成
         finished = action.get("_metadata") == "finish" or result.should_finish
+        if not finished:
+            self._prefetch_device_state()
         if finished and self.agent_config.verbose:
-            msgs = get_messages(self.agent_config.lang)
+            msgs = self._msgs
             logger.debug(
                 f"✅ {msgs['task_completed']}: "
                 f"{result.message or action.get('message', msgs['done'])}"
@@ -353,15 +382,14 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
         )
 
         buffer = ""
-        action_markers = ["finish(message=", "do(action="]
         in_action_phase = False
+        # Without a live consumer (or verbose logging) the thinking text is
+        # split off once at the end instead of scanning every chunk for markers.
+        live_thinking = self._live_thinking or self.agent_config.verbose
+        raw_parts: list[str] = []
 
         try:
-            async for chunk in stream:
-                if self._cancel_event.is_set():
-                    await stream.close()
-                    raise asyncio.CancelledError()
-
+            async for chunk in iter_cooperatively(self._interruptible_stream(stream)):
                 if len(chunk.choices) == 0:
                     continue
 
@@ -369,13 +397,17 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
                     content = chunk.choices[0].delta.content
                     yield {"type": "raw", "content": content}
 
+                    if not live_thinking:
+                        raw_parts.append(content)
+                        continue
+
                     if in_action_phase:
                         continue
 
                     buffer += content
 
                     marker_found = False
-                    for marker in action_markers:
+                    for marker in _ACTION_MARKERS:
                         if marker in buffer:
                             thinking_part = buffer.split(marker, 1)[0]
                             yield {"type": "thinking", "content": thinking_part}
@@ -386,41 +418,46 @@ class AsyncGLMAgent(AsyncAgentBase, AsyncAgent):
                     if marker_found:
                         continue
 
-                    is_potential_marker = False
-                    for marker in action_markers:
-                        for i in range(1, len(marker)):
-                            if buffer.endswith(marker[:i]):
-                                is_potential_marker = True
-                                break
-                        if is_potential_marker:
-                            break
-
-                    if not is_potential_marker and len(buffer) > 0:
+                    if buffer and not _ends_with_marker_prefix(buffer):
                         yield {"type": "thinking", "content": buffer}
                         buffer = ""
 
+            if not live_thinking:
+                thinking = _leading_thinking("".join(raw_parts))
+                if thinking:
+                    yield {"type": "thinking", "content": thinking}
+
         finally:
             await stream.close()
 
     @staticmethod
     def _parse_raw_response(content: str) -> tuple[str, str]:
-        """解析原始响应，提取 thinking 和 action。"""
-        if "finish(message=" in content:
-            parts = content.split("finish(message=", 1)
-            thinking = parts[0].strip()
-            action = "finish(message=" + parts[1]
-            return thinking, action
-
-        if "do(action=" in content:
-            parts = content.split("do(action=", 1)
-            thinking = parts[0].strip()
-            action = "do(action=" + parts[1]
-            return thinking, action
-
-        if "<answer>" in content:
-            parts = content.split("<answer>", 1)
-            thinking = parts[0].replace("<think>", "").replace("</think>", "").strip()
-            action = parts[1].replace("</answer>", "").strip()
+        """解析原始响应，提取 thinking 和 action。
+
+        优先级与逐个标记查找一致：finish(message= > do(action= > <answer>，
+        但只需对响应做一次扫描，再在剩余部分确认是否有更高优先级的标记。
+        """
+        match = _ACTION_START_RE.search(content)
+        if match is None:
+            return "", content
+
+        marker = match.group(0)
+        if marker != "finish(message=":
+            finish_at = content.find("finish(message=", match.end())
+            if finish_at != -1:
+                return content[:finish_at].strip(), content[finish_at:]
+
+        if marker == "<answer>":
+            do_at = content.find("do(action=", match.end())
+            if do_at != -1:
+                return content[:do_at].strip(), content[do_at:]
+            thinking = (
+                content[: match.start()]
+                .replace("<think>", "")
+                .replace("</think>", "")
+                .strip()
+            )
+            action = content[match.end() :].replace("</answer>", "").strip()
             return thinking, action
 
-        return "", content
+        return content[: match.start()].strip(), content[match.start() :]
@@ -11,7 +11,6 @@
 import asyncio
 import base64
 import json
-import traceback
 from collections.abc import AsyncGenerator, Callable
 from io import BytesIO
 from typing import Any
@@ -19,7 +18,7 @@ from typing import Any
 from PIL import Image
 
 from AutoGLM_GUI.actions import ActionResult
-from AutoGLM_GUI.agents.base import AsyncAgentBase
+from AutoGLM_GUI.agents.base import AsyncAgentBase, iter_cooperatively
 from AutoGLM_GUI.config import AgentConfig, ModelConfig
 from AutoGLM_GUI.device_protocol import DeviceProtocol
 from AutoGLM_GUI.logger import logger
@@ -83,16 +82,7 @@ class AsyncMAIAgent(AsyncAgentBase):
 
         # 1. 获取当前屏幕状态
         try:
-            with trace_span(
-                "step.capture_screenshot",
-                attrs={"step": self._step_count, "agent_type": self.__class__.__name__},
-            ):
-                screenshot = await self.device.get_screenshot()
-            with trace_span(
-                "step.get_current_app",
-                attrs={"step": self._step_count, "agent_type": self.__class__.__name__},
-            ):
-                current_app = await self.device.get_current_app()
+            screenshot, current_app = await self._next_device_state()
         except Exception as e:
             logger.error(f"Failed to get device info: {e}")
             yield {"type": "error", "data": {"message": f"Device error: {e}"}}
@@ -140,11 +130,11 @@ class AsyncMAIAgent(AsyncAgentBase):
         converted_action = None
 
         for attempt in range(max_retries):
+            thinking_parts: list[str] = []
             try:
                 if self._cancel_event.is_set():
                     raise asyncio.CancelledError()
 
-                thinking_parts: list[str] = []
                 raw_content = ""
 
                 with trace_span(
@@ -158,9 +148,6 @@ class AsyncMAIAgent(AsyncAgentBase):
                     },
                 ):
                     async for chunk_data in self._stream_openai(messages):
-                        if self._cancel_event.is_set():
-                            raise asyncio.CancelledError()
-
                         if chunk_data["type"] == "thinking":
                             thinking_parts.append(chunk_data["content"])
                             yield {
@@ -170,8 +157,6 @@ class AsyncMAIAgent(AsyncAgentBase):
                         elif chunk_data["type"] == "raw":
                             raw_content += chunk_data["content"]
 
-                thinking = "".join(thinking_parts)
-
                 with trace_span(
                     "step.parse_action",
                     attrs={
@@ -195,6 +180,8 @@ class AsyncMAIAgent(AsyncAgentBase):
                     f"Parse failed (attempt {attempt + 1}/{max_retries}): {e}"
                 )
                 if attempt == max_retries - 1:
+                    # Streamed thinking is only needed when parsing gave up.
+                    thinking = "".join(thinking_parts)
                     yield {"type": "error", "data": {"message": f"Parse error: {e}"}}
                     yield {
                         "type": "step",
@@ -215,7 +202,7 @@ class AsyncMAIAgent(AsyncAgentBase):
                 )
                 if attempt == max_retries - 1:
                     if self.agent_config.verbose:
-                        logger.debug(traceback.format_exc())
+                        logger.opt(exception=True).debug("Model call traceback")
                     yield {"type": "error", "data": {"message": f"Model error: {e}"}}
                     yield {
                         "type": "step",
@@ -245,7 +232,7 @@ class AsyncMAIAgent(AsyncAgentBase):
             return
 
         if self.agent_config.verbose:
-            logger.debug(f"Step {self._step_count} action: {converted_action}")
+            logger.debug("Step {} action: {}", self._step_count, converted_action)
 
         # 4. 记录轨迹
         with trace_span(
@@ -264,6 +251,7 @@ class AsyncMAIAgent(AsyncAgentBase):
                 model_name=self.model_config.model_name,
                 screenshot_bytes=screenshot_bytes,
                 structured_action={"action_json": raw_action},
+                screenshot_base64=screenshot.base64_data,
             )
             with trace_span(
                 "memory.write",
@@ -296,11 +284,13 @@ class AsyncMAIAgent(AsyncAgentBase):
         except Exception as e:
             logger.error(f"Action execution error: {e}")
             if self.agent_config.verbose:
-                logger.debug(traceback.format_exc())
+                logger.opt(exception=True).debug("Action execution error traceback")
             result = ActionResult(success=False, should_finish=True, message=str(e))
 
         # 6. 检查完成
         finished = converted_action.get("_metadata") == "finish" or result.should_finish
+        if not finished:
+            self._prefetch_device_state()
 
         # 7. 返回步骤结果
         yield {
@@ -336,11 +326,7 @@ class AsyncMAIAgent(AsyncAgentBase):
         in_action_phase = False
 
         try:
-            async for chunk in stream:
-                if self._cancel_event.is_set():
-                    await stream.close()
-                    raise asyncio.CancelledError()
-
+            async for chunk in iter_cooperatively(self._interruptible_stream(stream)):
                 if len(chunk.choices) == 0:
                     continue
 
@@ -393,14 +379,14 @@ class AsyncMAIAgent(AsyncAgentBase):
             MessageBuilder.create_user_message(f"{instruction}\n\n{screen_info}"),
         ]
 
-        history_images = self.traj_memory.get_history_images(self._history_n - 1)
+        # 历史截图保留了采集时的 base64，避免每一步重新编码
+        history_images = self.traj_memory.get_history_images_base64(self._history_n - 1)
         history_thoughts = self.traj_memory.get_history_thoughts(self._history_n - 1)
         history_actions = self.traj_memory.get_history_actions(self._history_n - 1)
 
-        for img_bytes, thought, action in zip(
+        for img_base64, thought, action in zip(
             history_images, history_thoughts, history_actions
         ):
-            img_base64 = base64.b64encode(img_bytes).decode("utf-8")
             messages.append(
                 MessageBuilder.create_user_message(
                     text=screen_info, image_base64=img_base64
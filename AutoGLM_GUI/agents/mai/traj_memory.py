@@ -8,6 +8,7 @@
 - 与 AutoGLM_GUI 架构集成
 """
 
+import base64
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -32,6 +33,7 @@ class TrajStep:
         model_name: 使用的模型名称（如 "qwen2-vl-7b"）
         screenshot_bytes: 截图的字节数据（可选，用于序列化）
         structured_action: 结构化的动作数据（可选，包含额外元数据）
+        screenshot_base64: 截图的 base64 编码（可选，构建历史消息时直接复用）
     """
 
     screenshot: Image.Image
@@ -45,6 +47,7 @@ class TrajStep:
     model_name: str
     screenshot_bytes: bytes | None = None
     structured_action: dict[str, Any] | None = None
+    screenshot_base64: str | None = None
 
 
 @dataclass
@@ -72,6 +75,17 @@ class TrajMemory:
             return images[-n:]
         return images
 
+    def get_history_images_base64(self, n: int = -1) -> list[str]:
+        images: list[str] = []
+        for step in self.steps:
+            if step.screenshot_base64:
+                images.append(step.screenshot_base64)
+            elif step.screenshot_bytes:
+                images.append(base64.b64encode(step.screenshot_bytes).decode("ascii"))
+        if n > 0:
+            return images[-n:]
+        return images
+
     def get_history_thoughts(self, n: int = -1) -> list[str]:
         thoughts = [step.thought for step in self.steps if step.thought]
         if n > 0:
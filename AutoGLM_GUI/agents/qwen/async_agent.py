@@ -3,8 +3,6 @@
 import os
 import base64
 import asyncio
-import json
-import traceback
 from collections.abc import AsyncGenerator
 from typing import Any
 from collections.abc import Callable
@@ -13,13 +11,17 @@ from io import BytesIO
 from datetime import datetime
 from PIL import Image, ImageDraw
 
-from AutoGLM_GUI.agents.base import AsyncAgentBase
+from AutoGLM_GUI.agents.base import (
+    AsyncAgentBase,
+    CachedActionParser,
+    iter_cooperatively,
+)
 from AutoGLM_GUI.agents.protocols import AsyncAgent
+from AutoGLM_GUI import json_utils
 from AutoGLM_GUI.config import AgentConfig, ModelConfig
 from AutoGLM_GUI.device_protocol import DeviceProtocol
 from AutoGLM_GUI.logger import logger
 from AutoGLM_GUI.model import MessageBuilder
-from AutoGLM_GUI.prompt_config import get_messages
 from AutoGLM_GUI.trace import trace_span
 
 
@@ -58,6 +60,7 @@ class AsyncQwenAgent(AsyncAgentBase, AsyncAgent):
         takeover_callback: Callable[[str], None] | None = None,
     ):
         self.parser = QwenParser()
+        self._parse_action = CachedActionParser(self.parser.parse)
         super().__init__(
             model_config=model_config,
             agent_config=agent_config,
@@ -134,16 +137,7 @@ class AsyncQwenAgent(AsyncAgentBase, AsyncAgent):
 
         # 1. 获取当前屏幕状态
         try:
-            with trace_span(
-                "step.capture_screenshot",
-                attrs={"step": self._step_count, "agent_type": self.__class__.__name__},
-            ):
-                screenshot = await self.device.get_screenshot()
-            with trace_span(
-                "step.get_current_app",
-                attrs={"step": self._step_count, "agent_type": self.__class__.__name__},
-            ):
-                current_app = await self.device.get_current_app()
+            screenshot, current_app = await self._next_device_state()
         except Exception as e:
             logger.error(f"Failed to get device info: {e}")
             yield {"type": "error", "data": {"message": f"Device error: {e}"}}
@@ -166,10 +160,8 @@ class AsyncQwenAgent(AsyncAgentBase, AsyncAgent):
             attrs={"step": self._step_count, "agent_type": self.__class__.__name__},
         ):
             # 清除历史消息中残留的截图，保证本次请求只包含当前屏幕这一张图。
-            self._context = [
-                MessageBuilder.remove_images_from_message(message)
-                for message in self._context
-            ]
+            for message in self._context:
+                MessageBuilder.strip_images_in_place(message)
 
             screen_info = MessageBuilder.build_screen_info(current_app)
             if self._step_count == 1 and self._pending_task is not None:
@@ -204,32 +196,31 @@ class AsyncQwenAgent(AsyncAgentBase, AsyncAgent):
         image_count = _count_image_parts(self._context)
         if image_count < 1:
             logger.warning(
-                "Qwen request should carry at least one screenshot, got %d (step %d)",
+                "Qwen request should carry at least one screenshot, got {} (step {})",
                 image_count,
                 self._step_count,
             )
 
         try:
             if self.agent_config.verbose:
-                msgs = get_messages(self.agent_config.lang)
+                msgs = self._msgs
                 logger.debug(f"💭 {msgs['thinking']}:")
 
             thinking_parts = []
             raw_content = ""
 
+            request_messages = self._history_window()
+
             with trace_span(
                 "step.llm",
                 attrs={
                     "step": self._step_count,
                     "agent_type": self.__class__.__name__,
                     "model_name": self.model_config.model_name,
-                    "message_count": len(self._context),
+                    "message_count": len(request_messages),
                 },
             ):
-                async for chunk_data in self._stream_openai(self._context):
-                    if self._cancel_event.is_set():
-                        raise asyncio.CancelledError()
-
+                async for chunk_data in self._stream_openai(request_messages):
                     if chunk_data["type"] in ["thinking", "reasoning"]:
                         thinking_parts.append(chunk_data["content"])
                         yield {
@@ -246,8 +237,6 @@ class AsyncQwenAgent(AsyncAgentBase, AsyncAgent):
                             f"Unknown chunk type: {chunk_data['type']}, chunk_data: {chunk_data}"
                         )
 
-            thinking = "".join(thinking_parts)
-
         except asyncio.CancelledError:
             logger.info(f"Step {self._step_count} cancelled during LLM call")
             raise
@@ -255,7 +244,7 @@ class AsyncQwenAgent(AsyncAgentBase, AsyncAgent):
         except Exception as e:
             logger.error(f"LLM error: {e}")
             if self.agent_config.verbose:
-                logger.debug(traceback.format_exc())
+                logger.opt(exception=True).debug("LLM error traceback")
             yield {"type": "error", "data": {"message": f"Model error: {e}"}}
             yield {
                 "type": "step",
@@ -276,11 +265,11 @@ class AsyncQwenAgent(AsyncAgentBase, AsyncAgent):
             attrs={"step": self._step_count, "agent_type": self.__class__.__name__},
         ):
             parsed_thinking, action_str = self.parser.parse_response(raw_content)
-            if parsed_thinking:
-                thinking = parsed_thinking
+            # The streamed chunks are only joined when the parser found none.
+            thinking = parsed_thinking or "".join(thinking_parts)
 
             try:
-                action = self.parser.parse(action_str)
+                action = self._parse_action(action_str)
             except ValueError as e:
                 if self.agent_config.verbose:
                     logger.warning(
@@ -289,16 +278,18 @@ class AsyncQwenAgent(AsyncAgentBase, AsyncAgent):
                 action = {"_metadata": "finish", "message": action_str}
 
             if self.agent_config.verbose:
-                logger.debug(f"raw_content: \n\n {raw_content}\n\n")
-                logger.debug(f"thinking_parts: \n\n {thinking_parts}\n\n")
-                logger.debug(f"parsed_thinking: \n\n{parsed_thinking}\n\n")
-                logger.debug(f"action_str: \n\n{action_str}\n\n")
-                logger.debug(f"action: \n\n{action}\n\n")
+                logger.debug("raw_content: \n\n {}\n\n", raw_content)
+                logger.debug("thinking_parts: \n\n {}\n\n", thinking_parts)
+                logger.debug("parsed_thinking: \n\n{}\n\n", parsed_thinking)
+                logger.debug("action_str: \n\n{}\n\n", action_str)
+                logger.debug("action: \n\n{}\n\n", action)
 
         if self.agent_config.verbose:
-            msgs = get_messages(self.agent_config.lang)
+            msgs = self._msgs
             logger.debug(f"🎯 {msgs['action']}:")
-            logger.debug(json.dumps(action, ensure_ascii=False, indent=2))
+            logger.opt(lazy=True).debug(
+                "{}", lambda: json_utils.dumps(action, indent=True)
+            )
 
         # Debug: draw red dot on screenshot for tap actions
         if self.agent_config.verbose and action.get("_metadata") == "do":
@@ -334,7 +325,7 @@ class AsyncQwenAgent(AsyncAgentBase, AsyncAgent):
         except Exception as e:
             logger.error(f"Action execution error: {e}")
             if self.agent_config.verbose:
-                logger.debug(traceback.format_exc())
+                logger.opt(exception=True).debug("Action execution error traceback")
             from AutoGLM_GUI.actions import ActionResult
 
             result = ActionResult(success=False, should_finish=True, message=str(e))
@@ -344,9 +335,7 @@ class AsyncQwenAgent(AsyncAgentBase, AsyncAgent):
             "step.update_context",
             attrs={"step": self._step_count, "agent_type": self.__class__.__name__},
         ):
-            self._context[-1] = MessageBuilder.remove_images_from_message(
-                self._context[-1]
-            )
+            MessageBuilder.strip_images_in_place(self._context[-1])
             self._context.append(
                 MessageBuilder.create_assistant_message(
                     f"<thought>{thinking}</thought><answer>{action_str}</answer>"
@@ -375,8 +364,10 @@ class AsyncQwenAgent(AsyncAgentBase, AsyncAgent):
 
         # 7. 检查完成
         finished = action.get("_metadata") == "finish" or result.should_finish
+        if not finished:
+            self._prefetch_device_state()
         if finished and self.agent_config.verbose:
-            msgs = get_messages(self.agent_config.lang)
+            msgs = self._msgs
             logger.debug(
                 f"✅ {msgs['task_completed']}: "
                 f"{result.message or action.get('message', msgs['done'])}"
@@ -416,11 +407,7 @@ class AsyncQwenAgent(AsyncAgentBase, AsyncAgent):
         in_action_phase = False
 
         try:
-            async for chunk in stream:
-                if self._cancel_event.is_set():
-                    await stream.close()
-                    raise asyncio.CancelledError()
-
+            async for chunk in iter_cooperatively(self._interruptible_stream(stream)):
                 if len(chunk.choices) == 0:
                     continue
 
@@ -1,15 +1,17 @@
 """Agent lifecycle and chat routes."""
 
 import asyncio
-import json
 
 from typing import Any
 
 import httpx
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ValidationError
 
+from AutoGLM_GUI.config_manager import ConfigModel, config_manager
+from AutoGLM_GUI.device_manager import DeviceManager
+from AutoGLM_GUI.exceptions import AgentNotInitializedError
+from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
 from AutoGLM_GUI.schemas import (
     AbortRequest,
     ChatRequest,
@@ -19,32 +21,20 @@ from AutoGLM_GUI.schemas import (
     ResetRequest,
     StatusResponse,
 )
+from AutoGLM_GUI.sse import encode_sse_event, sse_response
+from AutoGLM_GUI.task_manager import task_manager
+from AutoGLM_GUI.task_store import TERMINAL_TASK_STATUSES, TaskStatus, task_store
 from AutoGLM_GUI.version import APP_VERSION
 
 router = APIRouter()
 
 
-SSEPayload = dict[str, Any]
-
-
-def _create_sse_event(
-    event_type: str, data: SSEPayload, role: str = "assistant"
-) -> SSEPayload:
-    """Create an SSE event with standardized fields including role."""
-    event_data = {"type": event_type, "role": role, **data}
-    return event_data
-
-
 def _resolve_device_serial(device_id: str) -> str:
-    from AutoGLM_GUI.device_manager import DeviceManager
-
     device_manager = DeviceManager.get_instance()
     return device_manager.get_serial_by_device_id(device_id) or device_id
 
 
 async def _create_legacy_chat_task(request: ChatRequest) -> dict[str, Any]:
-    from AutoGLM_GUI.task_manager import task_manager
-
     session = await task_manager.get_or_create_legacy_chat_session(
         device_id=request.device_id,
         device_serial=_resolve_device_serial(request.device_id),
@@ -60,9 +50,6 @@ async def _create_legacy_chat_task(request: ChatRequest) -> dict[str, Any]:
 @router.post("/api/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest) -> ChatResponse:
     """Compatibility wrapper around the new task-backed chat flow."""
-    from AutoGLM_GUI.task_manager import task_manager
-    from AutoGLM_GUI.task_store import TaskStatus
-
     task = await _create_legacy_chat_task(request)
     final_task = await task_manager.wait_for_task(task["id"])
     if final_task is None:
@@ -84,8 +71,6 @@ async def chat(request: ChatRequest) -> ChatResponse:
 @router.post("/api/chat/stream")
 async def chat_stream(request: ChatRequest):
     """Compatibility SSE endpoint backed by the new task event stream."""
-    from AutoGLM_GUI.task_store import TERMINAL_TASK_STATUSES, task_store
-
     task = await _create_legacy_chat_task(request)
 
     async def event_generator():
@@ -101,13 +86,11 @@ async def chat_stream(request: ChatRequest):
                 event_type = str(event["event_type"])
                 if event_type in {"status", "user_message"}:
                     continue
-                sse_event = _create_sse_event(
-                    event_type,
-                    dict(event["payload"]),
-                    role=str(event["role"]),
-                )
-                yield f"event: {event_type}\n"
-                yield f"data: {json.dumps(sse_event, ensure_ascii=False)}\n\n"
+                # payload 每次从 task_store 新解析，可直接就地补充标准字段
+                sse_event = event["payload"]
+                sse_event.setdefault("type", event_type)
+                sse_event.setdefault("role", str(event["role"]))
+                yield encode_sse_event(sse_event, event=event_type)
 
             current_task = await asyncio.to_thread(task_store.get_task, task["id"])
             if (
@@ -116,39 +99,29 @@ async def chat_stream(request: ChatRequest):
                 break
             await asyncio.sleep(0.2)
 
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    return sse_response(event_generator())
 
 
 @router.get("/api/status", response_model=StatusResponse)
-def get_status(device_id: str | None = None) -> StatusResponse:
+async def get_status(device_id: str | None = None) -> StatusResponse:
     """获取 Agent 状态和版本信息（多设备支持）。"""
-    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
-
     manager = PhoneAgentManager.get_instance()
 
     if device_id is None:
         return StatusResponse(
             version=APP_VERSION,
-            initialized=len(manager.list_agents()) > 0,
+            initialized=manager.agent_count > 0,
             step_count=0,
         )
 
-    if not manager.is_initialized(device_id):
+    agent = await manager.get_agent_safe_async(device_id)
+    if agent is None:
         return StatusResponse(
             version=APP_VERSION,
             initialized=False,
             step_count=0,
         )
 
-    agent = manager.get_agent(device_id)
     return StatusResponse(
         version=APP_VERSION,
         initialized=True,
@@ -159,9 +132,6 @@ def get_status(device_id: str | None = None) -> StatusResponse:
 @router.post("/api/reset")
 def reset_agent(request: ResetRequest) -> dict[str, Any]:
     """重置 Agent 状态（多设备支持）。"""
-    from AutoGLM_GUI.exceptions import AgentNotInitializedError
-    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
-
     device_id = request.device_id
     manager = PhoneAgentManager.get_instance()
 
@@ -179,10 +149,6 @@ def reset_agent(request: ResetRequest) -> dict[str, Any]:
 @router.post("/api/chat/abort")
 async def abort_chat(request: AbortRequest) -> dict[str, Any]:
     """Cancel the latest active task for the device."""
-    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
-    from AutoGLM_GUI.task_manager import task_manager
-    from AutoGLM_GUI.task_store import TERMINAL_TASK_STATUSES, TaskStatus
-
     task = await task_manager.cancel_latest_chat_task(request.device_id)
     success = task is not None and (
         task["status"] not in TERMINAL_TASK_STATUSES
@@ -202,8 +168,6 @@ async def abort_chat(request: AbortRequest) -> dict[str, Any]:
 @router.get("/api/config", response_model=ConfigResponse)
 def get_config_endpoint() -> ConfigResponse:
     """获取当前有效配置."""
-    from AutoGLM_GUI.config_manager import config_manager
-
     # 热重载：检查文件是否被外部修改
     config_manager.load_file_config()
 
@@ -246,9 +210,6 @@ def save_config_endpoint(request: ConfigSaveRequest) -> dict[str, Any]:
 
     配置保存后会自动热更新，所有 Agent 将被销毁并在下次使用时用新配置重新创建。
     """
-    from AutoGLM_GUI.config_manager import ConfigModel, config_manager
-    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
-
     try:
         # Validate incoming configuration
         ConfigModel(
@@ -327,8 +288,6 @@ def save_config_endpoint(request: ConfigSaveRequest) -> dict[str, Any]:
 @router.delete("/api/config")
 def delete_config_endpoint() -> dict[str, Any]:
     """删除配置文件."""
-    from AutoGLM_GUI.config_manager import config_manager
-
     try:
         success = config_manager.delete_file_config()
 
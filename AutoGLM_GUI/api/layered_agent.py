@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from collections.abc import AsyncGenerator
 from typing import Any
 
@@ -12,6 +11,7 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from AutoGLM_GUI.layered_agent_service import reset_session as reset_layered_session
+from AutoGLM_GUI.sse import encode_sse_event, sse_response
 from AutoGLM_GUI.task_manager import task_manager
 from AutoGLM_GUI.task_store import TERMINAL_TASK_STATUSES, task_store
 
@@ -120,7 +120,7 @@ def _compat_sse_payload(event_type: str, payload: dict[str, Any]) -> dict[str, A
     }
 
 
-async def _stream_layered_task(task_id: str) -> AsyncGenerator[str, None]:
+async def _stream_layered_task(task_id: str) -> AsyncGenerator[bytes, None]:
     last_seq = 0
     while True:
         events = await asyncio.to_thread(
@@ -135,7 +135,7 @@ async def _stream_layered_task(task_id: str) -> AsyncGenerator[str, None]:
                 continue
 
             compat_payload = _compat_sse_payload(event_type, dict(event["payload"]))
-            yield f"data: {json.dumps(compat_payload, ensure_ascii=False)}\n\n"
+            yield encode_sse_event(compat_payload)
 
         current_task = await asyncio.to_thread(task_store.get_task, task_id)
         if (
@@ -154,15 +154,7 @@ async def layered_agent_chat(request: LayeredAgentRequest) -> StreamingResponse:
         device_serial=str(session["device_serial"]),
         message=request.message,
     )
-    return StreamingResponse(
-        _stream_layered_task(str(task["id"])),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    return sse_response(_stream_layered_task(str(task["id"])))
 
 
 @router.post("/api/layered-agent/abort")
@@ -215,7 +215,7 @@ async def screenshot(device_id: str) -> ScreenshotResponse:
             is_sensitive=shot.is_sensitive,
         )
     except DeviceNotAvailableError as e:
-        logger.warning("[MCP] screenshot failed - device not available: %s", e)
+        logger.warning("[MCP] screenshot failed - device not available: {}", e)
         return ScreenshotResponse(
             success=False,
             image="",
@@ -225,7 +225,7 @@ async def screenshot(device_id: str) -> ScreenshotResponse:
             error=str(e),
         )
     except Exception as e:
-        logger.exception("[MCP] screenshot tool error for device %s", device_id)
+        logger.exception("[MCP] screenshot tool error for device {}", device_id)
         return ScreenshotResponse(
             success=False,
             image="",
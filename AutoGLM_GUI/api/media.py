@@ -21,7 +21,7 @@ async def reset_video_stream(device_id: str | None = None) -> dict[str, Any]:
     """Reset active scrcpy streams (Socket.IO)."""
     stop_streamers(device_id=device_id)
     if device_id:
-        logger.info("Video stream reset for device %s", device_id)
+        logger.info("Video stream reset for device {}", device_id)
         return {
             "success": True,
             "message": f"Video stream reset for device {device_id}",
@@ -97,7 +97,7 @@ async def take_screenshot(request: ScreenshotRequest) -> ScreenshotResponse:
             is_sensitive=screenshot.is_sensitive,
         )
     except DeviceNotAvailableError as e:
-        logger.warning("Screenshot failed - device not available: %s", e)
+        logger.warning("Screenshot failed - device not available: {}", e)
         return ScreenshotResponse(
             success=False,
             image="",
@@ -107,7 +107,7 @@ async def take_screenshot(request: ScreenshotRequest) -> ScreenshotResponse:
             error=str(e),
         )
     except Exception as e:
-        logger.exception("Screenshot failed for device %s", request.device_id)
+        logger.exception("Screenshot failed for device {}", request.device_id)
         return ScreenshotResponse(
             success=False,
             image="",
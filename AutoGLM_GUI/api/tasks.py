@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from collections.abc import AsyncGenerator
 
 from fastapi import APIRouter, HTTPException, Query
@@ -21,6 +20,7 @@ from AutoGLM_GUI.schemas import (
     TaskSubmitRequest,
 )
 from AutoGLM_GUI.layered_agent_service import reset_session as reset_layered_session
+from AutoGLM_GUI.sse import encode_sse_event, sse_response
 from AutoGLM_GUI.task_manager import task_manager
 from AutoGLM_GUI.task_store import (
     TERMINAL_TASK_STATUSES,
@@ -286,7 +286,7 @@ async def stream_task_events(
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    async def event_generator() -> AsyncGenerator[str, None]:
+    async def event_generator() -> AsyncGenerator[bytes, None]:
         last_seq = after_seq
         while True:
             events = await asyncio.to_thread(
@@ -298,8 +298,7 @@ async def stream_task_events(
                 last_seq = max(last_seq, int(event["seq"]))
                 response = _task_event_response(event)
                 payload = response.model_dump()
-                yield f"event: {response.event_type}\n"
-                yield f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+                yield encode_sse_event(payload, event=response.event_type)
 
             current_task = await asyncio.to_thread(task_store.get_task, task_id)
             if (
@@ -308,15 +307,7 @@ async def stream_task_events(
                 break
             await asyncio.sleep(0.2)
 
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    return sse_response(event_generator())
 
 
 @router.post("/api/tasks/{task_id}/cancel", response_model=TaskCancelResponse)
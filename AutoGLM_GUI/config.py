@@ -53,6 +53,9 @@ class AgentConfig:
         lang: 语言设置 'cn' 或 'en'
         system_prompt: 自定义系统提示词 (None 则使用默认)
         verbose: 是否输出详细日志
+        image_window: 请求中最多保留的历史截图数量 (仅 function calling 类 Agent 使用)
+        enable_response_cache: 是否缓存相同任务/相同截图下的模型响应 (仅 temperature=0 生效)
+        max_history: 请求中保留的最近历史消息数量，None 表示不限制 (仅 GLM/Qwen Agent 使用)
     """
 
     max_steps: int | None = 100
@@ -60,9 +63,12 @@ class AgentConfig:
     lang: str = "cn"
     system_prompt: str | None = None
     verbose: bool = True
+    image_window: int = 3
+    enable_response_cache: bool = False
+    max_history: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class StepResult:
     """Agent 单步执行结果
 
@@ -3,25 +3,31 @@
 Features:
 - 单例模式
 - JSON 文件持久化
-- 基于 mtime 的缓存机制
+- 基于 mtime 的缓存机制（mtime 检查按间隔节流）
 - 原子文件写入
 - 默认分组自动创建
 """
 
 from __future__ import annotations
 
-import json
+import copy
+import os
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from threading import RLock
 from typing import Self
 
+from AutoGLM_GUI import json_utils
 from AutoGLM_GUI.logger import logger
 from AutoGLM_GUI.models.device_group import (
     DEFAULT_GROUP_ID,
     DeviceGroup,
 )
 
+# 外部修改文件的热加载检测间隔（秒），期间的读取直接命中缓存，不再 stat()
+MTIME_CHECK_INTERVAL = 1.0
+
 
 class DeviceGroupManager:
     """设备分组管理器（单例模式）."""
@@ -46,6 +52,10 @@ class DeviceGroupManager:
         self._groups_cache: list[DeviceGroup] | None = None
         self._assignments_cache: dict[str, str] | None = None
         self._file_mtime: float | None = None
+        self._mtime_checked_at = 0.0
+        # group_id -> serial 列表的反向索引，随 assignments 对象失效重建
+        self._members_cache: dict[str, list[str]] = {}
+        self._members_source: dict[str, str] | None = None
 
     def list_groups(self) -> list[DeviceGroup]:
         """获取所有分组（按 order 排序）.
@@ -80,7 +90,7 @@ class DeviceGroupManager:
             DeviceGroup: 新创建的分组
         """
         with self._lock:
-            groups, assignments = self._load_data()
+            groups, assignments = self._load_data_for_update()
 
             # 计算新的 order 值（放在最后）
             max_order = max((g.order for g in groups), default=-1)
@@ -105,7 +115,7 @@ class DeviceGroupManager:
             DeviceGroup | None: 更新后的分组，如果不存在则返回 None
         """
         with self._lock:
-            groups, assignments = self._load_data()
+            groups, assignments = self._load_data_for_update()
             for group in groups:
                 if group.id == group_id:
                     group.name = name
@@ -130,17 +140,16 @@ class DeviceGroupManager:
             return False
 
         with self._lock:
-            groups, assignments = self._load_data()
+            groups, assignments = self._load_data_for_update()
             original_len = len(groups)
             groups = [g for g in groups if g.id != group_id]
 
             if len(groups) < original_len:
                 # 将该分组的设备移到默认分组
-                moved_count = 0
-                for serial, gid in list(assignments.items()):
-                    if gid == group_id:
-                        assignments[serial] = DEFAULT_GROUP_ID
-                        moved_count += 1
+                members = self._load_group_members().get(group_id, [])
+                for serial in members:
+                    assignments[serial] = DEFAULT_GROUP_ID
+                moved_count = len(members)
 
                 self._save_data(groups, assignments)
                 logger.info(
@@ -162,16 +171,16 @@ class DeviceGroupManager:
             bool: 调整成功返回 True
         """
         with self._lock:
-            groups, assignments = self._load_data()
+            groups, assignments = self._load_data_for_update()
 
             # 创建 ID 到 group 的映射
             group_map = {g.id: g for g in groups}
 
             # 验证所有 ID 都存在
-            for gid in group_ids:
-                if gid not in group_map:
-                    logger.warning(f"Group not found for reorder: id={gid}")
-                    return False
+            missing = set(group_ids) - group_map.keys()
+            if missing:
+                logger.warning(f"Groups not found for reorder: ids={sorted(missing)}")
+                return False
 
             # 更新 order 值
             for order, gid in enumerate(group_ids):
@@ -192,23 +201,42 @@ class DeviceGroupManager:
         Returns:
             bool: 分配成功返回 True
         """
-        with self._lock:
-            groups, assignments = self._load_data()
+        return self.assign_devices_bulk([(serial, group_id)]) == 1
 
-            # 验证分组存在
-            if not any(g.id == group_id for g in groups):
-                logger.warning(f"Group not found for assignment: id={group_id}")
-                return False
+    def assign_devices_bulk(self, pairs: list[tuple[str, str]]) -> int:
+        """批量分配设备到分组（只写一次文件）.
 
-            old_group = assignments.get(serial, DEFAULT_GROUP_ID)
-            assignments[serial] = group_id
-            self._save_data(groups, assignments)
+        目标分组不存在的条目会被跳过。
 
-            if old_group != group_id:
-                logger.info(
-                    f"Assigned device {serial} to group {group_id} (was: {old_group})"
-                )
-            return True
+        Args:
+            pairs: (设备 serial, 目标分组 ID) 列表
+
+        Returns:
+            int: 成功分配的设备数量
+        """
+        with self._lock:
+            groups, assignments = self._load_data_for_update()
+            group_ids = {g.id for g in groups}
+
+            assigned = 0
+            for serial, group_id in pairs:
+                # 验证分组存在
+                if group_id not in group_ids:
+                    logger.warning(f"Group not found for assignment: id={group_id}")
+                    continue
+
+                old_group = assignments.get(serial, DEFAULT_GROUP_ID)
+                assignments[serial] = group_id
+                assigned += 1
+                if old_group != group_id:
+                    logger.info(
+                        f"Assigned device {serial} to group {group_id} "
+                        f"(was: {old_group})"
+                    )
+
+            if assigned:
+                self._save_data(groups, assignments)
+            return assigned
 
     def get_device_group(self, serial: str) -> str:
         """获取设备所属分组 ID.
@@ -220,8 +248,7 @@ class DeviceGroupManager:
             str: 分组 ID（未分配则返回默认分组 ID）
         """
         with self._lock:
-            _, assignments = self._load_data()
-            return assignments.get(serial, DEFAULT_GROUP_ID)
+            return self._load_assignments().get(serial, DEFAULT_GROUP_ID)
 
     def get_devices_in_group(self, group_id: str) -> list[str]:
         """获取分组内的设备 serial 列表.
@@ -233,19 +260,9 @@ class DeviceGroupManager:
             list[str]: 设备 serial 列表
         """
         with self._lock:
-            _, assignments = self._load_data()
-
-            # 对于默认分组，包含未显式分配的设备
-            if group_id == DEFAULT_GROUP_ID:
-                # 注意：这里只返回显式分配到默认分组的设备
-                # 如果需要包含所有未分配设备，需要配合 DeviceManager 使用
-                return [
-                    serial
-                    for serial, gid in assignments.items()
-                    if gid == DEFAULT_GROUP_ID
-                ]
-
-            return [serial for serial, gid in assignments.items() if gid == group_id]
+            # 注意：默认分组只返回显式分配到默认分组的设备
+            # 如果需要包含所有未分配设备，需要配合 DeviceManager 使用
+            return list(self._load_group_members().get(group_id, []))
 
     def get_all_assignments(self) -> dict[str, str]:
         """获取所有设备分配信息.
@@ -254,15 +271,52 @@ class DeviceGroupManager:
             dict[str, str]: serial -> group_id 的映射
         """
         with self._lock:
-            _, assignments = self._load_data()
-            return assignments.copy()
+            return self._load_assignments().copy()
+
+    def _load_assignments(self) -> dict[str, str]:
+        """返回设备分配映射（只读，调用方不得修改）."""
+        _, assignments = self._load_data()
+        return assignments
+
+    def _load_group_members(self) -> dict[str, list[str]]:
+        """返回 group_id -> serial 列表的反向索引（只读）.
+
+        assignments 缓存对象被替换（重新加载或保存）时才重建，查询分组成员
+        不再扫描全部设备。
+        """
+        assignments = self._load_assignments()
+        if self._members_source is not assignments:
+            members: dict[str, list[str]] = {}
+            for serial, group_id in assignments.items():
+                members.setdefault(group_id, []).append(serial)
+            self._members_cache = members
+            self._members_source = assignments
+        return self._members_cache
+
+    def _load_data_for_update(self) -> tuple[list[DeviceGroup], dict[str, str]]:
+        """返回可修改的数据副本，供写操作使用（保存失败时不污染缓存）.
+
+        写操作会原地修改分组对象（name/order/updated_at），所以分组也要逐个复制。
+        """
+        groups, assignments = self._load_data()
+        return [copy.copy(group) for group in groups], assignments.copy()
 
     def _load_data(self) -> tuple[list[DeviceGroup], dict[str, str]]:
         """从文件加载数据（带 mtime 缓存）.
 
+        返回的是缓存对象本身，只读路径直接使用，写操作请用 _load_data_for_update.
+
         Returns:
             tuple[list[DeviceGroup], dict[str, str]]: (分组列表, 设备分配映射)
         """
+        now = time.monotonic()
+        if (
+            self._groups_cache is not None
+            and self._assignments_cache is not None
+            and now - self._mtime_checked_at < MTIME_CHECK_INTERVAL
+        ):
+            return self._groups_cache, self._assignments_cache
+
         # 检查文件是否存在
         if not self._groups_path.exists():
             # 创建默认分组
@@ -274,17 +328,17 @@ class DeviceGroupManager:
 
         # 检查缓存
         current_mtime = self._groups_path.stat().st_mtime
+        self._mtime_checked_at = now
         if (
             self._file_mtime == current_mtime
             and self._groups_cache is not None
             and self._assignments_cache is not None
         ):
-            return self._groups_cache.copy(), self._assignments_cache.copy()
+            return self._groups_cache, self._assignments_cache
 
         # 重新加载
         try:
-            with open(self._groups_path, encoding="utf-8") as f:
-                data = json.load(f)
+            data = json_utils.loads(self._groups_path.read_bytes())
 
             groups_data = data.get("groups", [])
             groups = [DeviceGroup.from_dict(g) for g in groups_data]
@@ -302,9 +356,9 @@ class DeviceGroupManager:
             logger.debug(
                 f"Loaded {len(groups)} groups, {len(assignments)} device assignments"
             )
-            return groups.copy(), assignments.copy()
+            return groups, assignments
 
-        except (json.JSONDecodeError, FileNotFoundError) as e:
+        except (json_utils.JSONDecodeError, FileNotFoundError) as e:
             logger.warning(f"Failed to load device groups: {e}")
             # 返回默认分组
             default_group = DeviceGroup.create_default_group()
@@ -332,14 +386,18 @@ class DeviceGroupManager:
         # 原子写入：临时文件 + rename
         temp_path = self._groups_path.with_suffix(".tmp")
         try:
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            temp_path.replace(self._groups_path)
+            with open(temp_path, "wb") as f:
+                f.write(json_utils.dumps_bytes(data, indent=True))
+                f.flush()
+                # 先落盘再 rename，避免断电后 rename 生效但内容为空
+                os.fsync(f.fileno())
+            os.replace(temp_path, self._groups_path)
 
             # 更新缓存
             self._groups_cache = groups.copy()
             self._assignments_cache = assignments.copy()
             self._file_mtime = self._groups_path.stat().st_mtime
+            self._mtime_checked_at = time.monotonic()
             logger.debug(
                 f"Saved {len(groups)} groups, {len(assignments)} device assignments"
             )
@@ -189,8 +189,9 @@ class ManagedDevice:
             "model": self.model or "Unknown",
             "display_name": self.display_name,
             "status": self.status,
-            "connection_type": self.connection_type.value,
-            "state": self.state.value,
+            # StrEnum 成员本身就是 str，无需再取 .value
+            "connection_type": self.connection_type,
+            "state": self.state,
             "is_available_only": self.state == DeviceState.AVAILABLE_MDNS,
         }
 
@@ -24,7 +24,7 @@ from dataclasses import dataclass
 from typing import Protocol, runtime_checkable
 
 
-@dataclass
+@dataclass(slots=True)
 class Screenshot:
     """Screenshot result from device."""
 
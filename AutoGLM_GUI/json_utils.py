@@ -0,0 +1,107 @@
+"""JSON helpers with an optional orjson backend.
+
+orjson is used when it is installed (it is not a hard dependency); otherwise
+the stdlib ``json`` module is configured for the same compact, non-ASCII-escaped
+output. datetime, date, time and dataclass values are passed to ``default`` by
+both backends, and anything orjson rejects (non-str keys, integers beyond
+64 bits, lone surrogates) is re-encoded with the stdlib. Lone surrogates have
+no UTF-8 form, so that output is ``\\u``-escaped instead, as ``json.dumps``
+does by default.
+
+The backends still differ on:
+
+- NaN and Infinity: orjson writes ``null``, the stdlib writes bare ``NaN`` /
+  ``Infinity`` (and its ``loads`` accepts them, orjson's does not).
+- Enum, UUID and numpy values: orjson serializes them natively, the stdlib
+  calls ``default`` (or raises ``TypeError``). ``str``/``int`` enums match.
+- Float formatting in exponent form, e.g. ``1e16`` vs ``1e+16``.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson  # pyright: ignore[reportMissingImports]
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+    _ORJSON_BASE_OPTIONS = 0
+else:
+    # Let ``default`` see these values the way the stdlib encoder does.
+    _ORJSON_BASE_OPTIONS = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(
+    obj: Any,
+    *,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+    indent: bool = False,
+) -> str:
+    """Serialize ``obj`` to a compact, non-ASCII-escaped JSON string.
+
+    ``indent=True`` pretty-prints with two-space indentation instead.
+    """
+    return dumps_bytes(obj, sort_keys=sort_keys, default=default, indent=indent).decode(
+        "utf-8"
+    )
+
+
+def dumps_bytes(
+    obj: Any,
+    *,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+    indent: bool = False,
+) -> bytes:
+    """Serialize ``obj`` to compact (or two-space indented) UTF-8 JSON bytes."""
+    if orjson is not None:
+        option = _ORJSON_BASE_OPTIONS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            # e.g. non-str dict keys, integers beyond 64 bits, or a value that
+            # ``default`` cannot handle (the stdlib raises the same error)
+            pass
+    try:
+        return _stdlib_dumps(
+            obj, ensure_ascii=False, sort_keys=sort_keys, default=default, indent=indent
+        ).encode("utf-8")
+    except UnicodeEncodeError:
+        # lone surrogates, e.g. from text decoded with errors="surrogateescape"
+        return _stdlib_dumps(
+            obj, ensure_ascii=True, sort_keys=sort_keys, default=default, indent=indent
+        ).encode("ascii")
+
+
+def _stdlib_dumps(
+    obj: Any,
+    *,
+    ensure_ascii: bool,
+    sort_keys: bool,
+    default: Callable[[Any], Any] | None,
+    indent: bool,
+) -> str:
+    return json.dumps(
+        obj,
+        ensure_ascii=ensure_ascii,
+        indent=2 if indent else None,
+        separators=(",", ": ") if indent else (",", ":"),
+        sort_keys=sort_keys,
+        default=default,
+    )
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON; raises ``JSONDecodeError`` on invalid input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -18,6 +18,7 @@ from openai import AsyncOpenAI
 from AutoGLM_GUI.config import ModelConfig
 from AutoGLM_GUI.config_manager import config_manager
 from AutoGLM_GUI.logger import logger
+from AutoGLM_GUI.model.client_pool import create_async_openai
 from AutoGLM_GUI.model.error_details import (
     serialize_model_error_async,
     trace_error_attrs,
@@ -204,10 +205,9 @@ def _setup_openai_client() -> AsyncOpenAI:
     logger.info(f"  - Model: {planner_model}")
     logger.info(f"  - API Key: {'***' if decision_api_key else 'None'}")
 
-    return AsyncOpenAI(
-        base_url=decision_base_url,
-        api_key=decision_api_key or "EMPTY",
-    )
+    # 与执行模型共用连接池配置 (keep-alive + 可选 HTTP/2)，
+    # 决策模型的连续请求可以复用已建立的 TLS 连接
+    return create_async_openai(decision_base_url, decision_api_key or "EMPTY")
 
 
 def _planner_model_config() -> ModelConfig:
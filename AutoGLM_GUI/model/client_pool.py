@@ -0,0 +1,67 @@
+"""Shared AsyncOpenAI clients, one per (event loop, endpoint).
+
+Every agent used to build its own ``AsyncOpenAI`` and therefore its own
+connection pool, paying a fresh TCP/TLS handshake per agent and preventing
+connection reuse across devices. Agents targeting the same endpoint now share
+one client and its keep-alive pool.
+
+httpx connection pools are bound to the event loop they were first used on,
+so clients are cached per running loop; entries for closed loops are dropped.
+"""
+
+import asyncio
+import importlib.util
+import threading
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+DEFAULT_TIMEOUT = 120.0
+# Consecutive model calls are separated by device actions and screenshots,
+# usually longer than httpx's 5 s default keep-alive, so idle connections are
+# kept long enough to be reused by the next step.
+POOL_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=32, keepalive_expiry=60.0
+)
+# HTTP/2 needs the optional ``h2`` package (``httpx[http2]``).
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_ClientKey = tuple[str, str, float]
+
+_clients: dict[asyncio.AbstractEventLoop, dict[_ClientKey, AsyncOpenAI]] = {}
+_lock = threading.Lock()
+
+
+def create_async_openai(
+    base_url: str, api_key: str, *, timeout: float = DEFAULT_TIMEOUT
+) -> AsyncOpenAI:
+    """Build an AsyncOpenAI client for ``base_url`` on a keep-alive pool."""
+    return AsyncOpenAI(
+        base_url=base_url,
+        api_key=api_key,
+        timeout=timeout,
+        http_client=DefaultAsyncHttpxClient(
+            http2=HTTP2_AVAILABLE, limits=POOL_LIMITS, timeout=timeout
+        ),
+    )
+
+
+def get_shared_async_openai(
+    base_url: str, api_key: str, *, timeout: float = DEFAULT_TIMEOUT
+) -> AsyncOpenAI:
+    """Return the client shared by all callers on the running loop.
+
+    Raises:
+        RuntimeError: When called without a running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    key = (base_url, api_key, timeout)
+    with _lock:
+        for stale_loop in [other for other in _clients if other.is_closed()]:
+            del _clients[stale_loop]
+        loop_clients = _clients.setdefault(loop, {})
+        client = loop_clients.get(key)
+        if client is None:
+            client = create_async_openai(base_url, api_key, timeout=timeout)
+            loop_clients[key] = client
+        return client
@@ -3,6 +3,13 @@
 from typing import Any
 
 
+def _image_part(mime_type: str, data: str) -> dict[str, Any]:
+    return {
+        "type": "image_url",
+        "image_url": {"url": f"data:{mime_type};base64,{data}"},
+    }
+
+
 class MessageBuilder:
     @staticmethod
     def create_system_message(content: str) -> dict[str, Any]:
@@ -15,10 +22,15 @@ class MessageBuilder:
         if image_base64 is None:
             return {"role": "user", "content": text}
 
-        return MessageBuilder.create_user_message_with_images(
-            text=text,
-            images=[{"mime_type": "image/png", "data": image_base64}],
-        )
+        # Built directly: this runs every step, so skip the intermediate
+        # image descriptor list that create_user_message_with_images takes.
+        return {
+            "role": "user",
+            "content": [
+                _image_part("image/png", image_base64),
+                {"type": "text", "text": text},
+            ],
+        }
 
     @staticmethod
     def create_user_message_with_images(
@@ -27,17 +39,9 @@ class MessageBuilder:
         if not images:
             return {"role": "user", "content": text}
 
-        content_parts: list[dict[str, Any]] = []
-        for image in images:
-            content_parts.append(
-                {
-                    "type": "image_url",
-                    "image_url": {
-                        "url": f"data:{image['mime_type']};base64,{image['data']}"
-                    },
-                }
-            )
-
+        content_parts = [
+            _image_part(image["mime_type"], image["data"]) for image in images
+        ]
         # Images first, then text — matches the official Open-AutoGLM input layout.
         content_parts.append({"type": "text", "text": text})
         return {
@@ -52,13 +56,11 @@ class MessageBuilder:
         if not image_base64_list:
             return {"role": "user", "content": text}
 
-        return MessageBuilder.create_user_message_with_images(
-            text=text,
-            images=[
-                {"mime_type": "image/png", "data": image_base64}
-                for image_base64 in image_base64_list
-            ],
-        )
+        content_parts = [
+            _image_part("image/png", image_base64) for image_base64 in image_base64_list
+        ]
+        content_parts.append({"type": "text", "text": text})
+        return {"role": "user", "content": content_parts}
 
     @staticmethod
     def build_user_reference_images_notice(image_count: int) -> str:
@@ -96,6 +98,41 @@ class MessageBuilder:
         ]
         return {**message, "content": text_parts}
 
+    @staticmethod
+    def strip_images_in_place(message: dict[str, Any]) -> None:
+        """In-place variant of :meth:`remove_images_from_message`.
+
+        Rewrites the existing content list instead of copying the message, so
+        the base64 screenshot is released as soon as the turn is done with it.
+        Only use this on history owned by the caller, never on a request
+        projection that may share message objects.
+        """
+        content = message.get("content")
+        if isinstance(content, list):
+            content[:] = [
+                part
+                for part in content
+                if isinstance(part, dict) and part.get("type") == "text"
+            ]
+
+    @staticmethod
+    def with_cache_control(message: dict[str, Any]) -> dict[str, Any]:
+        """Mark a message as an Anthropic-style prompt cache breakpoint.
+
+        String content is converted to a single text part, and the
+        ``cache_control`` marker is attached to the last content part.
+        """
+        content = message.get("content")
+        if isinstance(content, str):
+            parts: list[dict[str, Any]] = [{"type": "text", "text": content}]
+        elif isinstance(content, list) and content:
+            parts = list(content)
+        else:
+            return message
+
+        parts[-1] = {**parts[-1], "cache_control": {"type": "ephemeral"}}
+        return {**message, "content": parts}
+
     @staticmethod
     def build_screen_info(current_app: str) -> str:
         return f"** Screen Info **\n\nCurrent App: {current_app}"
@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 from uuid import uuid4
 
+
+@functools.lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    # datetime 不可变，缓存的解析结果可直接复用
+    return datetime.fromisoformat(value)
+
+
 # Default group ID - this group cannot be deleted
 DEFAULT_GROUP_ID = "default"
 DEFAULT_GROUP_NAME = "默认分组"
@@ -40,13 +48,13 @@ class DeviceGroup:
     def from_dict(cls, data: dict[str, Any]) -> DeviceGroup:
         """从字典创建实例."""
         return cls(
-            id=data.get("id", str(uuid4())),
+            id=data["id"] if "id" in data else str(uuid4()),
             name=data.get("name", ""),
             order=data.get("order", 0),
-            created_at=datetime.fromisoformat(data["created_at"])
+            created_at=_parse_iso(data["created_at"])
             if data.get("created_at")
             else datetime.now(tz=timezone.utc),
-            updated_at=datetime.fromisoformat(data["updated_at"])
+            updated_at=_parse_iso(data["updated_at"])
             if data.get("updated_at")
             else datetime.now(tz=timezone.utc),
         )
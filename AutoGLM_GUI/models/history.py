@@ -8,7 +8,7 @@ from typing import Any, Literal
 from uuid import uuid4
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageRecord:
     """对话中的单条消息记录."""
 
@@ -219,7 +219,7 @@ class ConversationRecord:
     def from_dict(cls, data: dict[str, Any]) -> ConversationRecord:
         """从字典创建实例."""
         return cls(
-            id=data.get("id", str(uuid4())),
+            id=data["id"] if "id" in data else str(uuid4()),
             task_text=data.get("task_text", ""),
             final_message=data.get("final_message", ""),
             success=data.get("success", False),
@@ -2,29 +2,32 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 from uuid import uuid4
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    # created_at/updated_at 经常相同, 批量导入的记录也常共享时间戳;
+    # datetime 不可变, 缓存结果可以安全复用
+    return datetime.fromisoformat(value)
+
+
 def _normalize_device_serialnos(serialnos: object) -> list[str]:
     if isinstance(serialnos, str):
         serialnos = [serialnos]
     if not isinstance(serialnos, list):
         return []
 
-    normalized: list[str] = []
-    seen: set[str] = set()
-    for raw in serialnos:
-        if not isinstance(raw, str):
-            continue
-        s = raw.strip()
-        if not s or s in seen:
-            continue
-        normalized.append(s)
-        seen.add(s)
-    return normalized
+    # dict.fromkeys 按插入顺序去重
+    return list(
+        dict.fromkeys(
+            s for raw in serialnos if isinstance(raw, str) for s in (raw.strip(),) if s
+        )
+    )
 
 
 @dataclass
@@ -95,7 +98,7 @@ class ScheduledTask:
             device_serialnos = old_device
 
         return cls(
-            id=data.get("id", str(uuid4())),
+            id=data["id"] if "id" in data else str(uuid4()),
             name=data.get("name", ""),
             workflow_uuid=data.get("workflow_uuid", ""),
             device_serialnos=device_serialnos,
@@ -103,13 +106,13 @@ class ScheduledTask:
             cron_expression=data.get("cron_expression", ""),
             enabled=data.get("enabled", True),
             execution_mode=data.get("execution_mode", "classic"),
-            created_at=datetime.fromisoformat(data["created_at"])
+            created_at=_parse_iso(data["created_at"])
             if data.get("created_at")
             else datetime.now(tz=timezone.utc),
-            updated_at=datetime.fromisoformat(data["updated_at"])
+            updated_at=_parse_iso(data["updated_at"])
             if data.get("updated_at")
             else datetime.now(tz=timezone.utc),
-            last_run_time=datetime.fromisoformat(data["last_run_time"])
+            last_run_time=_parse_iso(data["last_run_time"])
             if data.get("last_run_time")
             else None,
             last_run_success=data.get("last_run_success"),
@@ -130,6 +130,10 @@ class PhoneAgentManager:
     _instance: PhoneAgentManager | None = None
     _instance_lock = threading.Lock()
 
+    # Background loop shared by the sync wrappers (see _run_sync)
+    _sync_loop: asyncio.AbstractEventLoop | None = None
+    _sync_loop_lock = threading.Lock()
+
     def __init__(self):
         """Private constructor. Use get_instance() instead."""
         # Manager-level lock (protects internal state)
@@ -158,18 +162,41 @@ class PhoneAgentManager:
 
     # ==================== Lock helpers ====================
 
+    @classmethod
+    def _get_sync_loop(cls) -> asyncio.AbstractEventLoop:
+        loop = cls._sync_loop
+        if loop is None:
+            with cls._sync_loop_lock:
+                loop = cls._sync_loop
+                if loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=loop.run_forever,
+                        name="phone-agent-manager-sync",
+                        daemon=True,
+                    ).start()
+                    cls._sync_loop = loop
+        return loop
+
     def _run_sync(self, coro: Coroutine[Any, Any, T]) -> T:
-        """Run an async implementation coroutine from a sync context."""
+        """Run an async implementation coroutine from a sync context.
+
+        Sync callers (threadpool endpoints, metrics scrapes) are polled
+        often, so they share one long-lived background loop instead of
+        paying for asyncio.run()'s loop setup and teardown on every call.
+        """
+        loop = self._get_sync_loop()
         try:
-            return asyncio.run(coro)
-        except RuntimeError as e:
-            if "asyncio.run() cannot be called from a running event loop" in str(e):
-                # Fallback: run in a worker thread with its own event loop.
-                import concurrent.futures
-
-                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-                    return pool.submit(asyncio.run, coro).result()
-            raise
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coro.close()
+            raise RuntimeError(
+                "PhoneAgentManager sync API called from its own loop; "
+                "use the *_async variant instead"
+            )
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
 
     # ==================== Agent Lifecycle ====================
 
@@ -518,6 +545,9 @@ class PhoneAgentManager:
     def get_agent_safe(self, device_id: str) -> AsyncAgent | None:
         return self._run_sync(self._get_agent_safe_impl(device_id))
 
+    async def get_agent_safe_async(self, device_id: str) -> AsyncAgent | None:
+        return await self._get_agent_safe_impl(device_id)
+
     async def _reset_agent_impl(self, device_id: str, context: str = "default") -> None:
         """
         Reset agent state by calling the agent's reset() method.
@@ -682,7 +712,7 @@ class PhoneAgentManager:
             metadata.state = AgentState.BUSY
             metadata.last_used = time.time()
 
-        logger.debug(f"Device lock acquired for {agent_key}")
+        logger.debug("Device lock acquired for {}", agent_key)
         return True
 
     def acquire_device(
@@ -771,7 +801,7 @@ class PhoneAgentManager:
                     metadata.state = AgentState.IDLE
                 metadata.abort_handler = None
 
-        logger.debug(f"Device lock released for {agent_key}")
+        logger.debug("Device lock released for {}", agent_key)
 
     def release_device(self, device_id: str, context: str = "default") -> None:
         return self._run_sync(self._release_device_impl(device_id, context))
@@ -929,6 +959,11 @@ class PhoneAgentManager:
     def list_agents(self) -> list[str]:
         return self._run_sync(self._list_agents_impl())
 
+    @property
+    def agent_count(self) -> int:
+        """Number of initialized agents across all contexts (lock-free read)."""
+        return len(self._agents)
+
     async def list_agents_async(self) -> list[str]:
         return await self._list_agents_impl()
 
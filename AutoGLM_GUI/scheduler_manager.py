@@ -3,21 +3,55 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import functools
+import hashlib
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Self
+from typing import Any
 from uuid import uuid4
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from AutoGLM_GUI import json_utils
+from AutoGLM_GUI.device_manager import DeviceManager, ManagedDevice
 from AutoGLM_GUI.logger import logger
+from AutoGLM_GUI.models.history import ConversationRecord, MessageRecord
 from AutoGLM_GUI.models.scheduled_task import ScheduledTask
+from AutoGLM_GUI.task_store import TaskStatus
 
-if TYPE_CHECKING:
-    pass
+# 多个任务常在同一分钟触发，运行状态的写盘合并为一次
+RUN_STATUS_SAVE_DELAY = 1.0
+
+
+@functools.lru_cache(maxsize=512)
+def get_cron_trigger(cron_expression: str) -> CronTrigger:
+    """Build (and cache) the trigger for a 5-field cron expression.
+
+    CronTrigger keeps no per-job state, so tasks sharing an expression can
+    share one instance and skip APScheduler's field parsing.
+
+    Raises:
+        ValueError: If the expression is not a valid 5-field cron string.
+    """
+    parts = cron_expression.split()
+    if len(parts) != 5:
+        raise ValueError(f"Invalid cron expression: {cron_expression}")
+
+    return CronTrigger(
+        minute=parts[0],
+        hour=parts[1],
+        day=parts[2],
+        month=parts[3],
+        day_of_week=parts[4],
+    )
+
+
+def _digest(payload: bytes) -> bytes:
+    return hashlib.blake2b(payload, digest_size=16).digest()
 
 
 @dataclass
@@ -29,21 +63,28 @@ class DeviceExecutionResult:
 
 
 class SchedulerManager:
-    _instance: Self | None = None
-
-    def __new__(cls: type[Self]) -> Self:
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    _instance: SchedulerManager | None = None
+    _lock = threading.Lock()
 
     def __init__(self):
-        if hasattr(self, "_initialized"):
-            return
-        self._initialized = True
+        """Private constructor. Use get_instance() instead."""
         self._tasks_path = Path.home() / ".config" / "autoglm" / "scheduled_tasks.json"
         self._scheduler = AsyncIOScheduler()
         self._tasks: dict[str, ScheduledTask] = {}
         self._file_mtime: float | None = None
+        self._saved_digest: bytes | None = None
+        self._save_pending = False
+        self._save_handle: asyncio.TimerHandle | None = None
+        self._save_loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def get_instance(cls) -> SchedulerManager:
+        """Get singleton instance (thread-safe)."""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
 
     async def start(self) -> None:
         self._load_tasks()
@@ -55,6 +96,11 @@ class SchedulerManager:
 
     async def shutdown(self) -> None:
         self._scheduler.shutdown(wait=False)
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self._save_pending:
+            self._save_tasks()
         logger.info("SchedulerManager shutdown")
 
     def create_task(
@@ -67,6 +113,13 @@ class SchedulerManager:
         device_group_id: str | None = None,
         execution_mode: str = "classic",
     ) -> ScheduledTask:
+        """Create, persist and (if enabled) schedule a task.
+
+        Raises:
+            ValueError: If ``cron_expression`` is invalid; nothing is saved.
+        """
+        # 先解析 cron（结果会被缓存，_add_job 直接复用），避免保存后才发现无法调度
+        get_cron_trigger(cron_expression)
         task = ScheduledTask(
             name=name,
             workflow_uuid=workflow_uuid,
@@ -86,10 +139,19 @@ class SchedulerManager:
         return task
 
     def update_task(self, task_id: str, **kwargs: Any) -> ScheduledTask | None:
+        """Apply non-None fields to a task and reschedule it if needed.
+
+        Raises:
+            ValueError: If a new ``cron_expression`` is invalid; the task is
+                left unchanged.
+        """
         task = self._tasks.get(task_id)
         if not task:
             return None
 
+        if kwargs.get("cron_expression") is not None:
+            get_cron_trigger(kwargs["cron_expression"])
+
         old_enabled = task.enabled
         old_cron = task.cron_expression
 
@@ -155,18 +217,7 @@ class SchedulerManager:
 
     def _add_job(self, task: ScheduledTask) -> None:
         try:
-            parts = task.cron_expression.split()
-            if len(parts) != 5:
-                logger.error(f"Invalid cron expression: {task.cron_expression}")
-                return
-
-            trigger = CronTrigger(
-                minute=parts[0],
-                hour=parts[1],
-                day=parts[2],
-                month=parts[3],
-                day_of_week=parts[4],
-            )
+            trigger = get_cron_trigger(task.cron_expression)
 
             self._scheduler.add_job(
                 self._execute_task,
@@ -176,7 +227,7 @@ class SchedulerManager:
                 replace_existing=True,
             )
             logger.debug(f"Added job for task: {task.name}")
-        except Exception as e:
+        except ValueError as e:
             logger.error(f"Failed to add job for task {task.name}: {e}")
 
     def _remove_job(self, task_id: str) -> None:
@@ -190,21 +241,18 @@ class SchedulerManager:
     async def _execute_single_device(
         self,
         serialno: str,
+        device: ManagedDevice | None,
         workflow: dict[str, Any],
         task_name: str,
         manager: Any,
-        device_manager: Any,
         history_manager: Any,
     ) -> DeviceExecutionResult:
-        from AutoGLM_GUI.models.history import ConversationRecord, MessageRecord
+        """Run ``workflow`` on one device.
 
-        device = None
-        for d in device_manager.get_devices():
-            if d.serial == serialno and d.state.value == "online":
-                device = d
-                break
-
-        if not device:
+        ``device`` is looked up by the caller from a serial index of online
+        devices built once per fire; ``None`` means the device is offline.
+        """
+        if device is None:
             return DeviceExecutionResult(
                 serialno=serialno,
                 success=False,
@@ -228,6 +276,8 @@ class SchedulerManager:
             )
 
         start_time = datetime.now(tz=timezone.utc)
+        # 耗时使用单调时钟计算，避免系统时间跳变导致负数
+        start_ns = time.monotonic_ns()
         messages: list[MessageRecord] = [
             MessageRecord(
                 role="user",
@@ -236,6 +286,22 @@ class SchedulerManager:
             )
         ]
 
+        # 流式循环中只记录 (时间戳, step 数据)，保存历史时再统一构建 MessageRecord
+        step_events: list[tuple[datetime, dict[str, Any]]] = []
+
+        def history_messages() -> list[MessageRecord]:
+            return messages + [
+                MessageRecord(
+                    role="assistant",
+                    content="",
+                    timestamp=timestamp,
+                    thinking=step_data.get("thinking", ""),
+                    action=step_data.get("action", {}),
+                    step=step_data.get("step", 0),
+                )
+                for timestamp, step_data in step_events
+            ]
+
         result_message = ""
         task_success = False
 
@@ -246,16 +312,7 @@ class SchedulerManager:
             async for event in agent.stream(workflow["text"]):
                 step_data: dict[str, Any] = event.get("data", {})
                 if event["type"] == "step":
-                    messages.append(
-                        MessageRecord(
-                            role="assistant",
-                            content="",
-                            timestamp=datetime.now(tz=timezone.utc),
-                            thinking=step_data.get("thinking", ""),
-                            action=step_data.get("action", {}),
-                            step=step_data.get("step", 0),
-                        )
-                    )
+                    step_events.append((datetime.now(tz=timezone.utc), step_data))
                 elif event["type"] == "done":
                     result_message = step_data.get("message", "Task completed")
                     task_success = step_data.get("success", False)
@@ -276,11 +333,11 @@ class SchedulerManager:
                 steps=steps,
                 start_time=start_time,
                 end_time=end_time,
-                duration_ms=int((end_time - start_time).total_seconds() * 1000),
+                duration_ms=(time.monotonic_ns() - start_ns) // 1_000_000,
                 source="scheduled",
                 source_detail=f"{task_name} [{device_model}]",
                 error_message=None if task_success else result_message,
-                messages=messages,
+                messages=history_messages(),
             )
             await asyncio.to_thread(history_manager.add_record, serialno, record)
 
@@ -303,11 +360,11 @@ class SchedulerManager:
                 steps=0,
                 start_time=start_time,
                 end_time=end_time,
-                duration_ms=int((end_time - start_time).total_seconds() * 1000),
+                duration_ms=(time.monotonic_ns() - start_ns) // 1_000_000,
                 source="scheduled",
                 source_detail=f"{task_name} [{device_model}]",
                 error_message=error_msg,
-                messages=messages,
+                messages=history_messages(),
             )
             await asyncio.to_thread(history_manager.add_record, serialno, record)
 
@@ -329,7 +386,6 @@ class SchedulerManager:
         """
         if task.device_group_id:
             from AutoGLM_GUI.device_group_manager import device_group_manager
-            from AutoGLM_GUI.device_manager import DeviceManager
 
             device_manager = DeviceManager.get_instance()
 
@@ -365,9 +421,8 @@ class SchedulerManager:
             f"Executing scheduled task: {task.name} on {len(device_serialnos)} device(s)"
         )
 
-        from AutoGLM_GUI.device_manager import DeviceManager
         from AutoGLM_GUI.task_manager import task_manager
-        from AutoGLM_GUI.task_store import TaskStatus, task_store
+        from AutoGLM_GUI.task_store import task_store
         from AutoGLM_GUI.workflow_manager import workflow_manager
 
         workflow = workflow_manager.get_workflow(task.workflow_uuid)
@@ -480,7 +535,7 @@ class SchedulerManager:
         task.last_run_success_count = success_count
         task.last_run_total_count = total_count
         task.last_run_message = message[:500] if message else ""
-        self._save_tasks()
+        self._schedule_save()
         if status == "success":
             logger.info(f"Scheduled task completed: {task.name}")
         elif status == "partial":
@@ -488,35 +543,83 @@ class SchedulerManager:
         else:
             logger.warning(f"Scheduled task failed: {task.name} - {message}")
 
+    def _schedule_save(self) -> None:
+        """Persist run status after a short delay, coalescing bursts of runs.
+
+        CRUD operations still save immediately; any save clears the pending
+        flag, so a later timer firing is a no-op.
+        """
+        self._save_pending = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._save_tasks()
+            return
+        # 定时器属于创建它的事件循环，循环已关闭时需重新调度
+        if self._save_handle is not None and self._save_loop is loop:
+            return
+        self._save_loop = loop
+        self._save_handle = loop.call_later(
+            RUN_STATUS_SAVE_DELAY, self._flush_pending_save
+        )
+
+    def _flush_pending_save(self) -> None:
+        self._save_handle = None
+        if self._save_pending:
+            self._save_tasks()
+
     def _load_tasks(self) -> None:
         if not self._tasks_path.exists():
             return
 
         try:
-            with open(self._tasks_path, encoding="utf-8") as f:
-                data = json.load(f)
+            raw = self._tasks_path.read_bytes()
+            data = json_utils.loads(raw)
             tasks_data = data.get("tasks", [])
             self._tasks = {t["id"]: ScheduledTask.from_dict(t) for t in tasks_data}
             self._file_mtime = self._tasks_path.stat().st_mtime
+            self._saved_digest = _digest(raw)
             logger.debug(f"Loaded {len(self._tasks)} scheduled tasks")
-        except Exception as e:
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            # 文件缺失字段或 JSON 损坏时忽略，其他异常属于程序错误，直接抛出
             logger.warning(f"Failed to load scheduled tasks: {e}")
 
     def _save_tasks(self) -> None:
-        self._tasks_path.parent.mkdir(parents=True, exist_ok=True)
-        temp_path = self._tasks_path.with_suffix(".tmp")
+        self._save_pending = False
+        try:
+            data = {"tasks": [t.to_dict() for t in list(self._tasks.values())]}
+            payload = json_utils.dumps_bytes(data, indent=True)
+        except TypeError as e:
+            logger.error(f"Failed to serialize scheduled tasks: {e}")
+            return
+
+        digest = _digest(payload)
+        # 内容与上次写入一致且文件未被外部修改时，跳过临时文件写入和替换
+        if digest == self._saved_digest and self._file_unchanged():
+            return
+
+        # API 线程中的即时保存与事件循环上的延迟保存可能同时进行，
+        # 每次使用独立的临时文件，避免互相覆盖半写入的内容
+        temp_path = self._tasks_path.with_name(
+            f".{self._tasks_path.name}.{uuid4().hex}.tmp"
+        )
 
         try:
-            data = {"tasks": [t.to_dict() for t in self._tasks.values()]}
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._tasks_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_bytes(payload)
             temp_path.replace(self._tasks_path)
             self._file_mtime = self._tasks_path.stat().st_mtime
+            self._saved_digest = digest
             logger.debug(f"Saved {len(self._tasks)} scheduled tasks")
-        except Exception as e:
+        except OSError as e:
             logger.error(f"Failed to save scheduled tasks: {e}")
-            if temp_path.exists():
-                temp_path.unlink()
+            temp_path.unlink(missing_ok=True)
+
+    def _file_unchanged(self) -> bool:
+        try:
+            return self._tasks_path.stat().st_mtime == self._file_mtime
+        except OSError:
+            return False
 
 
-scheduler_manager = SchedulerManager()
+scheduler_manager = SchedulerManager.get_instance()
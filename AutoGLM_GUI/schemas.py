@@ -954,6 +954,28 @@ class TaskSessionResetResponse(BaseModel):
 # Scheduled Task Models
 
 
+def _validate_cron_expression(v: str) -> str:
+    """Normalize a cron expression and check every field before it is saved.
+
+    The trigger is built through the scheduler's cache, so the later
+    ``_add_job`` call reuses it instead of parsing the expression again.
+    """
+    from AutoGLM_GUI.scheduler_manager import get_cron_trigger
+
+    expression = v.strip()
+    if not expression:
+        raise ValueError("cron_expression cannot be empty")
+    if len(expression.split()) != 5:
+        raise ValueError(
+            "cron_expression must have 5 fields (minute hour day month weekday)"
+        )
+    try:
+        get_cron_trigger(expression)
+    except ValueError as e:
+        raise ValueError(f"invalid cron_expression: {e}") from e
+    return expression
+
+
 class ScheduledTaskCreate(BaseModel):
     """创建定时任务请求."""
 
@@ -990,14 +1012,7 @@ class ScheduledTaskCreate(BaseModel):
     @field_validator("cron_expression")
     @classmethod
     def validate_cron(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError("cron_expression cannot be empty")
-        parts = v.strip().split()
-        if len(parts) != 5:
-            raise ValueError(
-                "cron_expression must have 5 fields (minute hour day month weekday)"
-            )
-        return v.strip()
+        return _validate_cron_expression(v)
 
     @field_validator("execution_mode")
     @classmethod
@@ -1048,14 +1063,7 @@ class ScheduledTaskUpdate(BaseModel):
     def validate_cron(cls, v: str | None) -> str | None:
         if v is None:
             return v
-        if not v.strip():
-            raise ValueError("cron_expression cannot be empty")
-        parts = v.strip().split()
-        if len(parts) != 5:
-            raise ValueError(
-                "cron_expression must have 5 fields (minute hour day month weekday)"
-            )
-        return v.strip()
+        return _validate_cron_expression(v)
 
     @field_validator("execution_mode")
     @classmethod
@@ -333,7 +333,7 @@ class ScrcpyStreamer:
 
             clear_display_selection_cache(device_id=self.device_id)
             logger.warning(
-                "Scrcpy failed with display_id=%s, retrying without display_id",
+                "Scrcpy failed with display_id={}, retrying without display_id",
                 self._display_selection.logical_id,
             )
             self._display_selection = None
@@ -581,7 +581,7 @@ class ScrcpyStreamer:
             try:
                 self.tcp_socket.close()
             except OSError as exc:
-                logger.debug("Failed to close scrcpy socket: %s", exc)
+                logger.debug("Failed to close scrcpy socket: {}", exc)
             self.tcp_socket = None
 
         if self.scrcpy_process:
@@ -590,11 +590,11 @@ class ScrcpyStreamer:
                 if isinstance(self.scrcpy_process, subprocess.Popen):
                     self.scrcpy_process.wait(timeout=2)
             except (OSError, subprocess.TimeoutExpired) as exc:
-                logger.debug("Graceful scrcpy shutdown failed: %s", exc)
+                logger.debug("Graceful scrcpy shutdown failed: {}", exc)
                 try:
                     self.scrcpy_process.kill()
                 except OSError as kill_exc:
-                    logger.debug("Failed to kill scrcpy process: %s", kill_exc)
+                    logger.debug("Failed to kill scrcpy process: {}", kill_exc)
             self.scrcpy_process = None
 
         if self.forward_cleanup_needed:
@@ -611,7 +611,7 @@ class ScrcpyStreamer:
                 )
             except (OSError, subprocess.SubprocessError) as exc:
                 logger.debug(
-                    "Failed to remove adb forward for port %s: %s",
+                    "Failed to remove adb forward for port {}: {}",
                     self.port,
                     exc,
                 )
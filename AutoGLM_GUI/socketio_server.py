@@ -111,12 +111,12 @@ async def _stream_packets(sid: str, streamer: ScrcpyStreamer) -> None:
     except asyncio.CancelledError:
         raise
     except Exception as exc:
-        logger.exception("Video streaming failed: %s", exc)
+        logger.exception("Video streaming failed: {}", exc)
         try:
             await sio.emit("error", {"message": str(exc)}, to=sid)
         except Exception as emit_exc:
             logger.debug(
-                "Failed to emit Socket.IO stream error to %s: %s", sid, emit_exc
+                "Failed to emit Socket.IO stream error to {}: {}", sid, emit_exc
             )
     finally:
         await _stop_stream_for_sid(sid)
@@ -136,12 +136,12 @@ def _packet_to_payload(packet: ScrcpyMediaStreamPacket) -> VideoPacketPayload:
 
 @sio.event
 async def connect(sid: str, environ: dict[str, Any]) -> None:
-    logger.info("Socket.IO client connected: %s", sid)
+    logger.info("Socket.IO client connected: {}", sid)
 
 
 @sio.event
 async def disconnect(sid: str) -> None:
-    logger.info("Socket.IO client disconnected: %s", sid)
+    logger.info("Socket.IO client disconnected: {}", sid)
     await _stop_stream_for_sid(sid)
 
 
@@ -208,7 +208,7 @@ async def connect_device(sid: str, data: dict[str, Any] | None) -> None:
 
         except Exception as exc:
             streamer.stop()
-            logger.exception("Failed to start scrcpy stream: %s", exc)
+            logger.exception("Failed to start scrcpy stream: {}", exc)
             # Use unified error classification
             error_info = _classify_error(exc)
             await sio.emit("error", error_info, to=sid)
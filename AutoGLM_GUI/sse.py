@@ -0,0 +1,122 @@
+"""Server-sent event framing for the streaming API routes."""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+
+from AutoGLM_GUI import json_utils
+
+# Comment frames are ignored by EventSource clients but keep reverse proxies
+# from closing the connection while a long agent step produces no events.
+KEEPALIVE_FRAME = b": ping\n\n"
+KEEPALIVE_INTERVAL = 15.0
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+_DATA_PREFIX = b"data: "
+_FRAME_END = b"\n\n"
+
+# Event names come from a small fixed set (step, done, error, ...), so the
+# whole "event: <name>\ndata: " header is built once per name.
+_event_headers: dict[str, bytes] = {}
+
+
+def _event_header(event: str) -> bytes:
+    header = _event_headers.get(event)
+    if header is None:
+        header = b"event: " + event.encode("utf-8") + b"\n" + _DATA_PREFIX
+        if len(_event_headers) < 64:
+            _event_headers[event] = header
+    return header
+
+
+def encode_sse_event(data: Any, event: str | None = None) -> bytes:
+    """Encode ``data`` as one SSE frame with a JSON ``data:`` line.
+
+    Frames are built as bytes so StreamingResponse writes them as-is instead
+    of re-encoding a str per chunk.
+    """
+    header = _DATA_PREFIX if event is None else _event_header(event)
+    return b"".join((header, json_utils.dumps_bytes(data), _FRAME_END))
+
+
+class _StreamEnd:
+    """Queue sentinel marking the end of ``frames``, carrying its error if any."""
+
+    __slots__ = ("error",)
+
+    def __init__(self) -> None:
+        self.error: Exception | None = None
+
+
+async def with_keepalive(
+    frames: AsyncGenerator[bytes, None], interval: float = KEEPALIVE_INTERVAL
+) -> AsyncGenerator[bytes, None]:
+    """Yield ``frames``, inserting a keep-alive comment after ``interval`` idle seconds.
+
+    One pump task per stream reads ``frames`` into a single-slot queue, so a
+    timeout is only raced when no frame is ready. When the consumer stops
+    (client disconnect or cancellation) the pump is cancelled and awaited, and
+    ``frames`` is closed in the task that iterated it.
+    """
+    queue: asyncio.Queue[bytes | _StreamEnd] = asyncio.Queue(maxsize=1)
+
+    async def pump() -> None:
+        end = _StreamEnd()
+        try:
+            async with contextlib.aclosing(frames):
+                async for frame in frames:
+                    await queue.put(frame)
+        except Exception as exc:
+            end.error = exc
+        await queue.put(end)
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        while True:
+            try:
+                # The queue holds one frame and the pump only refills it while
+                # this generator is suspended, so a ready frame means the loop
+                # already ran since the previous one was handed over: a burst
+                # of events still reaches the socket frame by frame.
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                try:
+                    async with asyncio.timeout(interval):
+                        item = await queue.get()
+                except TimeoutError:
+                    yield KEEPALIVE_FRAME
+                    continue
+            if isinstance(item, _StreamEnd):
+                if item.error is not None:
+                    raise item.error
+                return
+            yield item
+    finally:
+        pump_task.cancel()
+        # wait() does not re-raise the pump's CancelledError, so a cancellation
+        # of this generator itself still propagates.
+        await asyncio.wait({pump_task})
+
+
+def sse_response(
+    frames: AsyncGenerator[bytes, None], *, ping_interval: float = KEEPALIVE_INTERVAL
+) -> StreamingResponse:
+    """Stream pre-encoded SSE frames with keep-alive pings.
+
+    Starlette cancels the generator when the client disconnects, so producers
+    stop polling the task store as soon as the stream is abandoned.
+    """
+    return StreamingResponse(
+        with_keepalive(frames, ping_interval),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
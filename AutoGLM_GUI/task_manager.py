@@ -24,6 +24,94 @@ import AutoGLM_GUI.trace as trace_module
 TaskExecutor = Callable[[TaskRecord], Awaitable[None]]
 TaskImageAttachment = dict[str, Any]
 
+# 思考流合并写入：最多缓冲这么久 / 这么多字符后落库一次
+THINKING_FLUSH_INTERVAL = 0.1
+THINKING_FLUSH_CHARS = 1024
+
+
+class _ThinkingEventBuffer:
+    """Coalesce consecutive ``{"chunk": ...}`` thinking payloads into fewer events.
+
+    Agents stream thinking token by token and every task event costs a SQLite
+    insert (plus a replay write) on a worker thread. Chunks are merged and
+    written at most every ``THINKING_FLUSH_INTERVAL`` seconds or once
+    ``THINKING_FLUSH_CHARS`` are buffered. Call ``flush()`` before appending any
+    other event so ordering is preserved; clients concatenate chunks anyway.
+    """
+
+    def __init__(self, write: Callable[[dict[str, Any]], Awaitable[object]]):
+        self._write = write
+        self._chunks: list[str] = []
+        self._size = 0
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_flush: asyncio.Task[None] | None = None
+
+    async def add(self, payload: dict[str, Any]) -> None:
+        chunk = payload.get("chunk")
+        if len(payload) != 1 or not isinstance(chunk, str):
+            await self.flush()
+            await self._write(payload)
+            return
+
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        if self._size >= THINKING_FLUSH_CHARS:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                THINKING_FLUSH_INTERVAL, self._on_timer
+            )
+
+    async def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._write_buffered()
+
+    async def close(self) -> None:
+        """Persist any remaining chunks once the stream has ended.
+
+        Used from ``finally`` so thinking received before an error or a user
+        stop is still saved. The write is shielded from cancellation, and a
+        failure is logged rather than raised so it never masks the stream's
+        own exception.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        try:
+            # 锁保证先等待进行中的定时写入，再写入剩余内容
+            await asyncio.shield(self._write_buffered())
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.opt(exception=True).warning(
+                "Failed to persist buffered thinking chunks"
+            )
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._timer_flush = asyncio.ensure_future(self._write_buffered())
+        self._timer_flush.add_done_callback(self._on_timer_flush_done)
+
+    def _on_timer_flush_done(self, task: asyncio.Task[None]) -> None:
+        if task is self._timer_flush:
+            self._timer_flush = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.opt(exception=task.exception()).warning(
+                "Failed to persist thinking chunks on timer flush"
+            )
+
+    async def _write_buffered(self) -> None:
+        async with self._lock:
+            if not self._chunks:
+                return
+            chunk = "".join(self._chunks)
+            self._chunks.clear()
+            self._size = 0
+            await self._write({"chunk": chunk})
+
 
 class TaskManager:
     """Queue-backed task manager with per-device workers."""
@@ -348,10 +436,8 @@ class TaskManager:
                 step_summaries=step_summaries,
             )
         except Exception:
-            logger.warning(
-                "Failed to persist trace artifacts for task %s",
-                task_id,
-                exc_info=True,
+            logger.opt(exception=True).warning(
+                "Failed to persist trace artifacts for task {}", task_id
             )
 
     async def _write_replay_task_start(
@@ -559,31 +645,52 @@ class TaskManager:
                         sig = inspect.signature(agent.stream)
                         if "continue_with" in sig.parameters:
                             stream_kwargs["continue_with"] = task["input_text"]
-                    async for event in agent.stream(
-                        task["input_text"],
-                        **stream_kwargs,
-                    ):
-                        event_type = event["type"]
-                        event_data = dict(event.get("data", {}))
-
-                        if event_type == "step":
-                            step_count = max(step_count, int(event_data.get("step", 0)))
-                            timings = trace_module.get_step_timing_summary(
-                                step_count,
-                                trace_id=trace_id,
-                            )
-                            if timings is not None:
-                                event_data = {**event_data, "timings": timings}
-
-                        await self._append_task_event(
+                    thinking_buffer = _ThinkingEventBuffer(
+                        lambda payload: self._append_task_event(
                             task_id=task_id,
-                            event_type=event_type,
-                            payload=event_data,
+                            event_type="thinking",
+                            payload=payload,
                             role="assistant",
                             trace_id=trace_id,
                             replay_source="classic_chat",
                             task=task,
                         )
+                    )
+                    try:
+                        async for event in agent.stream(
+                            task["input_text"],
+                            **stream_kwargs,
+                        ):
+                            event_type = event["type"]
+                            event_data = dict(event.get("data", {}))
+                            if event_type == "thinking":
+                                await thinking_buffer.add(event_data)
+                                continue
+                            await thinking_buffer.flush()
+
+                            if event_type == "step":
+                                step_count = max(
+                                    step_count, int(event_data.get("step", 0))
+                                )
+                                timings = trace_module.get_step_timing_summary(
+                                    step_count,
+                                    trace_id=trace_id,
+                                )
+                                if timings is not None:
+                                    event_data = {**event_data, "timings": timings}
+
+                            await self._append_task_event(
+                                task_id=task_id,
+                                event_type=event_type,
+                                payload=event_data,
+                                role="assistant",
+                                trace_id=trace_id,
+                                replay_source="classic_chat",
+                                task=task,
+                            )
+                        await thinking_buffer.flush()
+                    finally:
+                        await thinking_buffer.close()
 
                     if event_type == "takeover":
                         final_message = str(event_data.get("message", ""))
@@ -890,83 +997,94 @@ class TaskManager:
                     final_status = TaskStatus.CANCELLED.value
                     stop_reason = "user_stopped"
                 else:
-                    async for event in agent.stream(task["input_text"]):
-                        event_type = event["type"]
-                        event_data = dict(event.get("data", {}))
-                        if event_type == "thinking":
-                            await self._append_task_event(
-                                task_id=task_id,
-                                event_type="thinking",
-                                payload=event_data,
-                                role="assistant",
-                                trace_id=trace_id,
-                                replay_source="scheduled",
-                                task=task,
-                            )
-                        elif event_type == "step":
-                            step_count = max(
-                                step_count,
-                                int(event_data.get("step", 0)),
-                            )
-                            timings = trace_module.get_step_timing_summary(
-                                step_count,
-                                trace_id=trace_id,
-                            )
-                            if timings is not None:
-                                event_data = {**event_data, "timings": timings}
-                            await self._append_task_event(
-                                task_id=task_id,
-                                event_type="step",
-                                payload=event_data,
-                                role="assistant",
-                                trace_id=trace_id,
-                                replay_source="scheduled",
-                                task=task,
-                            )
-                        elif event_type == "done":
-                            final_message = str(
-                                event_data.get("message", "Task completed")
-                            )
-                            final_status = (
-                                TaskStatus.SUCCEEDED.value
-                                if event_data.get("success", False)
-                                else TaskStatus.FAILED.value
-                            )
-                            stop_reason = str(
-                                event_data.get(
-                                    "stop_reason",
-                                    "completed"
+                    thinking_buffer = _ThinkingEventBuffer(
+                        lambda payload: self._append_task_event(
+                            task_id=task_id,
+                            event_type="thinking",
+                            payload=payload,
+                            role="assistant",
+                            trace_id=trace_id,
+                            replay_source="scheduled",
+                            task=task,
+                        )
+                    )
+                    try:
+                        async for event in agent.stream(task["input_text"]):
+                            event_type = event["type"]
+                            event_data = dict(event.get("data", {}))
+                            if event_type == "thinking":
+                                await thinking_buffer.add(event_data)
+                                continue
+                            await thinking_buffer.flush()
+                            if event_type == "step":
+                                step_count = max(
+                                    step_count,
+                                    int(event_data.get("step", 0)),
+                                )
+                                timings = trace_module.get_step_timing_summary(
+                                    step_count,
+                                    trace_id=trace_id,
+                                )
+                                if timings is not None:
+                                    event_data = {**event_data, "timings": timings}
+                                await self._append_task_event(
+                                    task_id=task_id,
+                                    event_type="step",
+                                    payload=event_data,
+                                    role="assistant",
+                                    trace_id=trace_id,
+                                    replay_source="scheduled",
+                                    task=task,
+                                )
+                            elif event_type == "done":
+                                final_message = str(
+                                    event_data.get("message", "Task completed")
+                                )
+                                final_status = (
+                                    TaskStatus.SUCCEEDED.value
                                     if event_data.get("success", False)
-                                    else "error",
+                                    else TaskStatus.FAILED.value
                                 )
-                            )
-                            step_count = int(event_data.get("steps", step_count))
-                        elif event_type == "error":
-                            final_message = str(
-                                event_data.get("message", "Task failed")
-                            )
-                            final_status = TaskStatus.FAILED.value
-                            stop_reason = str(event_data.get("stop_reason", "error"))
-                            await self._append_task_event(
-                                task_id=task_id,
-                                event_type="error",
-                                payload={
-                                    "message": final_message,
-                                    "stop_reason": stop_reason,
-                                },
-                                role="assistant",
-                                trace_id=trace_id,
-                                replay_source="scheduled",
-                                task=task,
-                            )
-                        elif event_type == "cancelled":
-                            final_message = str(
-                                event_data.get("message", "Task cancelled by user")
-                            )
-                            final_status = TaskStatus.CANCELLED.value
-                            stop_reason = str(
-                                event_data.get("stop_reason", "user_stopped")
-                            )
+                                stop_reason = str(
+                                    event_data.get(
+                                        "stop_reason",
+                                        "completed"
+                                        if event_data.get("success", False)
+                                        else "error",
+                                    )
+                                )
+                                step_count = int(event_data.get("steps", step_count))
+                            elif event_type == "error":
+                                final_message = str(
+                                    event_data.get("message", "Task failed")
+                                )
+                                final_status = TaskStatus.FAILED.value
+                                stop_reason = str(
+                                    event_data.get("stop_reason", "error")
+                                )
+                                await self._append_task_event(
+                                    task_id=task_id,
+                                    event_type="error",
+                                    payload={
+                                        "message": final_message,
+                                        "stop_reason": stop_reason,
+                                    },
+                                    role="assistant",
+                                    trace_id=trace_id,
+                                    replay_source="scheduled",
+                                    task=task,
+                                )
+                            elif event_type == "cancelled":
+                                final_message = str(
+                                    event_data.get("message", "Task cancelled by user")
+                                )
+                                final_status = TaskStatus.CANCELLED.value
+                                stop_reason = str(
+                                    event_data.get("stop_reason", "user_stopped")
+                                )
+                        await thinking_buffer.flush()
+                    finally:
+                        await thinking_buffer.close()
 
                 if not final_message:
                     final_message = "Task finished without a final response"
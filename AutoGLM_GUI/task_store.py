@@ -904,10 +904,9 @@ class TaskStore:
         if any(task["status"] not in TERMINAL_TASK_STATUSES for task in tasks):
             return None
 
+        succeeded = [task["status"] == TaskStatus.SUCCEEDED.value for task in tasks]
         total_count = len(tasks)
-        success_count = sum(
-            1 for task in tasks if task["status"] == TaskStatus.SUCCEEDED.value
-        )
+        success_count = sum(succeeded)
         if success_count == total_count:
             status = "success"
             success = True
@@ -918,12 +917,11 @@ class TaskStore:
             status = "failure"
             success = False
 
-        message_parts = []
-        for task in tasks:
-            icon = "✓" if task["status"] == TaskStatus.SUCCEEDED.value else "✗"
-            short_device = task["device_serial"]
-            result = task["final_message"] or task["error_message"] or task["status"]
-            message_parts.append(f"{icon} {short_device}: {result[:30]}")
+        summary_message = " | ".join(
+            f"{'✓' if ok else '✗'} {task['device_serial']}: "
+            f"{(task['final_message'] or task['error_message'] or task['status'])[:30]}"
+            for task, ok in zip(tasks, succeeded)
+        )
 
         last_run_time = max(
             task["finished_at"] or task["started_at"] or task["created_at"]
@@ -936,7 +934,7 @@ class TaskStore:
             "last_run_status": status,
             "last_run_success_count": success_count,
             "last_run_total_count": total_count,
-            "last_run_message": " | ".join(message_parts)[:500],
+            "last_run_message": summary_message[:500],
         }
 
 
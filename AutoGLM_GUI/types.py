@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from enum import Enum
+from enum import StrEnum
 from typing import Literal
 
 from typing_extensions import TypedDict
@@ -126,7 +126,7 @@ class Observation(TypedDict, total=False):
     accessibility_tree: dict[str, object] | None
 
 
-class DeviceConnectionType(Enum):
+class DeviceConnectionType(StrEnum):
     """Device connection type.
 
     Unified enum for device connection types to avoid confusion
@@ -14,34 +14,10 @@ Mock Device Agent 启动脚本
 """
 
 import argparse
-import time
-import threading
 
-import httpx
 import uvicorn
 
 
-def _load_scenario_after_startup(base_url: str, scenario_path: str, delay: float = 1.0):
-    """等待服务器启动后加载场景。"""
-    time.sleep(delay)
-    try:
-        with httpx.Client(timeout=30.0) as client:
-            resp = client.post(
-                f"{base_url}/test/load_scenario",
-                json={"scenario_path": scenario_path},
-            )
-            resp.raise_for_status()
-            result = resp.json()
-            print(
-                f"\n  ✓ 场景加载成功: {result.get('scenario', scenario_path)}",
-                flush=True,
-            )
-            if result.get("states"):
-                print(f"  可用状态: {', '.join(result['states'])}", flush=True)
-    except Exception as e:
-        print(f"\n  ❌ 场景加载失败: {e}", flush=True)
-
-
 def main():
     parser = argparse.ArgumentParser(
         description="启动 Mock Device Agent 服务器",
@@ -94,10 +70,8 @@ def main():
     # 导入并创建 app
     from tests.e2e.device_agent.mock_agent_server import create_app
 
-    app = create_app()
-
-    # 构建服务器 URL
-    server_url = f"http://localhost:{args.port}"
+    # 场景在应用启动 (lifespan) 时直接加载，无需等待服务器就绪后再 POST
+    app = create_app(args.scenario or None)
 
     print("=" * 60)
     print("  Mock Device Agent 服务器")
@@ -105,7 +79,7 @@ def main():
     print(f"  地址: http://{args.host}:{args.port}")
     print(f"  日志: {args.log_level}")
     if args.scenario:
-        print(f"  场景: {args.scenario} (启动后自动加载)")
+        print(f"  场景: {args.scenario} (启动时加载)")
     print("=" * 60)
     print("\n可用端点:")
     print("  GET  /devices                    # 设备列表")
@@ -122,15 +96,6 @@ def main():
     print("=" * 60)
     print()
 
-    # 如果有场景，启动后台线程在服务器启动后加载
-    if args.scenario:
-        load_thread = threading.Thread(
-            target=_load_scenario_after_startup,
-            args=(server_url, args.scenario),
-            daemon=True,
-        )
-        load_thread.start()
-
     uvicorn.run(
         app,
         host=args.host,
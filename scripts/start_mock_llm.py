@@ -16,45 +16,26 @@ Mock LLM Server 启动脚本
 
 import argparse
 import json
-import time
-import threading
 
-import httpx
 import uvicorn
 
 
-def _load_responses_after_startup(
-    base_url: str, responses_path: str, delay: float = 1.0
-):
-    """等待服务器启动后加载自定义响应。"""
-    time.sleep(delay)
+def _read_responses(responses_path: str) -> list[str] | None:
+    """读取自定义响应文件，格式错误时返回 None。"""
     try:
-        # 读取响应文件
         with open(responses_path, encoding="utf-8") as f:
             responses = json.load(f)
-
-        if not isinstance(responses, list):
-            print("\n  ❌ 响应文件格式错误: 必须是字符串数组", flush=True)
-            return
-
-        # 发送到服务器
-        with httpx.Client(timeout=30.0) as client:
-            resp = client.post(
-                f"{base_url}/test/set_responses",
-                json=responses,
-            )
-            resp.raise_for_status()
-            result = resp.json()
-            print(
-                f"\n  ✓ 响应加载成功: {result.get('response_count', 0)} 条响应",
-                flush=True,
-            )
     except FileNotFoundError:
         print(f"\n  ❌ 响应文件未找到: {responses_path}", flush=True)
+        return None
     except json.JSONDecodeError as e:
         print(f"\n  ❌ 响应文件 JSON 解析失败: {e}", flush=True)
-    except Exception as e:
-        print(f"\n  ❌ 响应加载失败: {e}", flush=True)
+        return None
+
+    if not isinstance(responses, list):
+        print("\n  ❌ 响应文件格式错误: 必须是字符串数组", flush=True)
+        return None
+    return responses
 
 
 def main():
@@ -115,7 +96,9 @@ def main():
     # 导入并创建 app
     from tests.e2e.device_agent.mock_llm_server import create_app
 
-    app = create_app()
+    # 响应在应用启动 (lifespan) 时直接写入，无需等待服务器就绪后再 POST
+    responses = _read_responses(args.responses) if args.responses else None
+    app = create_app(responses)
 
     # 构建服务器 URL
     server_url = f"http://localhost:{args.port}"
@@ -126,7 +109,7 @@ def main():
     print(f"  地址: http://{args.host}:{args.port}")
     print(f"  日志: {args.log_level}")
     if args.responses:
-        print(f"  响应: {args.responses} (启动后自动加载)")
+        print(f"  响应: {args.responses} ({len(responses or [])} 条)")
     else:
         print("  响应: 使用默认响应 (美团消息点击场景)")
     print("=" * 60)
@@ -146,15 +129,6 @@ def main():
     print("=" * 60)
     print()
 
-    # 如果有自定义响应，启动后台线程在服务器启动后加载
-    if args.responses:
-        load_thread = threading.Thread(
-            target=_load_responses_after_startup,
-            args=(server_url, args.responses),
-            daemon=True,
-        )
-        load_thread.start()
-
     uvicorn.run(
         app,
         host=args.host,
@@ -10,6 +10,7 @@ import time
 import uuid
 from dataclasses import dataclass, field
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI, HTTPException
@@ -126,11 +127,19 @@ async def stream_response(content: str) -> AsyncGenerator[str, None]:
     yield "data: [DONE]\n\n"
 
 
-def create_app() -> FastAPI:
-    """Create the FastAPI app."""
+def create_app(responses: list[str] | None = None) -> FastAPI:
+    """Create the FastAPI app with optional pre-loaded responses."""
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if responses is not None:
+            state.set_responses(responses)
+        yield
+
     app = FastAPI(
         title="Mock OpenAI LLM Server",
         description="Mock LLM server for integration testing",
+        lifespan=lifespan,
     )
 
     # Register routes
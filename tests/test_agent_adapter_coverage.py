@@ -515,6 +515,8 @@ def test_mai_agent_execute_step_success_action_failure_and_reset(
 
     messages = agent._build_messages("task", "screen", PNG_1X1_BASE64)
     assert len(messages) == 5
+    assert agent.traj_memory.steps[0].screenshot_base64 == PNG_1X1_BASE64
+    assert messages[2]["content"][0]["image_url"]["url"].endswith(PNG_1X1_BASE64)
     agent.reset()
     assert len(agent.traj_memory) == 0
 
@@ -742,9 +744,9 @@ def test_gemini_agent_execute_step_and_llm_paths(
     agent._prepare_initial_context("tap", PNG_1X1_BASE64, "app")
 
     async def tap_tool():
-        return "think", None, "tap", {"x": 1, "y": 2}
+        yield "think", None, "tap", {"x": 1, "y": 2}
 
-    monkeypatch.setattr(agent, "_call_llm_with_tools", tap_tool)
+    monkeypatch.setattr(agent, "_stream_llm_with_tools", tap_tool)
 
     async def fake_execute(*a, **k):
         return ActionResult(success=True, should_finish=False, message="ok")
@@ -759,12 +761,12 @@ def test_gemini_agent_execute_step_and_llm_paths(
     action_error_agent._prepare_initial_context("tap", PNG_1X1_BASE64, "app")
 
     async def back_tool():
-        return "", None, "back", {}
+        yield "", None, "back", {}
 
     async def raise_action(*args, **kwargs):
         raise RuntimeError("tap failed")
 
-    monkeypatch.setattr(action_error_agent, "_call_llm_with_tools", back_tool)
+    monkeypatch.setattr(action_error_agent, "_stream_llm_with_tools", back_tool)
     monkeypatch.setattr(action_error_agent.action_handler, "execute", raise_action)
     action_error_events = asyncio.run(_collect(action_error_agent._execute_step()))
     assert action_error_events[-1]["data"]["success"] is False
@@ -775,8 +777,9 @@ def test_gemini_agent_execute_step_and_llm_paths(
 
     async def broken_tool():
         raise RuntimeError("model failed")
+        yield
 
-    monkeypatch.setattr(model_error_agent, "_call_llm_with_tools", broken_tool)
+    monkeypatch.setattr(model_error_agent, "_stream_llm_with_tools", broken_tool)
     model_events = asyncio.run(_collect(model_error_agent._execute_step()))
     assert [event["type"] for event in model_events] == ["error", "step"]
     assert model_events[-1]["data"]["message"] == "Model error: model failed"
@@ -792,12 +795,39 @@ def test_gemini_call_llm_with_tools_parses_tool_no_tool_bad_json_and_cancel() ->
     agent = _make_gemini_agent()
     agent._prepare_initial_context("tap", PNG_1X1_BASE64, "app")
 
+    class FakeStream:
+        def __init__(self, chunks: list[Any]) -> None:
+            self.chunks = chunks
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            if not self.chunks:
+                raise StopAsyncIteration
+            return self.chunks.pop(0)
+
+        async def close(self) -> None:
+            pass
+
     class FakeCompletions:
         def __init__(self, message: Any) -> None:
             self.message = message
 
         async def create(self, **kwargs):
-            return SimpleNamespace(choices=[SimpleNamespace(message=self.message)])
+            deltas = [SimpleNamespace(content=self.message.content)]
+            deltas.extend(
+                SimpleNamespace(
+                    tool_calls=[SimpleNamespace(index=index, **vars(tool_call))]
+                )
+                for index, tool_call in enumerate(self.message.tool_calls)
+            )
+            return FakeStream(
+                [
+                    SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+                    for delta in deltas
+                ]
+            )
 
     tool_call = SimpleNamespace(
         function=SimpleNamespace(name="tap", arguments='{"x": 1, "y": 2}')
@@ -25,14 +25,12 @@ class FakePhoneAgentManager:
         self.reset_calls: list[str] = []
         self.abort_results: dict[str, bool] = {}
 
-    def list_agents(self) -> list[str]:
-        return list(self.agents.keys())
+    @property
+    def agent_count(self) -> int:
+        return len(self.agents)
 
-    def is_initialized(self, device_id: str) -> bool:
-        return device_id in self.agents
-
-    def get_agent(self, device_id: str) -> FakeAgent:
-        return self.agents[device_id]
+    async def get_agent_safe_async(self, device_id: str) -> FakeAgent | None:
+        return self.agents.get(device_id)
 
     def reset_agent(self, device_id: str) -> None:
         if device_id not in self.agents:
@@ -210,6 +210,9 @@ def env(monkeypatch: pytest.MonkeyPatch, tmp_path) -> dict[str, Any]:
     )
     monkeypatch.setattr(task_store_module, "task_store", isolated_store)
     monkeypatch.setattr(task_manager_module, "task_manager", isolated_task_manager)
+    monkeypatch.setattr(agents_api, "config_manager", fake_config_manager)
+    monkeypatch.setattr(agents_api, "task_store", isolated_store)
+    monkeypatch.setattr(agents_api, "task_manager", isolated_task_manager)
 
     app = FastAPI()
     app.include_router(agents_api.router)
@@ -385,10 +388,10 @@ def test_chat_stream_emits_sse_events(
 
     body = response.text
     assert "event: step" in body
-    assert '"type": "step"' in body
-    assert '"timings": {' in body
+    assert '"type":"step"' in body
+    assert '"timings":{' in body
     assert "event: done" in body
-    assert '"message": "finished"' in body
+    assert '"message":"finished"' in body
 
 
 def test_chat_stream_persists_step_timings_from_trace_context(
@@ -0,0 +1,63 @@
+"""Tests for the shared per-loop AsyncOpenAI client pool."""
+
+import asyncio
+
+import pytest
+
+from AutoGLM_GUI.agents.gemini import AsyncGeminiAgent
+from AutoGLM_GUI.config import AgentConfig, ModelConfig
+from AutoGLM_GUI.model.client_pool import get_shared_async_openai
+
+
+class _FakeDevice:
+    device_id = "device-1"
+
+
+pytestmark = pytest.mark.unit
+
+
+def _make_agent(base_url: str = "http://pool.test/v1") -> AsyncGeminiAgent:
+    return AsyncGeminiAgent(
+        model_config=ModelConfig(base_url=base_url, api_key="k", model_name="m"),
+        agent_config=AgentConfig(verbose=False),
+        device=_FakeDevice(),
+    )
+
+
+def test_agents_on_same_loop_share_client():
+    async def run():
+        first, second = _make_agent(), _make_agent()
+        other = _make_agent("http://other.test/v1")
+        return first.openai_client, second.openai_client, other.openai_client
+
+    first, second, other = asyncio.run(run())
+
+    assert first is second
+    assert first is not other
+
+
+def test_clients_are_not_shared_across_loops():
+    async def get_client():
+        return get_shared_async_openai("http://pool.test/v1", "k")
+
+    assert asyncio.run(get_client()) is not asyncio.run(get_client())
+
+
+def test_agent_without_running_loop_owns_its_client():
+    agent = _make_agent()
+
+    assert agent.openai_client is agent.openai_client
+    assert agent.openai_client is not _make_agent().openai_client
+
+
+def test_explicit_client_overrides_pool():
+    agent = _make_agent()
+    sentinel = object()
+    agent.openai_client = sentinel  # type: ignore[assignment]
+
+    assert agent.openai_client is sentinel
+
+
+def test_get_shared_client_requires_running_loop():
+    with pytest.raises(RuntimeError):
+        get_shared_async_openai("http://pool.test/v1", "k")
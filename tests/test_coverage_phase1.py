@@ -353,6 +353,93 @@ def test_device_group_manager_recovers_default_and_bad_json(
     ]
 
 
+def test_device_group_manager_member_index_follows_assignments(
+    device_group_manager: DeviceGroupManager,
+) -> None:
+    work = device_group_manager.create_group("Work")
+    home = device_group_manager.create_group("Home")
+
+    for serial in ("a", "b", "c"):
+        device_group_manager.assign_device(serial, work.id)
+    assert device_group_manager.get_devices_in_group(work.id) == ["a", "b", "c"]
+
+    device_group_manager.assign_device("b", home.id)
+    assert device_group_manager.get_devices_in_group(work.id) == ["a", "c"]
+    assert device_group_manager.get_devices_in_group(home.id) == ["b"]
+
+    assert device_group_manager.delete_group(work.id) is True
+    assert device_group_manager.get_devices_in_group(work.id) == []
+    assert device_group_manager.get_devices_in_group(DEFAULT_GROUP_ID) == ["a", "c"]
+
+
+def test_device_group_manager_bulk_assign_writes_once(
+    device_group_manager: DeviceGroupManager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    work = device_group_manager.create_group("Work")
+    saves: list[dict[str, str]] = []
+    original_save = device_group_manager._save_data
+
+    def counting_save(groups, assignments):
+        saves.append(dict(assignments))
+        return original_save(groups, assignments)
+
+    monkeypatch.setattr(device_group_manager, "_save_data", counting_save)
+
+    assigned = device_group_manager.assign_devices_bulk(
+        [("a", work.id), ("b", "missing"), ("c", work.id)]
+    )
+
+    assert assigned == 2
+    assert saves == [{"a": work.id, "c": work.id}]
+    assert device_group_manager.get_devices_in_group(work.id) == ["a", "c"]
+    assert device_group_manager.assign_devices_bulk([("d", "missing")]) == 0
+    assert len(saves) == 1
+
+
+def test_device_group_manager_throttles_external_reload(
+    device_group_manager: DeviceGroupManager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import AutoGLM_GUI.device_group_manager as group_module
+
+    clock = [100.0]
+    monkeypatch.setattr(group_module.time, "monotonic", lambda: clock[0])
+    work = device_group_manager.create_group("Work")
+
+    # 外部进程直接改写文件
+    data = json.loads(device_group_manager._groups_path.read_text(encoding="utf-8"))
+    data["device_assignments"] = {"serial-x": work.id}
+    device_group_manager._groups_path.write_text(json.dumps(data), encoding="utf-8")
+    device_group_manager._file_mtime = None  # 避免 mtime 精度导致误判
+
+    assert device_group_manager.get_device_group("serial-x") == DEFAULT_GROUP_ID
+
+    clock[0] += group_module.MTIME_CHECK_INTERVAL
+    assert device_group_manager.get_device_group("serial-x") == work.id
+
+
+def test_device_group_manager_failed_save_keeps_cached_groups(
+    device_group_manager: DeviceGroupManager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import AutoGLM_GUI.device_group_manager as group_module
+
+    work = device_group_manager.create_group("Work")
+    home = device_group_manager.create_group("Home")
+
+    def fail_replace(src: object, dst: object) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(group_module.os, "replace", fail_replace)
+    device_group_manager.update_group(work.id, "Renamed")
+    device_group_manager.reorder_groups([home.id, work.id, DEFAULT_GROUP_ID])
+
+    groups = device_group_manager.list_groups()
+    assert [g.name for g in groups if g.id == work.id] == ["Work"]
+    assert [g.id for g in groups] == [DEFAULT_GROUP_ID, work.id, home.id]
+
+
 @pytest.fixture
 def history_manager(tmp_path: Path) -> HistoryManager:
     HistoryManager._instance = None
@@ -1,7 +1,10 @@
 """Tests for Gemini Agent components."""
 
 import asyncio
+import copy
+import gc
 import json
+import weakref
 from types import SimpleNamespace
 from typing import Any
 
@@ -12,7 +15,13 @@ from AutoGLM_GUI.agents.gemini.action_mapper import (
     tool_call_to_action,
 )
 from AutoGLM_GUI.agents.gemini.async_agent import AsyncGeminiAgent
-from AutoGLM_GUI.agents.gemini.tools import DEVICE_TOOLS
+from AutoGLM_GUI.agents.gemini.models import (
+    BENCHMARKS,
+    get_benchmarks_by_provider,
+    get_compatible_benchmarks,
+    get_fastest_models,
+)
+from AutoGLM_GUI.agents.gemini.tools import DEVICE_TOOLS, DEVICE_TOOLS_JSON
 from AutoGLM_GUI.config import AgentConfig, ModelConfig
 from AutoGLM_GUI.device_protocol import Screenshot
 
@@ -30,6 +39,15 @@ def _count_images(messages: list[dict[str, Any]]) -> int:
     return count
 
 
+async def _drain(agen) -> None:
+    async for _ in agen:
+        pass
+
+
+async def _collect_events(agen) -> list[dict[str, Any]]:
+    return [event async for event in agen]
+
+
 class _FakeDevice:
     device_id = "fake-001"
 
@@ -40,6 +58,41 @@ class _FakeDevice:
         return "com.example.app"
 
 
+class _FakeStream:
+    def __init__(self, chunks: list[Any]):
+        self.chunks = chunks
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Any:
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _delta_chunk(**delta: Any) -> Any:
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(**delta))])
+
+
+def _stream_message(message: Any) -> _FakeStream:
+    """Replay a complete chat message as streamed deltas."""
+    chunks = [
+        _delta_chunk(**{field: getattr(message, field)})
+        for field in ("reasoning", "reasoning_content", "content")
+        if getattr(message, field, None)
+    ]
+    for index, tool_call in enumerate(message.tool_calls or []):
+        chunks.append(
+            _delta_chunk(tool_calls=[SimpleNamespace(index=index, **vars(tool_call))])
+        )
+    return _FakeStream(chunks)
+
+
 class _QueuedToolCallGeminiAgent(AsyncGeminiAgent):
     def __init__(self, tool_calls: list[tuple[str, str, dict[str, Any]]]):
         super().__init__(
@@ -49,13 +102,12 @@ class _QueuedToolCallGeminiAgent(AsyncGeminiAgent):
         )
         self._tool_calls = tool_calls.copy()
 
-    async def _call_llm_with_tools(
-        self,
-    ) -> tuple[str, str | None, str, dict[str, Any]]:
+    async def _stream_llm_with_tools(self):
         if not self._tool_calls:
-            return "", None, "finish", {"message": "No queued tool calls"}
+            yield "", None, "finish", {"message": "No queued tool calls"}
+            return
         thinking, tool_name, tool_args = self._tool_calls.pop(0)
-        return thinking, None, tool_name, tool_args
+        yield thinking, None, tool_name, tool_args
 
 
 class TestDeviceTools:
@@ -70,6 +122,9 @@ class TestDeviceTools:
             assert "description" in func
             assert "parameters" in func
 
+    def test_serialized_tools_match_definitions(self):
+        assert json.loads(DEVICE_TOOLS_JSON) == DEVICE_TOOLS
+
     def test_tool_names(self):
         names = {t["function"]["name"] for t in DEVICE_TOOLS}
         expected = {
@@ -87,6 +142,20 @@ class TestDeviceTools:
         assert names == expected
 
 
+class TestSystemPrompt:
+    def test_same_day_prompts_are_reused(self):
+        from datetime import datetime
+
+        from AutoGLM_GUI.agents.gemini.prompts import get_system_prompt
+
+        prompt = get_system_prompt("cn")
+        assert prompt is get_system_prompt("cn")
+        assert prompt.startswith(
+            f"当前日期: {datetime.now().astimezone().strftime('%Y-%m-%d, %A')}\n"
+        )
+        assert "{date}" not in get_system_prompt("en")
+
+
 class TestActionMapper:
     def test_tap(self):
         result = tool_call_to_action("tap", {"x": 500, "y": 300})
@@ -169,6 +238,25 @@ class TestActionMapper:
         assert result == {"_metadata": "do", "action": "Tap", "element": [500, 300]}
 
 
+class TestBenchmarks:
+    def test_fastest_models_are_compatible_and_sorted(self):
+        fastest = get_fastest_models(3)
+
+        assert len(fastest) == 3
+        assert all(b.compatible for b in fastest)
+        assert [b.latency_ms for b in fastest] == sorted(
+            b.latency_ms for b in get_compatible_benchmarks()
+        )[:3]
+
+    def test_views_return_fresh_lists(self):
+        get_compatible_benchmarks().clear()
+        get_benchmarks_by_provider("zhipu").clear()
+
+        assert len(get_compatible_benchmarks()) == sum(b.compatible for b in BENCHMARKS)
+        assert next(iter(get_benchmarks_by_provider("zhipu"))).model_id == "glm-4.7"
+        assert get_benchmarks_by_provider("unknown") == []
+
+
 class TestAgentRegistration:
     def test_gemini_registered(self):
         from AutoGLM_GUI.agents import is_agent_type_registered
@@ -202,6 +290,11 @@ class TestGeminiImageAttachments:
         )
 
         assert _count_images(agent.context) == 2
+        task_message = agent.context[-2]
+        assert task_message["content"].startswith(
+            "compare this with the attached screenshot"
+        )
+        assert "User attached 1 reference image" in task_message["content"]
         user_message = agent.context[-1]
         assert user_message["content"][0]["image_url"]["url"] == (
             "data:image/png;base64,screen"
@@ -209,7 +302,487 @@ class TestGeminiImageAttachments:
         assert user_message["content"][1]["image_url"]["url"] == (
             "data:image/webp;base64,reference"
         )
-        assert "User attached 1 reference image" in user_message["content"][2]["text"]
+        assert user_message["content"][2]["text"] == "Current app: com.example.app"
+
+
+class TestGeminiContextLayout:
+    @staticmethod
+    def _run_steps(
+        tool_calls: list[tuple[str, str, dict[str, Any]]], *, image_window: int = 3
+    ) -> tuple[AsyncGeminiAgent, list[list[dict[str, Any]]]]:
+        async def run():
+            agent = _QueuedToolCallGeminiAgent(tool_calls)
+            agent.agent_config.image_window = image_window
+            agent._prepare_initial_context("go home", "screen", "app")
+            requests = []
+            for _ in tool_calls:
+                await _drain(agent._execute_step())
+                requests.append(copy.deepcopy(agent._build_request_messages()))
+            return agent, requests
+
+        return asyncio.run(run())
+
+    def test_requests_only_append_within_image_window(self):
+        agent, requests = self._run_steps([("", "back", {}), ("", "home", {})])
+
+        first, second = requests
+        assert second[: len(first)] == first
+        assert second[1]["content"] == "go home"
+        assert _count_images(second) == 2
+        assert _count_images(agent.context) == 2
+
+    def test_tool_call_ids_are_stable_across_replays(self):
+        tool_calls = [("", "back", {}), ("", "home", {})]
+        first, _ = self._run_steps(tool_calls)
+        second, _ = self._run_steps(tool_calls)
+
+        ids = [
+            message["tool_call_id"]
+            for message in first.context
+            if message["role"] == "tool"
+        ]
+        assert ids == ["call_1", "call_2"]
+        assert first.context[2:] == second.context[2:]
+
+    def test_reset_reuses_the_initial_system_message(self):
+        agent, _ = self._run_steps([("", "back", {})])
+        system_message = agent.context[0]
+
+        agent.reset()
+
+        assert agent.context == [system_message]
+        assert agent.context[0] is system_message
+
+    def test_image_window_collapses_to_latest_screenshot(self):
+        agent, requests = self._run_steps(
+            [("", "back", {}), ("", "home", {}), ("", "back", {})],
+            image_window=2,
+        )
+
+        assert [_count_images(request) for request in requests] == [1, 2, 1]
+        assert requests[1][: len(requests[0])] == requests[0]
+        assert _count_images(agent.context) == 1
+        assert requests[2][1]["content"] == "go home"
+
+
+class TestGeminiDeviceStatePrefetch:
+    def test_next_step_uses_frame_prefetched_after_action(self):
+        async def run():
+            agent = _QueuedToolCallGeminiAgent([("", "back", {})])
+            agent._prepare_initial_context("go back", "screen", "app")
+            await _drain(agent._execute_step())
+            prefetched = agent._prefetched_device_state
+            assert prefetched is not None
+            await _drain(agent._execute_step())
+            return agent, prefetched
+
+        agent, prefetched = asyncio.run(run())
+
+        assert prefetched.done()
+        assert agent._prefetched_device_state is None
+
+    def test_prefetch_from_finished_loop_is_recaptured(self):
+        agent = _QueuedToolCallGeminiAgent([("", "back", {}), ("", "back", {})])
+        agent._prepare_initial_context("go back", "screen", "app")
+        asyncio.run(_drain(agent._execute_step()))
+        assert agent._prefetched_device_state is not None
+
+        events = asyncio.run(_collect_events(agent._execute_step()))
+
+        assert [event["type"] for event in events] == ["step"]
+
+    def test_stream_end_discards_pending_prefetch(self):
+        async def run():
+            agent = _QueuedToolCallGeminiAgent([("", "back", {}), ("", "back", {})])
+            agent.agent_config.max_steps = 1
+            prefetches = []
+            prefetch = agent._prefetch_device_state
+
+            def record_prefetch() -> None:
+                prefetch()
+                prefetches.append(agent._prefetched_device_state)
+
+            agent._prefetch_device_state = record_prefetch
+            await _drain(agent.stream("go back"))
+            return agent, [task.done() for task in prefetches]
+
+        agent, prefetches_done = asyncio.run(run())
+
+        assert agent._prefetched_device_state is None
+        assert prefetches_done == [True]
+
+
+class TestGeminiStreamCleanup:
+    def test_stream_closes_step_generator_on_early_return(self):
+        step_generators = []
+
+        class _RecordingAgent(_QueuedToolCallGeminiAgent):
+            def _execute_step(self):
+                generator = super()._execute_step()
+                step_generators.append(generator)
+                return generator
+
+        async def run():
+            agent = _RecordingAgent([("", "finish", {"message": "done"})])
+            await _drain(agent.stream("finish"))
+            # Checked before asyncio.run() finalizes leftover generators.
+            return [generator.ag_frame is None for generator in step_generators]
+
+        assert asyncio.run(run()) == [True]
+
+    def test_finished_stream_releases_agent(self):
+        async def run():
+            agent = _QueuedToolCallGeminiAgent([("", "back", {}), ("", "back", {})])
+            agent.agent_config.max_steps = 2
+            await _drain(agent.stream("go back"))
+            return weakref.ref(agent)
+
+        agent_ref = asyncio.run(run())
+        gc.collect()
+
+        assert agent_ref() is None
+
+
+class TestGeminiPromptCaching:
+    @staticmethod
+    def _capture_request(model_name: str) -> dict[str, Any]:
+        captured: dict[str, Any] = {}
+        message = SimpleNamespace(
+            content="done",
+            tool_calls=[
+                SimpleNamespace(function=SimpleNamespace(name="back", arguments="{}"))
+            ],
+        )
+
+        class _FakeCompletions:
+            async def create(self, **kwargs: Any) -> Any:
+                captured.update(kwargs)
+                return _stream_message(message)
+
+        agent = AsyncGeminiAgent(
+            model_config=ModelConfig(model_name=model_name),
+            agent_config=AgentConfig(max_steps=10, verbose=False),
+            device=_FakeDevice(),
+        )
+        agent.openai_client = SimpleNamespace(
+            chat=SimpleNamespace(completions=_FakeCompletions())
+        )
+        agent._prepare_initial_context("go back", "screen", "app")
+        asyncio.run(agent._call_llm_with_tools())
+        return captured
+
+    def test_claude_requests_mark_system_task_and_tools(self):
+        request = self._capture_request("claude-sonnet-4-20250514")
+
+        system_message, task_message = request["messages"][:2]
+        assert system_message["content"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert task_message["content"][-1]["text"] == "go back"
+        assert task_message["content"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert request["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert "cache_control" not in DEVICE_TOOLS[-1]
+
+    def test_auto_caching_providers_are_sent_unmarked(self):
+        request = self._capture_request("gpt-4.1")
+
+        assert isinstance(request["messages"][0]["content"], str)
+        assert request["messages"][1]["content"] == "go back"
+        assert request["tools"] is DEVICE_TOOLS
+
+
+def _png_base64(color: tuple[int, int, int], *, marker: bool = False) -> str:
+    import base64
+    import io
+
+    from PIL import Image
+
+    image = Image.new("RGB", (108, 240), color)
+    image.paste((255, 255, 255), (0, 120, 54, 240))
+    if marker:
+        image.putpixel((100, 2), (0, 0, 0))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+class TestGeminiResponseCache:
+    @staticmethod
+    def _make_agent(temperature: float = 0.0) -> tuple[AsyncGeminiAgent, list[Any]]:
+        calls: list[Any] = []
+        message = SimpleNamespace(
+            content="go back",
+            tool_calls=[
+                SimpleNamespace(function=SimpleNamespace(name="back", arguments="{}"))
+            ],
+        )
+
+        class _FakeCompletions:
+            async def create(self, **kwargs: Any) -> Any:
+                calls.append(kwargs)
+                return _stream_message(message)
+
+        agent = AsyncGeminiAgent(
+            model_config=ModelConfig(temperature=temperature),
+            agent_config=AgentConfig(
+                max_steps=10, verbose=False, enable_response_cache=True
+            ),
+            device=_FakeDevice(),
+        )
+        agent.openai_client = SimpleNamespace(
+            chat=SimpleNamespace(completions=_FakeCompletions())
+        )
+        return agent, calls
+
+    def test_identical_screens_hit_the_cache(self):
+        agent, calls = self._make_agent()
+
+        agent._prepare_initial_context("go back", _png_base64((30, 30, 30)), "app")
+        first = asyncio.run(agent._call_llm_with_tools())
+        agent.reset()
+        agent._prepare_initial_context("go back", _png_base64((30, 30, 30)), "app")
+        second = asyncio.run(agent._call_llm_with_tools())
+
+        assert first == second == ("go back", None, "back", {})
+        assert len(calls) == 1
+        assert agent._response_cache is not None
+        assert agent._response_cache.hits == 1
+
+    def test_changed_screen_misses_the_cache(self):
+        agent, calls = self._make_agent()
+
+        agent._prepare_initial_context("go back", _png_base64((30, 30, 30)), "app")
+        asyncio.run(agent._call_llm_with_tools())
+        agent.reset()
+        agent._prepare_initial_context(
+            "go back", _png_base64((30, 30, 30), marker=True), "app"
+        )
+        asyncio.run(agent._call_llm_with_tools())
+
+        assert len(calls) == 2
+
+    def test_different_task_misses_the_cache(self):
+        agent, calls = self._make_agent()
+
+        agent._prepare_initial_context("go back", _png_base64((30, 30, 30)), "app")
+        asyncio.run(agent._call_llm_with_tools())
+        agent.reset()
+        agent._prepare_initial_context("go home", _png_base64((30, 30, 30)), "app")
+        asyncio.run(agent._call_llm_with_tools())
+
+        assert len(calls) == 2
+
+    def test_cache_is_disabled_for_non_deterministic_sampling(self):
+        agent, _ = self._make_agent(temperature=0.7)
+
+        assert agent._response_cache is None
+
+
+class TestGeminiScreenshotCompression:
+    def test_screenshot_is_sent_as_downscaled_jpeg(self):
+        import base64
+        import io
+
+        from PIL import Image
+
+        from AutoGLM_GUI.agents.gemini.image_compression import compress_screenshot
+
+        image = compress_screenshot(_png_base64((30, 30, 30)), max_edge=120)
+
+        assert image["mime_type"] == "image/jpeg"
+        decoded = Image.open(io.BytesIO(base64.b64decode(image["data"])))
+        assert decoded.size == (54, 120)
+        assert compress_screenshot(_png_base64((30, 30, 30)), max_edge=120) == image
+
+    def test_initial_screenshot_is_compressed_off_the_event_loop(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        import threading
+
+        import AutoGLM_GUI.agents.gemini.async_agent as gemini_module
+
+        threads: list[threading.Thread] = []
+
+        def recording_compress(base64_png: str) -> dict[str, str]:
+            threads.append(threading.current_thread())
+            return {"mime_type": "image/jpeg", "data": base64_png}
+
+        monkeypatch.setattr(gemini_module, "compress_screenshot", recording_compress)
+        agent = AsyncGeminiAgent(
+            model_config=ModelConfig(),
+            agent_config=AgentConfig(max_steps=10, verbose=False),
+            device=_FakeDevice(),
+        )
+
+        asyncio.run(agent._prepare_initial_context_async("tap", "screen", "app"))
+
+        assert threads and threads[0] is not threading.main_thread()
+        assert agent.context[-1]["content"][0]["image_url"]["url"] == (
+            "data:image/jpeg;base64,screen"
+        )
+
+    def test_undecodable_payload_is_passed_through(self):
+        from AutoGLM_GUI.agents.gemini.image_compression import compress_screenshot
+
+        assert compress_screenshot("screen") == {
+            "mime_type": "image/png",
+            "data": "screen",
+        }
+
+
+class TestGeminiStreaming:
+    @staticmethod
+    def _make_agent(stream: _FakeStream) -> AsyncGeminiAgent:
+        class _FakeCompletions:
+            async def create(self, **kwargs: Any) -> Any:
+                assert kwargs["stream"] is True
+                return stream
+
+        agent = AsyncGeminiAgent(
+            model_config=ModelConfig(),
+            agent_config=AgentConfig(max_steps=10, verbose=False),
+            device=_FakeDevice(),
+        )
+        agent.openai_client = SimpleNamespace(
+            chat=SimpleNamespace(completions=_FakeCompletions())
+        )
+        agent._prepare_initial_context("tap", "screen", "app")
+        return agent
+
+    @staticmethod
+    def _tool_delta(index: int, name: str | None, arguments: str) -> Any:
+        return _delta_chunk(
+            tool_calls=[
+                SimpleNamespace(
+                    index=index,
+                    function=SimpleNamespace(name=name, arguments=arguments),
+                )
+            ]
+        )
+
+    def test_tool_call_deltas_are_assembled(self):
+        stream = _FakeStream(
+            [
+                _delta_chunk(content="Tap the "),
+                _delta_chunk(content="icon."),
+                SimpleNamespace(choices=[], usage=None),
+                self._tool_delta(0, "tap", '{"x": 1'),
+                self._tool_delta(0, None, ', "y": 2}'),
+                self._tool_delta(1, "back", "{}"),
+            ]
+        )
+        agent = self._make_agent(stream)
+
+        assert asyncio.run(agent._call_llm_with_tools()) == (
+            "Tap the icon.",
+            None,
+            "tap",
+            {"x": 1, "y": 2},
+        )
+        assert stream.closed is True
+
+    def test_thinking_chunks_are_yielded_as_they_arrive(self):
+        stream = _FakeStream(
+            [
+                _delta_chunk(content="Tap the "),
+                _delta_chunk(content="icon."),
+                self._tool_delta(0, "back", "{}"),
+            ]
+        )
+        agent = self._make_agent(stream)
+
+        async def run():
+            return [event async for event in agent._execute_step()]
+
+        events = asyncio.run(run())
+
+        assert [event["type"] for event in events] == ["thinking", "thinking", "step"]
+        assert [event["data"]["chunk"] for event in events[:2]] == [
+            "Tap the ",
+            "icon.",
+        ]
+        assert events[-1]["data"]["thinking"] == "Tap the icon."
+
+    def test_cache_usage_is_logged_from_streamed_response(self):
+        from AutoGLM_GUI.logger import logger
+
+        usage = SimpleNamespace(
+            prompt_tokens=1200,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+        )
+        stream = _FakeStream(
+            [
+                self._tool_delta(0, "back", "{}"),
+                SimpleNamespace(choices=[], usage=usage),
+            ]
+        )
+        requests: list[dict[str, Any]] = []
+        agent = self._make_agent(stream)
+        create = agent.openai_client.chat.completions.create
+
+        async def recording_create(**kwargs: Any) -> Any:
+            requests.append(kwargs)
+            return await create(**kwargs)
+
+        agent.openai_client.chat.completions.create = recording_create
+
+        messages: list[str] = []
+        sink_id = logger.add(messages.append, level="DEBUG", format="{message}")
+        try:
+            asyncio.run(agent._call_llm_with_tools())
+        finally:
+            logger.remove(sink_id)
+
+        assert requests[0]["stream_options"] == {"include_usage": True}
+        assert any("1024 cached of 1200 prompt tokens" in m for m in messages)
+
+    def test_stream_options_are_dropped_when_rejected(self):
+        import httpx
+        from openai import BadRequestError
+
+        stream = _FakeStream([self._tool_delta(0, "back", "{}")])
+        requests: list[dict[str, Any]] = []
+
+        async def create(**kwargs: Any) -> Any:
+            requests.append(kwargs)
+            if "stream_options" in kwargs:
+                request = httpx.Request("POST", "http://model.test/chat")
+                response: Any = httpx.Response(400, request=request)
+                raise BadRequestError(
+                    "Unrecognized request argument: stream_options",
+                    response=response,
+                    body=None,
+                )
+            return stream
+
+        agent = self._make_agent(stream)
+        agent.openai_client.chat.completions.create = create
+
+        assert asyncio.run(agent._call_llm_with_tools())[2] == "back"
+        assert ["stream_options" in r for r in requests] == [True, False]
+        assert agent._stream_usage_supported is False
+
+    def test_cancel_interrupts_a_pending_stream_read(self):
+        stalled = asyncio.Event()
+
+        class _StallingStream(_FakeStream):
+            async def __anext__(self) -> Any:
+                if self.chunks:
+                    return await super().__anext__()
+                stalled.set()
+                await asyncio.Event().wait()  # the next chunk never arrives
+
+        stream = _StallingStream([_delta_chunk(content="Thinking")])
+        agent = self._make_agent(stream)
+
+        async def run():
+            reader = asyncio.create_task(agent._call_llm_with_tools())
+            await stalled.wait()
+            await agent.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await asyncio.wait_for(reader, timeout=1)
+            assert agent._llm_task is None
+
+        asyncio.run(run())
+        assert stream.closed is True
 
 
 class TestGeminiReasoningContent:
@@ -235,9 +808,7 @@ class TestGeminiReasoningContent:
 
         class _FakeCompletions:
             async def create(self, **_: Any) -> Any:
-                return SimpleNamespace(
-                    choices=[SimpleNamespace(message=message)],
-                )
+                return _stream_message(message)
 
         agent = AsyncGeminiAgent(
             model_config=ModelConfig(),
@@ -10,8 +10,11 @@ images for the first turn. History must not retain images.
 
 import asyncio
 import copy
+from collections.abc import AsyncGenerator
 from typing import Any
 
+import pytest
+
 from AutoGLM_GUI.actions import ActionResult
 from AutoGLM_GUI.agents.glm.async_agent import AsyncGLMAgent
 from AutoGLM_GUI.config import AgentConfig, ModelConfig
@@ -92,6 +95,20 @@ def test_remove_images_passes_through_string_content():
     assert MessageBuilder.remove_images_from_message(msg) == msg
 
 
+def test_strip_images_in_place_reuses_message_and_content_list():
+    msg = MessageBuilder.create_user_message("hello", image_base64="abc")
+    content = msg["content"]
+
+    MessageBuilder.strip_images_in_place(msg)
+
+    assert msg["content"] is content
+    assert content == [{"type": "text", "text": "hello"}]
+
+    assistant = MessageBuilder.create_assistant_message("done")
+    MessageBuilder.strip_images_in_place(assistant)
+    assert assistant == {"role": "assistant", "content": "done"}
+
+
 def test_create_user_message_with_images_preserves_order_and_mime_types():
     msg = MessageBuilder.create_user_message_with_images(
         "hello",
@@ -230,3 +247,265 @@ def test_user_reference_images_are_sent_on_first_request_only(monkeypatch):
     assert _count_images(captured[0]) == 2
     assert _count_images(captured[1]) == 1
     assert "User attached 1 reference image" in _text_part(captured[0][-1])
+
+
+# ---------------------------------------------------------------------------
+# Streaming marker detection
+# ---------------------------------------------------------------------------
+
+
+def test_ends_with_marker_prefix_matches_split_markers():
+    from AutoGLM_GUI.agents.glm.async_agent import _ends_with_marker_prefix
+
+    assert _ends_with_marker_prefix("Let me tap. d")
+    assert _ends_with_marker_prefix("Done. finish(message")
+    assert _ends_with_marker_prefix("Next do(action")
+    assert not _ends_with_marker_prefix("Let me tap.")
+    assert not _ends_with_marker_prefix("")
+
+
+def test_parse_raw_response_keeps_marker_precedence():
+    parse = AsyncGLMAgent._parse_raw_response
+
+    assert parse('Tap it.\ndo(action="Tap", element=[1,2])') == (
+        "Tap it.",
+        'do(action="Tap", element=[1,2])',
+    )
+    # finish(message= wins even when do(action= appears earlier.
+    assert parse('Not do(action="Back"). finish(message="done")') == (
+        'Not do(action="Back").',
+        'finish(message="done")',
+    )
+    assert parse('<think>go</think><answer>do(action="Back")</answer>') == (
+        "<think>go</think><answer>",
+        'do(action="Back")</answer>',
+    )
+    assert parse("<think>hmm</think><answer>Launch</answer>") == ("hmm", "Launch")
+    assert parse("plain text") == ("", "plain text")
+
+
+def test_stream_openai_splits_thinking_once_without_live_consumer():
+    from types import SimpleNamespace
+
+    pieces = ["I will ", "tap.\nd", "o(action=", '"Tap", element=[1,2])']
+
+    class _FakeStream:
+        def __init__(self) -> None:
+            self.chunks = [
+                SimpleNamespace(
+                    choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))]
+                )
+                for piece in pieces
+            ]
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            if not self.chunks:
+                raise StopAsyncIteration
+            return self.chunks.pop(0)
+
+        async def close(self) -> None:
+            pass
+
+    class _FakeCompletions:
+        async def create(self, **kwargs):
+            return _FakeStream()
+
+    agent = _make_agent()
+    agent.openai_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=_FakeCompletions())
+    )
+
+    async def collect() -> list[dict[str, str]]:
+        return [chunk async for chunk in agent._stream_openai([])]
+
+    live = asyncio.run(collect())
+    agent._live_thinking = False
+    deferred = asyncio.run(collect())
+
+    def thinking(chunks: list[dict[str, str]]) -> list[str]:
+        return [chunk["content"] for chunk in chunks if chunk["type"] == "thinking"]
+
+    assert [c for c in deferred if c["type"] == "raw"] == [
+        c for c in live if c["type"] == "raw"
+    ]
+    assert thinking(deferred) == ["I will tap.\n"]
+    assert "".join(thinking(live)) == "I will tap.\n"
+
+
+def test_leading_thinking_stops_at_the_earliest_marker() -> None:
+    from AutoGLM_GUI.agents.glm.async_agent import _leading_thinking
+
+    pieces = ["Plan: ", 'do(action="Back") ', 'then finish(message="done")']
+    agent = _agent_streaming(_ChunkStream(pieces))
+    agent._live_thinking = True
+
+    async def live_thinking() -> str:
+        return "".join(
+            [
+                chunk["content"]
+                async for chunk in agent._stream_openai([])
+                if chunk["type"] == "thinking"
+            ]
+        )
+
+    assert _leading_thinking("".join(pieces)) == "Plan: "
+    assert asyncio.run(live_thinking()) == "Plan: "
+    assert _leading_thinking('Done. finish(message="ok") do(action=') == "Done. "
+    assert _leading_thinking("just thinking") == "just thinking"
+
+
+def test_history_window_keeps_task_turn_and_starts_at_user_turn():
+    agent = _make_agent()
+    system = agent._context[0]
+    turns = [
+        MessageBuilder.create_user_message("task"),
+        MessageBuilder.create_assistant_message("a1"),
+        MessageBuilder.create_user_message("u2"),
+        MessageBuilder.create_assistant_message("a2"),
+        MessageBuilder.create_user_message("u3"),
+    ]
+    agent._context = [system, *turns]
+
+    assert agent._history_window() is agent._context
+
+    agent.agent_config.max_history = 4
+    assert agent._history_window() == [system, *turns]
+
+    agent.agent_config.max_history = 3
+    assert agent._history_window() == [system, turns[0], *turns[2:]]
+
+    agent.agent_config.max_history = 2
+    assert agent._history_window() == [system, turns[0], turns[4]]
+
+
+def test_repeated_actions_reuse_parse_without_sharing_nested_values(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    agent = _make_agent()
+
+    async def fake_stream(
+        messages: list[dict[str, Any]],
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        yield {"type": "raw", "content": 'do(action="Tap", element=[500, 500])'}
+
+    executed: list[dict[str, Any]] = []
+
+    def execute(action: dict[str, Any], width: int, height: int) -> ActionResult:
+        executed.append(copy.deepcopy(action))
+        action["element"][0] = 0  # handlers may rewrite coordinates in place
+        return ActionResult(success=True, should_finish=False, message=None)
+
+    monkeypatch.setattr(agent, "_stream_openai", fake_stream)
+    monkeypatch.setattr(agent.action_handler, "execute", execute)
+
+    async def run() -> None:
+        agent._prepare_initial_context("task", "img0", "app")
+        await _drain(agent._execute_step())
+        await _drain(agent._execute_step())
+
+    asyncio.run(run())
+
+    assert [action["element"] for action in executed] == [[500, 500], [500, 500]]
+    assert agent._parse_action.cache_info().hits == 1
+
+
+class _ChunkStream:
+    """Model stream double: yields ``pieces``, then optionally stalls."""
+
+    def __init__(self, pieces: list[str], *, stall: bool = False) -> None:
+        self.pieces = list(pieces)
+        self.stall = stall
+        self.stalled = asyncio.Event()
+
+    def __aiter__(self) -> "_ChunkStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        from types import SimpleNamespace
+
+        if not self.pieces:
+            if not self.stall:
+                raise StopAsyncIteration
+            self.stalled.set()
+            await asyncio.Event().wait()  # the next chunk never arrives
+        piece = self.pieces.pop(0)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))]
+        )
+
+    async def close(self) -> None:
+        pass
+
+
+def _agent_streaming(stream: _ChunkStream) -> AsyncGLMAgent:
+    from types import SimpleNamespace
+
+    async def create(**kwargs: Any) -> _ChunkStream:
+        return stream
+
+    agent = _make_agent()
+    agent._live_thinking = False
+    agent.openai_client = SimpleNamespace(  # type: ignore[assignment]
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+    return agent
+
+
+def test_cancel_between_reads_does_not_cancel_the_consumer() -> None:
+    agent = _agent_streaming(_ChunkStream(["I will ", "tap."]))
+    seen: list[str] = []
+
+    async def run() -> int:
+        resume = asyncio.Event()
+
+        async def consume() -> int:
+            try:
+                async for chunk in agent._stream_openai([]):
+                    seen.append(chunk["content"])
+                    await resume.wait()  # the consumer's own work between chunks
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                assert task is not None
+                return task.cancelling()
+            return -1
+
+        consumer = asyncio.create_task(consume())
+        while not seen:
+            await asyncio.sleep(0)
+        await agent.cancel()
+        await asyncio.sleep(0)  # let the cancel callback run on the loop
+        assert not consumer.done()
+        resume.set()
+        return await consumer
+
+    # The consumer's await completes; the stream stops at the next read and
+    # the consumer task itself was never cancelled.
+    assert asyncio.run(run()) == 0
+    assert seen == ["I will "]
+
+
+def test_cancel_during_a_read_interrupts_it_and_uncancels_the_task() -> None:
+    stream = _ChunkStream(["I will "], stall=True)
+    agent = _agent_streaming(stream)
+
+    async def run() -> int:
+        async def consume() -> int:
+            try:
+                async for _ in agent._stream_openai([]):
+                    pass
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                assert task is not None
+                return task.cancelling()
+            return -1
+
+        consumer = asyncio.create_task(consume())
+        await stream.stalled.wait()
+        await agent.cancel()
+        return await asyncio.wait_for(consumer, timeout=1)
+
+    assert asyncio.run(run()) == 0
+    assert agent._llm_task is None
@@ -825,6 +825,25 @@ Logical Displays:
     adb_display.clear_display_selection_cache()
 
 
+def test_screenshot_png_size_reads_ihdr_without_decoding() -> None:
+    from io import BytesIO
+
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new("RGB", (37, 19)).save(buffer, format="PNG")
+    data = buffer.getvalue()
+
+    assert screenshot._png_size(data) == (37, 19)
+    assert screenshot._png_size(data[:20]) is None
+    assert screenshot._png_size(screenshot.PNG_SIGNATURE + b"\x00" * 16) is None
+
+    decoded = screenshot._decode_screenshot(data, "serial")
+    assert decoded is not None
+    assert (decoded.width, decoded.height) == (37, 19)
+    assert base64.b64decode(decoded.base64_data) == data
+
+
 def test_screenshot_sync_async_and_helpers(monkeypatch: pytest.MonkeyPatch) -> None:
     assert screenshot._is_valid_png(PNG_1X1_BYTES)
     assert not screenshot._is_valid_png(b"nope")
@@ -861,6 +880,10 @@ def test_screenshot_sync_async_and_helpers(monkeypatch: pytest.MonkeyPatch) -> N
     fallback = screenshot.capture_screenshot("serial", retries=0)
     assert fallback.width == 1080
     assert fallback.is_sensitive is False
+    assert (
+        screenshot.capture_screenshot("serial", retries=0).base64_data
+        is fallback.base64_data
+    )
 
     class AsyncProc:
         returncode = 0
@@ -0,0 +1,124 @@
+"""Tests for the optional-orjson JSON helpers."""
+
+import json
+from typing import Any
+
+import pytest
+
+from AutoGLM_GUI import json_utils
+
+pytestmark = pytest.mark.unit
+
+PAYLOAD = {"text": "打开微信", "x": 500, "nested": {"b": [1, 2.5, None], "a": True}}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_utils, "orjson", None)
+    elif json_utils.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def test_dumps_is_compact_and_identical_across_backends(backend):
+    assert json_utils.dumps(PAYLOAD) == json.dumps(
+        PAYLOAD, ensure_ascii=False, separators=(",", ":")
+    )
+    assert json_utils.dumps(PAYLOAD, sort_keys=True) == json.dumps(
+        PAYLOAD, ensure_ascii=False, separators=(",", ":"), sort_keys=True
+    )
+    assert json_utils.dumps_bytes(PAYLOAD) == json_utils.dumps(PAYLOAD).encode()
+
+
+def test_dumps_indent_matches_stdlib_pretty_print(backend):
+    assert json_utils.dumps(PAYLOAD, indent=True) == json.dumps(
+        PAYLOAD, ensure_ascii=False, indent=2
+    )
+
+
+def test_dumps_uses_default_for_unsupported_values(backend):
+    assert json_utils.dumps({"value": {1}}, default=str) == '{"value":"{1}"}'
+
+
+def test_dumps_falls_back_for_non_string_keys(backend):
+    assert json_utils.dumps({1: "a"}) == '{"1":"a"}'
+
+
+def test_dumps_escapes_lone_surrogates(backend: str) -> None:
+    payload = {"text": "bad\ud800", "ok": "打开"}
+    assert json_utils.dumps(payload) == '{"text":"bad\\ud800","ok":"\\u6253\\u5f00"}'
+    assert json.loads(json_utils.dumps_bytes(payload)) == payload
+
+
+def test_loads_round_trips_and_raises_decode_error(backend):
+    assert json_utils.loads(json_utils.dumps(PAYLOAD)) == PAYLOAD
+    with pytest.raises(json_utils.JSONDecodeError):
+        json_utils.loads("{not json")
+
+
+def _encode_with_both_backends(obj: Any, **kwargs: Any) -> tuple[bytes, bytes]:
+    if json_utils.orjson is None:
+        pytest.skip("orjson is not installed")
+    fast = json_utils.dumps_bytes(obj, **kwargs)
+    orjson = json_utils.orjson
+    json_utils.orjson = None
+    try:
+        slow = json_utils.dumps_bytes(obj, **kwargs)
+    finally:
+        json_utils.orjson = orjson
+    return fast, slow
+
+
+def _repo_payloads() -> list[tuple[str, Any, dict[str, Any]]]:
+    from dataclasses import dataclass
+    from datetime import datetime, timezone
+
+    from AutoGLM_GUI.agents.events import step_event
+    from AutoGLM_GUI.agents.gemini.tools import DEVICE_TOOLS
+    from AutoGLM_GUI.models.scheduled_task import ScheduledTask
+    from AutoGLM_GUI.types import DeviceConnectionType
+
+    @dataclass
+    class _Point:
+        x: int
+        y: int
+
+    task = ScheduledTask(
+        name="每日签到", workflow_uuid="wf", cron_expression="0 8 * * *"
+    )
+    task.last_run_time = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    return [
+        (
+            "sse_step_event",
+            step_event(
+                3,
+                thinking="点击「确定」",
+                action={"action": "Tap", "element": [500, 1200]},
+                success=True,
+                finished=False,
+                message=None,
+                screenshot="iVBORw0KGgo=",
+            ),
+            {},
+        ),
+        ("tool_args", {"y": 2.5, "x": 10, "text": "héllo"}, {"sort_keys": True}),
+        ("device_tools", DEVICE_TOOLS, {"sort_keys": True}),
+        ("scheduled_tasks_file", {"tasks": [task.to_dict()]}, {"indent": True}),
+        ("connection_type", {"type": DeviceConnectionType.USB}, {}),
+        (
+            "default_str",
+            {"at": task.last_run_time, "point": _Point(1, 2)},
+            {"default": str},
+        ),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("obj", "kwargs"),
+    [(obj, kwargs) for _, obj, kwargs in _repo_payloads()],
+    ids=[name for name, _, _ in _repo_payloads()],
+)
+def test_backends_agree_on_repo_payloads(obj: Any, kwargs: dict[str, Any]) -> None:
+    fast, slow = _encode_with_both_backends(obj, **kwargs)
+    assert fast == slow
@@ -185,9 +185,9 @@ def test_chat_endpoint_streams_task_events(layered_env: dict[str, Any]) -> None:
 
     assert response.status_code == 200
     assert response.headers["content-type"].startswith("text/event-stream")
-    assert '"type": "tool_call"' in response.text
-    assert '"type": "message"' in response.text
-    assert '"type": "done"' in response.text
+    assert '"type":"tool_call"' in response.text
+    assert '"type":"message"' in response.text
+    assert '"type":"done"' in response.text
     assert "任务完成" in response.text
 
 
@@ -200,7 +200,7 @@ def test_chat_endpoint_supports_legacy_session_id_only_calls(
     )
 
     assert response.status_code == 200
-    assert '"type": "done"' in response.text
+    assert '"type":"done"' in response.text
 
 
 def test_abort_session_success(layered_env: dict[str, Any]) -> None:
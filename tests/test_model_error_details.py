@@ -30,9 +30,7 @@ class _FakeDevice:
 
 
 class _FailingGeminiAgent(AsyncGeminiAgent):
-    async def _call_llm_with_tools(
-        self,
-    ) -> tuple[str, str | None, str, dict[str, Any]]:
+    async def _stream_llm_with_tools(self):
         request = httpx.Request("POST", "https://example.test/v1/chat/completions")
         response = httpx.Response(
             400,
@@ -49,6 +47,7 @@ class _FailingGeminiAgent(AsyncGeminiAgent):
             response=response,
             body=response.json(),
         )
+        yield
 
 
 class _FailingPlannerResult:
@@ -123,3 +123,25 @@ def test_acquire_device_async_releases_lock_after_cancellation(
     asyncio.run(run_test())
 
     assert release_calls == [("device-1", "chat")]
+
+
+def test_sync_wrappers_share_one_background_loop() -> None:
+    manager = PhoneAgentManager()
+    manager._metadata["device-1"] = _make_idle_metadata("device-1")
+    loops: list[asyncio.AbstractEventLoop] = []
+
+    async def current_loop() -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    loops.append(manager._run_sync(current_loop()))
+    loops.append(manager._run_sync(current_loop()))
+
+    assert loops[0] is loops[1]
+    assert loops[0].is_running()
+    assert manager.get_metadata_for_device("device-1") is manager._metadata["device-1"]
+
+    async def call_from_own_loop() -> None:
+        manager.get_metadata_for_device("device-1")
+
+    with pytest.raises(RuntimeError):
+        manager._run_sync(call_from_own_loop())
@@ -2,6 +2,7 @@
 
 import asyncio
 import copy
+from collections.abc import AsyncGenerator
 from typing import Any
 
 import pytest
@@ -213,6 +214,42 @@ class TestAsyncQwenAgentContext:
         assert "play a song" in _text_part(captured[0][-1])
         assert "play a song" not in _text_part(captured[1][-1])
 
+    def test_repeated_actions_reuse_parse_without_sharing_nested_values(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        agent = _make_agent()
+
+        async def fake_stream(
+            messages: list[dict[str, Any]],
+        ) -> AsyncGenerator[dict[str, Any], None]:
+            yield {
+                "type": "raw",
+                "content": '<answer>do(action="Tap", element=[500, 500])</answer>',
+            }
+
+        executed: list[dict[str, Any]] = []
+
+        def execute(action: dict[str, Any], width: int, height: int) -> ActionResult:
+            executed.append(copy.deepcopy(action))
+            action["element"][0] = 0  # handlers may rewrite coordinates in place
+            return ActionResult(success=True, should_finish=False, message=None)
+
+        monkeypatch.setattr(agent, "_stream_openai", fake_stream)
+        monkeypatch.setattr(agent.action_handler, "execute", execute)
+
+        async def run() -> None:
+            agent._prepare_initial_context("task", "img0", "app")
+            await _drain(agent._execute_step())
+            await _drain(agent._execute_step())
+
+        asyncio.run(run())
+
+        assert [action["element"] for action in executed] == [
+            [500, 500],
+            [500, 500],
+        ]
+        assert agent._parse_action.cache_info().hits == 1
+
     def test_context_retains_no_images_after_step(self, monkeypatch):
         agent = _make_agent()
 
@@ -227,6 +227,17 @@ def test_create_scheduled_task_validation_errors(client: TestClient) -> None:
     )
     assert bad_cron_resp.status_code == 422
 
+    out_of_range_resp = client.post(
+        "/api/scheduled-tasks",
+        json={
+            "name": "Morning",
+            "workflow_uuid": "wf-1",
+            "device_serialnos": ["dev-1"],
+            "cron_expression": "99 8 * * *",
+        },
+    )
+    assert out_of_range_resp.status_code == 422
+
 
 def test_list_and_get_scheduled_tasks(client: TestClient) -> None:
     created = _create_task(client)
@@ -6,12 +6,14 @@ import asyncio
 from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
+
 import AutoGLM_GUI.device_manager as device_manager_module
 import AutoGLM_GUI.task_manager as task_manager_module
 import AutoGLM_GUI.task_store as task_store_module
 import AutoGLM_GUI.workflow_manager as workflow_manager_module
 from AutoGLM_GUI.models.scheduled_task import ScheduledTask
-from AutoGLM_GUI.scheduler_manager import SchedulerManager
+from AutoGLM_GUI.scheduler_manager import SchedulerManager, get_cron_trigger
 from AutoGLM_GUI.task_store import TaskStatus, TaskStore
 
 
@@ -184,3 +186,127 @@ def test_scheduler_uses_layered_executor_when_task_mode_is_layered(
 
     assert len(fake_task_manager.enqueued) == 1
     assert fake_task_manager.enqueued[0]["executor_key"] == "scheduled_layered_workflow"
+
+
+def test_cron_trigger_is_shared_per_expression() -> None:
+    trigger = get_cron_trigger("0 8 * * *")
+
+    assert get_cron_trigger("0 8 * * *") is trigger
+    assert get_cron_trigger("5 9 * * *") is not trigger
+
+    with pytest.raises(ValueError):
+        get_cron_trigger("0 8 * *")
+
+
+def test_run_status_saves_are_coalesced(tmp_path: Path, monkeypatch) -> None:
+    import AutoGLM_GUI.scheduler_manager as scheduler_module
+
+    monkeypatch.setattr(scheduler_module, "RUN_STATUS_SAVE_DELAY", 0.01)
+    SchedulerManager._instance = None
+    manager = SchedulerManager()
+    manager._tasks_path = tmp_path / "scheduled_tasks.json"
+    tasks = [
+        ScheduledTask(name=f"Task {i}", workflow_uuid="wf", cron_expression="0 8 * * *")
+        for i in range(3)
+    ]
+    manager._tasks = {task.id: task for task in tasks}
+
+    saves: list[int] = []
+    save_tasks = manager._save_tasks
+
+    def counting_save() -> None:
+        saves.append(1)
+        save_tasks()
+
+    monkeypatch.setattr(manager, "_save_tasks", counting_save)
+
+    async def run() -> None:
+        for task in tasks:
+            manager._record_run(task, "failure", "offline", 0, 1)
+        assert saves == []
+        await asyncio.sleep(0.05)
+
+    try:
+        asyncio.run(run())
+    finally:
+        SchedulerManager._instance = None
+
+    assert len(saves) == 1
+    manager._tasks = {}
+    manager._load_tasks()
+    assert {t.last_run_status for t in manager._tasks.values()} == {"failure"}
+
+
+def test_unchanged_tasks_are_not_rewritten(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    SchedulerManager._instance = None
+    manager = SchedulerManager()
+    manager._tasks_path = tmp_path / "scheduled_tasks.json"
+    task = ScheduledTask(name="Task", workflow_uuid="wf", cron_expression="0 8 * * *")
+    manager._tasks = {task.id: task}
+
+    replaced: list[Path] = []
+    path_replace = Path.replace
+
+    def counting_replace(self: Path, target: Path) -> Path:
+        replaced.append(self)
+        return path_replace(self, target)
+
+    monkeypatch.setattr(Path, "replace", counting_replace)
+
+    manager._save_tasks()
+    manager._save_tasks()
+    assert len(replaced) == 1
+
+    task.name = "Renamed"
+    manager._save_tasks()
+    assert len(replaced) == 2
+
+    manager._tasks_path.unlink()
+    manager._save_tasks()
+    assert len(replaced) == 3
+    assert manager._tasks_path.exists()
+
+
+@pytest.mark.parametrize("content", ["not json", "[]", '{"tasks": [{}]}'])
+def test_corrupt_tasks_file_is_ignored(tmp_path: Path, content: str) -> None:
+    SchedulerManager._instance = None
+    manager = SchedulerManager()
+    manager._tasks_path = tmp_path / "scheduled_tasks.json"
+    manager._tasks_path.write_text(content, encoding="utf-8")
+
+    manager._load_tasks()
+
+    assert manager._tasks == {}
+
+
+def test_invalid_cron_is_rejected_before_saving(tmp_path: Path) -> None:
+    SchedulerManager._instance = None
+    manager = SchedulerManager()
+    manager._tasks_path = tmp_path / "scheduled_tasks.json"
+
+    with pytest.raises(ValueError):
+        manager.create_task("Task", "wf", ["serial"], "0 8 * *", enabled=False)
+    assert manager._tasks == {}
+    assert not manager._tasks_path.exists()
+
+    task = manager.create_task("Task", "wf", ["serial"], "0 8 * * *", enabled=False)
+    with pytest.raises(ValueError):
+        manager.update_task(task.id, name="Renamed", cron_expression="bad")
+    assert task.name == "Task"
+    assert task.cron_expression == "0 8 * * *"
+
+
+def test_unserializable_tasks_are_logged_not_raised(tmp_path: Path) -> None:
+    SchedulerManager._instance = None
+    manager = SchedulerManager()
+    manager._tasks_path = tmp_path / "scheduled_tasks.json"
+    task = ScheduledTask(name="Task", workflow_uuid="wf", cron_expression="0 8 * * *")
+    task.last_run_message = {"not": {"serializable"}}  # type: ignore[assignment]
+    manager._tasks = {task.id: task}
+
+    manager._save_tasks()
+
+    assert not manager._tasks_path.exists()
+    assert list(tmp_path.iterdir()) == []
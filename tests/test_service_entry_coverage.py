@@ -378,18 +378,13 @@ def test_scheduler_crud_persistence_jobs_and_resolution(
 
 
 def test_scheduler_single_device_execution_paths(scheduler: SchedulerManager) -> None:
-    online_device = SimpleNamespace(
+    online_device: Any = SimpleNamespace(
         serial="serial-1",
         state=SimpleNamespace(value="online"),
         primary_device_id="device-1",
         model="Pixel",
     )
 
-    class FakeDeviceManager:
-        @staticmethod
-        def get_devices():
-            return [online_device]
-
     class FakeAgent:
         step_count = 1
 
@@ -438,10 +433,10 @@ def test_scheduler_single_device_execution_paths(scheduler: SchedulerManager) ->
     result = asyncio.run(
         scheduler._execute_single_device(
             "serial-1",
+            online_device,
             {"text": "do it"},
             "Morning",
             manager,
-            FakeDeviceManager(),
             history,
         )
     )
@@ -453,10 +448,10 @@ def test_scheduler_single_device_execution_paths(scheduler: SchedulerManager) ->
     busy = asyncio.run(
         scheduler._execute_single_device(
             "serial-1",
+            online_device,
             {"text": "do it"},
             "Morning",
             FakePhoneManager(acquired=False),
-            FakeDeviceManager(),
             history,
         )
     )
@@ -465,10 +460,10 @@ def test_scheduler_single_device_execution_paths(scheduler: SchedulerManager) ->
     offline = asyncio.run(
         scheduler._execute_single_device(
             "missing",
+            None,
             {"text": "do it"},
             "Morning",
             FakePhoneManager(),
-            FakeDeviceManager(),
             history,
         )
     )
@@ -477,10 +472,10 @@ def test_scheduler_single_device_execution_paths(scheduler: SchedulerManager) ->
     failed = asyncio.run(
         scheduler._execute_single_device(
             "serial-1",
+            online_device,
             {"text": "do it"},
             "Morning",
             FakePhoneManager(fail_stream=True),
-            FakeDeviceManager(),
             history,
         )
     )
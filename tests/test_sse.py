@@ -0,0 +1,129 @@
+"""Tests for SSE frame encoding."""
+
+import asyncio
+import itertools
+import json
+from collections.abc import AsyncGenerator
+
+import pytest
+
+from AutoGLM_GUI.sse import KEEPALIVE_FRAME, encode_sse_event, with_keepalive
+
+pytestmark = pytest.mark.unit
+
+
+def test_encode_sse_event_with_event_name():
+    frame = encode_sse_event({"type": "step", "text": "打开"}, event="step")
+
+    assert isinstance(frame, bytes)
+    header, data_line, *rest = frame.decode("utf-8").split("\n")
+    assert header == "event: step"
+    assert json.loads(data_line.removeprefix("data: ")) == {
+        "type": "step",
+        "text": "打开",
+    }
+    assert rest == ["", ""]
+
+
+def test_encode_sse_event_data_only():
+    assert encode_sse_event({"ok": True}) == b'data: {"ok":true}\n\n'
+
+
+def test_with_keepalive_pings_while_producer_is_idle():
+    async def frames():
+        yield b"data: 1\n\n"
+        await asyncio.sleep(0.05)
+        yield b"data: 2\n\n"
+
+    async def collect() -> list[bytes]:
+        return [frame async for frame in with_keepalive(frames(), interval=0.02)]
+
+    received = asyncio.run(collect())
+
+    assert received[0] == b"data: 1\n\n"
+    assert received[-1] == b"data: 2\n\n"
+    assert KEEPALIVE_FRAME in received[1:-1]
+
+
+def test_with_keepalive_passes_through_fast_stream():
+    async def frames():
+        for index in range(3):
+            yield f"data: {index}\n\n".encode()
+
+    async def collect() -> list[bytes]:
+        return [frame async for frame in with_keepalive(frames(), interval=1.0)]
+
+    received = asyncio.run(collect())
+
+    assert received == [b"data: 0\n\n", b"data: 1\n\n", b"data: 2\n\n"]
+
+
+@pytest.mark.parametrize("consumer_awaits", [False, True])
+def test_with_keepalive_returns_to_event_loop_between_frames(
+    consumer_awaits: bool,
+) -> None:
+    async def burst() -> AsyncGenerator[bytes, None]:
+        for index in range(5):
+            yield f"data: {index}\n\n".encode()  # never suspends
+
+    async def run() -> list[int]:
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker_task = asyncio.create_task(ticker())
+        seen: list[int] = []
+        async for _frame in with_keepalive(burst()):
+            seen.append(ticks)
+            if consumer_awaits:
+                # a socket write that suspends lets the pump refill the queue,
+                # so the next frame takes the get_nowait() path
+                await asyncio.sleep(0)
+        ticker_task.cancel()
+        return seen
+
+    seen = asyncio.run(run())
+
+    assert len(seen) == 5
+    assert all(later > earlier for earlier, later in itertools.pairwise(seen))
+
+
+def test_with_keepalive_closes_producer_when_consumer_stops():
+    closed = asyncio.Event()
+
+    async def frames():
+        try:
+            yield b"data: 0\n\n"
+            await asyncio.Event().wait()  # the next frame never arrives
+            yield b"data: 1\n\n"
+        finally:
+            closed.set()
+
+    async def run() -> None:
+        stream = with_keepalive(frames(), interval=1.0)
+        assert await anext(stream) == b"data: 0\n\n"
+        reader = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.01)
+        reader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await reader
+        await stream.aclose()
+        assert closed.is_set()
+
+    asyncio.run(run())
+
+
+def test_with_keepalive_propagates_producer_errors():
+    async def frames():
+        yield b"data: 0\n\n"
+        raise RuntimeError("stream failed")
+
+    async def collect() -> list[bytes]:
+        return [frame async for frame in with_keepalive(frames(), interval=1.0)]
+
+    with pytest.raises(RuntimeError, match="stream failed"):
+        asyncio.run(collect())
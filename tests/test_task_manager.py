@@ -450,3 +450,92 @@ def test_submit_chat_task_uses_layered_executor_for_layered_sessions(
         store.close()
 
     asyncio.run(scenario())
+
+
+def test_thinking_buffer_coalesces_chunks_and_preserves_order(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import AutoGLM_GUI.task_manager as task_manager_module
+
+    monkeypatch.setattr(task_manager_module, "THINKING_FLUSH_INTERVAL", 0.02)
+    monkeypatch.setattr(task_manager_module, "THINKING_FLUSH_CHARS", 8)
+
+    async def scenario() -> list[dict[str, object]]:
+        written: list[dict[str, object]] = []
+
+        async def write(payload: dict[str, object]) -> None:
+            written.append(payload)
+
+        buffer = task_manager_module._ThinkingEventBuffer(write)
+        await buffer.add({"chunk": "ab"})
+        await buffer.add({"chunk": "cd"})
+        assert written == []
+
+        # 超时后由定时器落库
+        await asyncio.sleep(0.05)
+        # 达到字符上限立即落库
+        await buffer.add({"chunk": "efghijkl"})
+        # 非纯 chunk 的 payload 先冲刷缓冲再原样写入
+        await buffer.add({"chunk": "m"})
+        await buffer.add({"chunk": "n", "extra": True})
+        await buffer.add({"chunk": "o"})
+        await buffer.flush()
+        await buffer.close()
+        return written
+
+    assert asyncio.run(scenario()) == [
+        {"chunk": "abcd"},
+        {"chunk": "efghijkl"},
+        {"chunk": "m"},
+        {"chunk": "n", "extra": True},
+        {"chunk": "o"},
+    ]
+
+
+def test_thinking_buffer_close_persists_chunks_after_stream_error() -> None:
+    import AutoGLM_GUI.task_manager as task_manager_module
+
+    async def scenario() -> list[dict[str, object]]:
+        written: list[dict[str, object]] = []
+
+        async def write(payload: dict[str, object]) -> None:
+            await asyncio.sleep(0)
+            written.append(payload)
+
+        buffer = task_manager_module._ThinkingEventBuffer(write)
+        with pytest.raises(RuntimeError):
+            try:
+                await buffer.add({"chunk": "partial "})
+                await buffer.add({"chunk": "thought"})
+                raise RuntimeError("stream failed")
+            finally:
+                await buffer.close()
+        return written
+
+    assert asyncio.run(scenario()) == [{"chunk": "partial thought"}]
+
+
+def test_thinking_buffer_logs_timer_flush_failures(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import AutoGLM_GUI.task_manager as task_manager_module
+    from AutoGLM_GUI.logger import logger
+
+    monkeypatch.setattr(task_manager_module, "THINKING_FLUSH_INTERVAL", 0.01)
+    messages: list[str] = []
+
+    async def scenario() -> None:
+        async def write(payload: dict[str, object]) -> None:
+            raise OSError("disk full")
+
+        buffer = task_manager_module._ThinkingEventBuffer(write)
+        await buffer.add({"chunk": "lost"})
+        await asyncio.sleep(0.05)
+
+    sink_id = logger.add(messages.append, level="WARNING", format="{message}")
+    try:
+        asyncio.run(scenario())
+    finally:
+        logger.remove(sink_id)
+
+    assert any("timer flush" in message for message in messages)
@@ -384,7 +384,7 @@ def test_task_stream_and_cancel(client: TestClient) -> None:
     assert stream_resp.status_code == 200
     assert stream_resp.headers["content-type"].startswith("text/event-stream")
     assert "event: step" in stream_resp.text
-    assert '"message": "已打开设置"' in stream_resp.text
+    assert '"message":"已打开设置"' in stream_resp.text
 
     cancel_resp = client.post("/api/tasks/task-2/cancel")
     assert cancel_resp.status_code == 200